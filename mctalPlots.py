@@ -1,9 +1,32 @@
-from os import path, makedirs, getcwd
+from os import path, makedirs, getcwd, remove
+from shutil import rmtree
+from itertools import product
+from collections import OrderedDict
+from io import BytesIO
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, wraps
 import sys
+import threading
+import queue
+import json
+import zlib
+import zipfile
+import hashlib
+import gzip
+import logging
+import re
+import time
 import argparse
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.colors import LogNorm
+from matplotlib.figure import Figure
+from matplotlib.colors import LogNorm, Normalize
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
+from matplotlib.colors import ListedColormap
+from matplotlib.backends.backend_pdf import PdfPages
 
 try:
     from mctools.mcnp.mctal import MCTAL as mc_tools
@@ -13,7 +36,1955 @@ except:
     sys.path.append(mctoolsPath)
     from mctools.mcnp.mctal import MCTAL as mc_tools
     print("mctools module was imported successfully")
+
+
+# Reduction functions used to merge neighbouring mesh bins (level-of-detail rendering, tile pyramids)
+blockReducers = {"mean": np.mean, "max": np.max, "min": np.min, "sum": np.sum}
+
+
+def reduceAxis(values, edges, factor, axis=0, method="mean"):
+    """ Merges every "factor" neighbouring bins of values along axis, using strided reshapes.
+
+    When the bin count is not a multiple of factor, the remaining bins form a smaller last block, so the extent is unchanged.
+    Returns the reduced values together with the matching bin edges.
+    """
+    if method not in blockReducers:
+        raise Warning("\nThe reduction method must be one of: " + ", ".join(blockReducers))
+    reducer = blockReducers[method]
+
+    nBins = values.shape[axis]
+    if factor <= 1:
+        return values, np.asarray(edges)
+
+    # Means and sums accumulate in float64, also for float32 meshes (see talliesReader.precision)
+    options = {"dtype": np.float64} if method in ("mean", "sum") else {}
+    values = np.moveaxis(values, axis, 0)
+    nFull = nBins // factor
+    blocks = [reducer(values[:nFull*factor].reshape((nFull, factor) + values.shape[1:]), axis=1, **options)]
+    newEdges = list(edges[0:nFull*factor+1:factor])
+    if nBins % factor:
+        blocks.append(reducer(values[nFull*factor:], axis=0, keepdims=True, **options))
+        newEdges.append(edges[-1])
+    return np.moveaxis(np.concatenate(blocks), 0, axis), np.asarray(newEdges)
+
+
+def blockReduce(talval, hAxis, vAxis, hPixels, vPixels, method="mean"):
+    """ Block-reduces a 2D slice so that it has no more bins than the output image has pixels.
+
+    talval has shape (len(vAxis)-1, len(hAxis)-1), i.e. rows follow the vertical axis, like the slices passed to pcolormesh.
+    Blocks of neighbouring bins are merged with the chosen method ("mean", "max" or "min").
+    Returns the reduced slice together with the matching horizontal and vertical bin edges.
+    """
+    vFactor = int(np.ceil(talval.shape[0] / max(int(vPixels), 1)))
+    hFactor = int(np.ceil(talval.shape[1] / max(int(hPixels), 1)))
+    talval, vAxis = reduceAxis(talval, vAxis, vFactor, axis=0, method=method)
+    talval, hAxis = reduceAxis(talval, hAxis, hFactor, axis=1, method=method)
+    return talval, hAxis, vAxis
+
+
+def drawSlice(ax, hAxis, vAxis, talval, norm=None, cmap=None,
+              exact=False, lodMethod="mean", lodPixels=(1920, 1080)):
+    """ Draws a 2D slice of shape (len(vAxis)-1, len(hAxis)-1) on ax and returns the colour mappable.
+
+    exact=True draws every bin with pcolormesh (the original behaviour).
+    Otherwise, level-of-detail (LOD) rendering is used: slices with more bins than lodPixels=(width, height)
+    are block-reduced to that pixel grid with lodMethod, and uniform grids are drawn with imshow instead of pcolormesh.
+    """
+    if exact:
+        return ax.pcolormesh(hAxis, vAxis, talval, snap=True, norm=norm, cmap=cmap)
+
+    talval, hAxis, vAxis = blockReduce(talval, hAxis, vAxis, lodPixels[0], lodPixels[1], method=lodMethod)
+
+    dh = np.diff(hAxis)
+    dv = np.diff(vAxis)
+    if np.allclose(dh, dh[0]) and np.allclose(dv, dv[0]):
+        return ax.imshow(talval, origin='lower', aspect='auto', interpolation='nearest',
+                         extent=[hAxis[0], hAxis[-1], vAxis[0], vAxis[-1]], norm=norm, cmap=cmap)
+    return ax.pcolormesh(hAxis, vAxis, talval, snap=True, norm=norm, cmap=cmap)
+
+
+
+def newFigure(figsize, pyplot=False, layout=None):
+    """ Returns an empty figure.
+
+    Figures are built without pyplot by default, so that every thread can render its own figures from shared tally data.
+    pyplot=True registers the figure with pyplot instead, which is needed to display it with plt.show().
+    layout="tight" lays the figure out when it is drawn (like fig.tight_layout()), so that building a figure does no text layout,
+    and a built figure can be drawn in another process (see renderPool).
+    """
+    if pyplot:
+        return plt.figure(figsize=figsize, layout=layout)
+    return Figure(figsize=figsize, layout=layout)
+
+
+# Drawing a figure goes through matplotlib's text layout (e.g. the mathtext parser of log-scale tick labels),
+# which is shared by all figures and is not thread-safe. Figures of concurrent threads (e.g. the requests of sliceServer) are therefore
+# drawn one at a time in a process (renderPool draws them in several processes).
+drawLock = threading.Lock()
+
+# Diagnostics are logged to the "mctalPlots" logger (see diagnosticCounter). main() sets its level and format (--log-level, --log-json).
+log = logging.getLogger("mctalPlots")
+
+# Diagnostics that plots can repeat for many mesh bins: code -> what is skipped
+diagnosticMessages = {"xCS": "empty yz plane", "yCS": "empty xz plane", "zCS": "empty xy plane", "projection": "empty projection",
+                      "xLine": "empty x line scan", "yLine": "empty y line scan", "zLine": "empty z line scan"}
+
+
+class diagnosticCounter:
+    """ Aggregates repeated plot diagnostics (e.g. the empty cross sections of a sparse mesh) into per-tally summaries,
+    instead of printing one line per mesh bin.
+
+    Every occurrence is logged at DEBUG level. summarize() logs one WARNING per tally and diagnostic with the number of occurrences,
+    e.g. "Tally f1: 412 empty yz planes skipped (value range is 0)". Log records carry the "tally", diagnostic "code", "count"
+    and the "first" few locations as extra fields, for machine-readable logs (see jsonLogFormatter).
+    """
+
+    def __init__(self):
+        self.counts = OrderedDict()
+        self.lock   = threading.Lock()
+
+    def add(self, tally, code, where):
+        """ Counts a diagnostic (see diagnosticMessages) of tally at where (e.g. "x=5")."""
+        with self.lock:
+            count, first = self.counts.get((tally, code), (0, []))
+            if len(first) < 5:
+                first.append(where)
+            self.counts[(tally, code)] = (count + 1, first)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Tally f%s: %s skipped at %s (value range is 0)", tally, diagnosticMessages[code], where,
+                      extra={"tally": tally, "code": code, "where": where})
+
+    def summarize(self, tally):
+        """ Logs and returns the summaries of tally as {code: count}, and resets its counts."""
+        with self.lock:
+            summaries = OrderedDict((code, self.counts.pop((t, code))) for t, code in list(self.counts) if t == tally)
+        for code, (count, first) in summaries.items():
+            log.warning("Tally f%s: %i %s%s skipped (value range is 0), e.g. at %s", tally, count, diagnosticMessages[code],
+                        "s" if count != 1 else "", ", ".join(first),
+                        extra={"tally": tally, "code": code, "count": count, "first": first})
+        return OrderedDict((code, count) for code, (count, first) in summaries.items())
+
+
+class jsonLogFormatter(logging.Formatter):
+    """ Formats log records as JSON lines with the time, level, message and the extra fields of diagnostics (see diagnosticCounter)."""
+
+    fields = ("tally", "code", "count", "first", "where")
+
+    def format(self, record):
+        entry = OrderedDict([("time", self.formatTime(record)), ("level", record.levelname), ("message", record.getMessage())])
+        for field in self.fields:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        return json.dumps(entry, default=str)
+
+
+def meshIndices(axis, x=None):
+    """ Returns the bin edge indices (1..len(axis)-1) of a mesh axis to plot, or only the index of x if x is given.
+    The first edge is skipped (fencepost: we get 1 tally value between 2 bin edges).
+    """
+    if x == None:
+        return list(range(1, len(axis)))
+    return [i for i in range(1, len(axis)) if axis[i] == x]
+
+
+def meshPlane(talval, axis, index):
+    """ Returns the plane of a 3D mesh at 0-based bin index of axis (0, 1 or 2), like np.take(talval, index, axis),
+    but with basic indexing, so a sparseMesh only fills the plane instead of the whole mesh.
+    """
+    return talval[(slice(None),)*axis + (index,)]
+
+
+# Line-scan families: all line scans along an axis at one bin of a fixed axis, coloured by the remaining axis
+familyAxes = {"x": "z", "y": "z", "z": "y"}
+
+
+def meshWorkUnits(xIndices, yIndices, zIndices,
+                  xCS=False, yCS=False, zCS=False,
+                  xLine=False, yLine=False, zLine=False, lineFamily=False):
+    """ Lists the plots (work units) to produce for the selected bin edge indices of a mesh, as (plot, indices) tuples.
+    CS plots are indexed by their normal axis, e.g. ("xCS", (x,)); line scans by the two other axes, e.g. ("xLine", (y, z)).
+    With lineFamily=True, line scans are grouped into families indexed by their fixed axis (see familyAxes), e.g. ("xFamily", (z,)).
+    """
+    indices = {"x": xIndices, "y": yIndices, "z": zIndices}
+    units = []
+    if xCS:
+        units += [("xCS", (xx,)) for xx in xIndices]
+    if yCS:
+        units += [("yCS", (yy,)) for yy in yIndices]
+    if zCS:
+        units += [("zCS", (zz,)) for zz in zIndices]
+    if lineFamily:
+        for axis, line in zip("xyz", (xLine, yLine, zLine)):
+            if line:
+                units += [(axis+"Family", (index,)) for index in indices[familyAxes[axis]]]
+        return units
+    if xLine:
+        units += [("xLine", (yy, zz)) for yy in yIndices for zz in zIndices]
+    if yLine:
+        units += [("yLine", (xx, zz)) for xx in xIndices for zz in zIndices]
+    if zLine:
+        units += [("zLine", (xx, yy)) for xx in xIndices for yy in yIndices]
+    return units
+
+
+def hotspotWorkUnits(hotspots, xCS=False, yCS=False, zCS=False,
+                     xLine=False, yLine=False, zLine=False, lineFamily=False):
+    """ Lists the plots (work units, see meshWorkUnits) through the given mesh bins, without duplicates.
+    hotspots are 0-based (i, j, k) bin indices, e.g. from findHotspots.
+    """
+    units = []
+    for i, j, k in hotspots:
+        xx, yy, zz = i+1, j+1, k+1
+        if lineFamily:
+            lines = (("xFamily", (zz,), xLine), ("yFamily", (zz,), yLine), ("zFamily", (yy,), zLine))
+        else:
+            lines = (("xLine", (yy, zz), xLine), ("yLine", (xx, zz), yLine), ("zLine", (xx, yy), zLine))
+        for plot, indices, selected in (("xCS", (xx,), xCS), ("yCS", (yy,), yCS), ("zCS", (zz,), zCS)) + lines:
+            if selected and (plot, indices) not in units:
+                units.append((plot, indices))
+    return units
+
+
+def findHotspots(values, errors, k=10, maxError=None):
+    """ Returns the k largest positive values of an N-D array as a list of (index, value, error), largest first.
+
+    index is the 0-based index tuple of the value. Values with a relative error above maxError are skipped.
+    The k values are found with a partial selection (np.argpartition) over the whole array instead of a full sort.
+    For sparseMesh arrays, only the stored blocks are searched, since all other values are zero.
+    """
+    if k < 1:
+        raise Warning("\nThe number of hotspots k must be at least 1")
+    shape  = np.shape(values)
+    if isinstance(values, sparseMesh):
+        indices, values = values.stored()
+        errors = errors.stored()[1]
+        bins   = np.ravel_multi_index(indices, shape)
+    else:
+        values = np.asarray(values).ravel()
+        errors = np.asarray(errors).ravel()
+        bins   = None
+
+    candidates = values > 0
+    if maxError != None:
+        candidates &= errors <= maxError
+    candidates = np.flatnonzero(candidates)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(values[candidates], len(candidates)-k)[len(candidates)-k:]]
+    candidates = candidates[np.argsort(values[candidates])[::-1]]
+    return [(np.unravel_index(c if bins is None else bins[c], shape), values[c], errors[c]) for c in candidates]
+
+
+# Plot styling of the mesh tally types
+meshStyles = {
+    "f1": {"quantity": "distribution", "cmap": None,     "cbar_label": None,                  "talval_label": None,                  "markersize": 3},
+    "f3": {"quantity": "heat load",    "cmap": "plasma", "cbar_label": "Heat load [MeV/cm³]", "talval_label": "Heat load [MeV/cm³]", "markersize": 2.5},
+}
+
+
+def renderCS(talval, hAxis, vAxis, hLabel, vLabel, title,
+             fontsize=12, suptitle=None, overlayImg=None,
+             cmap=None, cbar_label=None, vmin=None, vmax=None,
+             xlim=(None, None), ylim=(None, None),
+             exact=False, lodMethod="mean", dpi=120, pyplot=False):
+    """ Returns the figure of a 2D cross section.
+
+    talval has shape (len(vAxis)-1, len(hAxis)-1).
+    dpi is only used to size level-of-detail rendering (see drawSlice); it is applied when the figure is saved.
+    """
+    fig = newFigure((16, 9), pyplot, layout="tight")
+    ax = fig.subplots()
+
+    # Axes and values
+    im = drawSlice(ax, hAxis, vAxis, talval, norm=LogNorm(vmin=vmin, vmax=vmax), cmap=cmap,
+                   exact=exact, lodMethod=lodMethod, lodPixels=(16*dpi, 9*dpi))
+    ax.set_xlabel(hLabel, fontsize=fontsize)
+    ax.set_ylabel(vLabel, fontsize=fontsize)
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
+
+    # Colour bar
+    cbar = fig.colorbar(im, ax=ax)
+    cbar.ax.tick_params(labelsize=fontsize*0.85)
+    if cbar_label:
+        cbar.set_label(cbar_label, fontsize=fontsize)
+
+    # Titles
+    if suptitle:
+        fig.suptitle(suptitle, fontsize=fontsize*1.4, horizontalalignment='center', x=0.6)
+    ax.set_title(title, fontsize=fontsize*1.15)
+    ax.set_aspect('equal')
+
+    # Option to add image on top of plot
+    if overlayImg:
+        img = plt.imread(overlayImg)
+        ax.imshow(img, zorder=3, extent=[hAxis[0], hAxis[-1], vAxis[0], vAxis[-1]])
+    return fig
+
+
+def renderLine(points, talval, xLabel, title,
+               fontsize=12, talval_label=None, logscale=True, markersize=3,
+               xlim=(None, None), ylim=(None, None), pyplot=False):
+    """ Returns the figure of a 1D line scan (talval plotted at points)."""
+    fig = newFigure((16, 9), pyplot, layout="tight")
+    ax = fig.subplots()
+    ax.plot(points, talval, "ko", markersize=markersize)
+    ax.set_title(title, fontsize=fontsize*1.33)
+    ax.set_xlabel(xLabel, fontsize=fontsize)
+    if talval_label:
+        ax.set_ylabel(talval_label, fontsize=fontsize)
+    if logscale==True:
+        ax.set_yscale('log')
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
+    ax.grid()
+    return fig
+
+
+def renderLineFamily(points, lines, colours, xLabel, colourLabel, title, errors=None,
+                     fontsize=12, talval_label=None, logscale=True, markersize=3, cmap="viridis",
+                     xlim=(None, None), ylim=(None, None), pyplot=False):
+    """ Returns the figure of a family of 1D line scans, each plotted at points and coloured by its value in colours.
+
+    lines has shape (len(colours), len(points)). With errors (relative errors of the same shape),
+    every line is drawn with an error band of +/- one standard deviation.
+    """
+    fig = newFigure((16, 9), pyplot, layout="tight")
+    ax = fig.subplots()
+    norm = Normalize(vmin=np.min(colours), vmax=np.max(colours))
+    cmap = plt.get_cmap(cmap)
+    for n, line in enumerate(lines):
+        colour = cmap(norm(colours[n]))
+        ax.plot(points, line, "o-", color=colour, markersize=markersize, linewidth=1)
+        if errors is not None:
+            ax.fill_between(points, line*(1-errors[n]), line*(1+errors[n]), where=line > 0,
+                            color=colour, alpha=0.2, linewidth=0)
+    ax.set_title(title, fontsize=fontsize*1.33)
+    ax.set_xlabel(xLabel, fontsize=fontsize)
+    if talval_label:
+        ax.set_ylabel(talval_label, fontsize=fontsize)
+    if logscale==True:
+        ax.set_yscale('log')
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
+    ax.grid()
+
+    # Colour bar of the colouring coordinate
+    cbar = fig.colorbar(ScalarMappable(norm=norm, cmap=cmap), ax=ax)
+    cbar.ax.tick_params(labelsize=fontsize*0.85)
+    cbar.set_label(colourLabel, fontsize=fontsize)
+    return fig
+
+
+def meshCSFigure(talType, axis, index, xAxis, yAxis, zAxis, talval, fm=1, switchAxis=False,
+                 amin=None, amax=None, bmin=None, bmax=None, cbar_label=None, **options):
+    """ Returns the cross-section figure of an f1 or f3 ("talType") mesh at bin "index" of axis ("x", "y" or "z").
+
+    Like the names of the saved CS plots, index counts the axis bin edges: the plane lies between edges index-1 and index.
+    a and b are the two remaining axes in x, y, z order (e.g. y and z for an x cross section).
+    amin, amax, bmin and bmax are their plot limits, which follow the axes when switchAxis=True.
+    Other keyword arguments are passed to renderCS.
+    """
+    style = meshStyles[talType]
+    edges = {"x": xAxis, "y": yAxis, "z": zAxis}
+    a, b  = [d for d in "xyz" if d != axis]
+    plane = meshPlane(talval, "xyz".index(axis), index-1).transpose()*fm
+
+    title = '%s%s-plane 2D %s between %s = %scm and %s =%scm\n' % (a, b, style["quantity"],
+            axis, str(edges[axis][index-1]), axis, str(edges[axis][index]))
+    return meshPlaneFigure(talType, axis, plane, xAxis, yAxis, zAxis, title, switchAxis=switchAxis,
+                           amin=amin, amax=amax, bmin=bmin, bmax=bmax, cbar_label=cbar_label, **options)
+
+
+def meshPlaneFigure(talType, axis, plane, xAxis, yAxis, zAxis, title, switchAxis=False,
+                    amin=None, amax=None, bmin=None, bmax=None, cbar_label=None, **options):
+    """ Returns the figure of a 2D plane normal to axis, with shape (len(bAxis)-1, len(aAxis)-1) (see meshCSFigure)."""
+    style = meshStyles[talType]
+    edges = {"x": xAxis, "y": yAxis, "z": zAxis}
+    a, b  = [d for d in "xyz" if d != axis]
+    if cbar_label == None:
+        cbar_label = style["cbar_label"]
+    options.setdefault("cmap", style["cmap"])
+
+    if switchAxis == False:
+        return renderCS(plane, edges[a], edges[b], a+' [cm]', b+' [cm]', title, cbar_label=cbar_label,
+                        xlim=(amin, amax), ylim=(bmin, bmax), **options)
+    else:
+        return renderCS(plane.transpose(), edges[b], edges[a], b+' [cm]', a+' [cm]', title, cbar_label=cbar_label,
+                        xlim=(bmin, bmax), ylim=(amin, amax), **options)
+
+
+# Projection methods of meshProjections and their names in plot titles
+projectionNames = {"max": "maximum", "mean": "mean", "sum": "summed"}
+
+
+def meshProjections(talval, methods=("max", "mean", "sum"), slabBytes=2**24):
+    """ Returns the projections of a 3D mesh along x, y and z as a dictionary {(method, axis): 2D array}.
+    For example, ("max", "x") is the maximum intensity projection onto the yz-plane, with shape (ny, nz).
+
+    "max" takes the maximum along the axis, "sum" adds the bins up and "mean" is their sum divided by the number of bins.
+    All projections are built in a single pass over slabs of whole x planes (about slabBytes each),
+    so a memory-mapped mesh is read once and never loaded into memory as a whole.
+    """
+    for method in methods:
+        if method not in projectionNames:
+            raise Warning("\nThe projection method must be one of: " + ", ".join(projectionNames))
+    nx, ny, nz = talval.shape
+    planes = min(nx, max(1, slabBytes // (ny*nz*8)))
+
+    # Running maxima and sums along x; the y and z projections are filled slab by slab.
+    maxima = {"x": np.full((ny, nz), -np.inf), "y": np.empty((nx, nz)), "z": np.empty((nx, ny))}
+    sums   = {"x": np.zeros((ny, nz)),         "y": np.empty((nx, nz)), "z": np.empty((nx, ny))}
+    for i in range(0, nx, planes):
+        slab = np.asarray(talval[i:i+planes], dtype=float)
+        if "max" in methods:
+            np.maximum(maxima["x"], slab.max(axis=0), out=maxima["x"])
+            maxima["y"][i:i+planes] = slab.max(axis=1)
+            maxima["z"][i:i+planes] = slab.max(axis=2)
+        if "mean" in methods or "sum" in methods:
+            sums["x"] += slab.sum(axis=0)
+            sums["y"][i:i+planes] = slab.sum(axis=1)
+            sums["z"][i:i+planes] = slab.sum(axis=2)
+
+    projections = {}
+    for axis, n in zip("xyz", talval.shape):
+        for method in methods:
+            if method == "max":
+                projections[(method, axis)] = maxima[axis]
+            elif method == "sum":
+                projections[(method, axis)] = sums[axis]
+            else:
+                projections[(method, axis)] = sums[axis] / n
+    return projections
+
+
+# Statistics of the slices of a mesh (see meshStatistics): how the values of a plane or line scan are reduced, and how slabs are combined
+sliceStatisticNames = ("min", "minPositive", "max", "sum", "nonzero", "maxError")
+sliceReductions = {"min": np.min, "minPositive": lambda a, axis: np.where(a > 0, a, np.inf).min(axis=axis), "max": np.max,
+                   "sum": np.sum, "nonzero": np.count_nonzero, "maxError": np.max}
+sliceCombinations = {"min": np.minimum, "minPositive": np.minimum, "max": np.maximum,
+                     "sum": np.add, "nonzero": np.add, "maxError": np.maximum}
+
+
+def meshStatistics(talval, talerr, slabBytes=2**24, digest=None):
+    """ Returns the statistics of every plane and line scan of a 3D mesh as a dictionary {(kind, axis, name): array}.
+    kind "plane" holds the planes normal to axis, with shape (n,) of that axis; kind "line" the line scans along axis,
+    with the shape of the two other axes, e.g. (ny, nz) for the x line scans.
+    names are sliceStatisticNames: the minimum, smallest positive value (inf without one), maximum and sum of the values,
+    their number of nonzero values, and the maximum relative error.
+
+    Like meshProjections, the line scans are reduced in a single pass over slabs of whole x planes,
+    and the planes are then reduced from the line scans without reading the mesh again.
+    digest is an optional hashlib object, which is updated with the values and errors of every slab as they are stored (see indexSlices).
+    """
+    nx, ny, nz = talval.shape
+    planes = min(nx, max(1, slabBytes // (ny*nz*8)))
+
+    # 1. Line scans: x line scans are combined slab by slab, y and z line scans are filled slab by slab
+    stats = {}
+    for name in sliceStatisticNames:
+        stats[("line", "y", name)] = np.empty((nx, nz))
+        stats[("line", "z", name)] = np.empty((nx, ny))
+    for i in range(0, nx, planes):
+        slab = np.asarray(talval[i:i+planes])
+        errs = np.asarray(talerr[i:i+planes])
+        if digest != None:
+            digest.update(np.ascontiguousarray(slab).data)
+            digest.update(np.ascontiguousarray(errs).data)
+        slab, errs = slab.astype(float, copy=False), errs.astype(float, copy=False)
+        for name in sliceStatisticNames:
+            data = errs if name == "maxError" else slab
+            reduced = sliceReductions[name](data, axis=0)
+            if i == 0:
+                stats[("line", "x", name)] = np.asarray(reduced, dtype=float)
+            else:
+                sliceCombinations[name](stats[("line", "x", name)], reduced, out=stats[("line", "x", name)])
+            stats[("line", "y", name)][i:i+planes] = sliceReductions[name](data, axis=1)
+            stats[("line", "z", name)][i:i+planes] = sliceReductions[name](data, axis=2)
+
+    # 2. Planes: x planes from the y line scans, y and z planes from the x line scans (nonzero counts and sums add up)
+    for name in sliceStatisticNames:
+        reduce = {np.minimum: np.min, np.maximum: np.max, np.add: np.sum}[sliceCombinations[name]]
+        stats[("plane", "x", name)] = reduce(stats[("line", "y", name)], axis=1)
+        stats[("plane", "y", name)] = reduce(stats[("line", "x", name)], axis=1)
+        stats[("plane", "z", name)] = reduce(stats[("line", "x", name)], axis=0)
+    return stats
+
+
+class sliceStatistics:
+    """ Statistics index of the planes and line scans of an N-D mesh tally (see meshTally and meshStatistics).
+
+    Every statistic is an array with the extra bin axes of the mesh first ("f" to "t"), followed by the axes of the planes or line scans,
+    so plotters and planners can skip empty or constant slices, order them by importance and pick colour limits
+    without reading the mesh. loadMeshTally keeps the index next to the mesh cache (e.g. ./tallies/F1/f1_cache/stats.npz).
+    Bin selections work like meshTally.view: extra axes that are not selected are set to their last bin.
+    The index also holds a content digest of every 3D mesh, which identifies its data without reading it (see digest).
+    """
+
+    def __init__(self, arrays):
+        self.arrays = arrays
+        self.shape  = dict(zip(meshTally.axes[:-3], arrays["plane_x_max"].shape[:-1]))
+
+    def save(self, file):
+        """ Saves the index as an uncompressed .npz file."""
+        np.savez(file, **self.arrays)
+
+    def get(self, kind, axis, name, bins=None):
+        """ Returns a statistic of the planes ("plane") or line scans ("line") of an axis for a selection of extra bins, e.g. get("plane", "z", "max", {"e": 2})."""
+        bins  = bins or {}
+        index = tuple(bins.get(a, self.shape[a]-1) for a in meshTally.axes[:-3])
+        return self.arrays["%s_%s_%s" % (kind, axis, name)][index]
+
+    def digest(self, bins=None):
+        """ Returns the content digest of the values and errors of the 3D mesh of a selection (see indexSlices),
+        or None if the index was saved without digests.
+        """
+        if "digest" not in self.arrays:
+            return None
+        bins = bins or {}
+        return str(self.arrays["digest"][tuple(bins.get(a, self.shape[a]-1) for a in meshTally.axes[:-3])])
+
+    def planeRange(self, axis, index, bins=None):
+        """ Returns the (min, max) values of the plane at bin edge index of axis (1-based, like the names of the CS plots)."""
+        return self.get("plane", axis, "min", bins)[index-1], self.get("plane", axis, "max", bins)[index-1]
+
+    def lineRange(self, axis, indices, bins=None):
+        """ Returns the (min, max) values of the line scan along axis at the bin edge indices of the other two axes
+        (1-based, like the names of the line scan plots).
+        """
+        a, b = indices
+        return self.get("line", axis, "min", bins)[a-1, b-1], self.get("line", axis, "max", bins)[a-1, b-1]
+
+    def limits(self, bins=None):
+        """ Returns the (smallest positive, largest) value of the 3D mesh of a selection, e.g. as a colour scale shared by all its plots.
+        The smallest positive value is None if the mesh has no positive values.
+        """
+        low = self.get("plane", "x", "minPositive", bins).min()
+        return (low if np.isfinite(low) else None), self.get("plane", "x", "max", bins).max()
+
+    def importance(self, unit, bins=None):
+        """ Returns the sum of the values that a work unit (see meshWorkUnits) plots: of its plane, line scan, or family of line scans."""
+        plot, indices = unit
+        axis = plot[0]
+        if plot.endswith("CS"):
+            return self.get("plane", axis, "sum", bins)[indices[0]-1]
+        if plot.endswith("Family"):
+            return self.get("plane", familyAxes[axis], "sum", bins)[indices[0]-1]
+        return self.get("line", axis, "sum", bins)[indices[0]-1, indices[1]-1]
+
+    def rank(self, units, bins=None):
+        """ Returns the work units ordered by importance (largest sum first), keeping the order of their plot kinds."""
+        kinds = list(OrderedDict.fromkeys(unit[0] for unit in units))
+        return sorted(units, key=lambda unit: (kinds.index(unit[0]), -self.importance(unit, bins)))
+
+
+def indexSlices(values, errors, slabBytes=2**24):
+    """ Returns the sliceStatistics of N-D mesh values and relative errors with the axes of meshTally.axes,
+    reducing the 3D mesh of every combination of extra bins with meshStatistics.
+    The SHA-1 of the values and errors of every 3D mesh, as they are stored (e.g. float32), is computed in the same pass.
+    """
+    extra = values.shape[:-3]
+    arrays = {"digest": np.empty(extra, dtype="<U40")}
+    for bins in np.ndindex(*extra):
+        digest = hashlib.sha1(repr((values.dtype.str, errors.dtype.str, values.shape[-3:])).encode())
+        for (kind, axis, name), stat in meshStatistics(values[bins], errors[bins], slabBytes=slabBytes, digest=digest).items():
+            key = "%s_%s_%s" % (kind, axis, name)
+            if key not in arrays:
+                arrays[key] = np.empty(extra + stat.shape)
+            arrays[key][bins] = stat
+        arrays["digest"][bins] = digest.hexdigest()
+    return sliceStatistics(arrays)
+
+
+def roiWeights(edges, lo, hi):
+    """ Returns the fraction of every bin of an axis (given by its bin edges) that lies between lo and hi [cm]."""
+    edges = np.asarray(edges, dtype=float)
+    return np.clip(np.minimum(edges[1:], hi) - np.maximum(edges[:-1], lo), 0, None) / np.diff(edges)
+
+
+def readROIs(rois):
+    """ Returns regions of interest as a list of (name, boxes), where boxes is an (n, 6) array of [xmin, xmax, ymin, ymax, zmin, zmax] rows [cm].
+    rois is a list of dictionaries with a "name" and a list of "boxes" (or a single "box"), as in ROI files (see roiIntegrator),
+    or a dictionary with such a list as "rois".
+    """
+    if type(rois) == dict:
+        rois = rois.get("rois")
+    if not type(rois) == list:
+        raise TypeError("rois must be a list of regions of interest, e.g. [{\"name\": \"target\", \"boxes\": [[xmin, xmax, ymin, ymax, zmin, zmax]]}]")
+    regions = []
+    for n, roi in enumerate(rois):
+        boxes = np.array(roi["boxes"] if "boxes" in roi else [roi.get("box")], dtype=float, ndmin=2)
+        if boxes.shape[1:] != (6,) or len(boxes) == 0:
+            raise Warning("\nEvery box of a region of interest must be [xmin, xmax, ymin, ymax, zmin, zmax] in cm")
+        if np.any(boxes[:, 1::2] <= boxes[:, 0::2]):
+            raise Warning("\nThe boxes of region of interest %s have a minimum that is not below their maximum" % roi.get("name", n+1))
+        regions.append((str(roi.get("name", "roi%i" % (n+1))), boxes))
+    return regions
+
+
+def meshROIs(xAxis, yAxis, zAxis, talval, talerr, regions, slabBytes=2**24):
+    """ Returns the statistics of regions of interest of a 3D mesh (as returned by loadMesh) as a list of dictionaries, one per region (see readROIs):
+    "volume" [cm³], "integral" (sum of value*volume, e.g. MeV for a heat load in MeV/cm³), "mean" (integral/volume), "max"
+    and the relative "error" of the integral and the mean, propagated from the relative errors of the bins (assumed independent).
+
+    Bins cut by a box count with the fraction of their volume inside it (see roiWeights). For unions of boxes,
+    the fractions of the boxes are added up to at most a whole bin, which is exact unless boxes overlap inside a partial bin.
+    Like meshProjections, all regions are reduced in a single pass over slabs of whole x planes, each region over the bins it covers.
+    """
+    nx, ny, nz = talval.shape
+    planes = min(nx, max(1, slabBytes // (ny*nz*8)))
+    edges  = [np.asarray(a, dtype=float) for a in (xAxis, yAxis, zAxis)]
+    volume = np.diff(edges[0])[:, None, None] * np.diff(edges[1])[None, :, None] * np.diff(edges[2])[None, None, :]
+
+    # 1. Bin weights of every box along x, y and z, and the bin ranges covered by each region (boxes outside of the mesh add nothing)
+    prepared = []
+    for name, boxes in regions:
+        weights, ranges = [], [(nx, 0), (ny, 0), (nz, 0)]
+        for box in boxes:
+            w = [roiWeights(edges[a], box[2*a], box[2*a+1]) for a in range(3)]
+            if all(np.any(wa > 0) for wa in w):
+                weights.append(w)
+                ranges = [(min(lo, np.flatnonzero(wa)[0]), max(hi, np.flatnonzero(wa)[-1]+1)) for (lo, hi), wa in zip(ranges, w)]
+        prepared.append((weights, ranges))
+
+    # 2. Single pass: every slab is read once and reduced for all regions that cross it
+    sums = np.zeros((len(regions), 3))
+    maxima = np.full(len(regions), -np.inf)
+    for i in range(0, nx, planes):
+        slab = np.asarray(talval[i:i+planes], dtype=float)
+        errs = np.asarray(talerr[i:i+planes], dtype=float)
+        for r, (weights, ((x0, x1), (y0, y1), (z0, z1))) in enumerate(prepared):
+            a0, a1 = max(x0, i), min(x1, i+len(slab))
+            if a0 >= a1:
+                continue
+            w = sum(wx[a0:a1, None, None] * wy[None, y0:y1, None] * wz[None, None, z0:z1] for wx, wy, wz in weights)
+            if len(weights) > 1:
+                w = np.minimum(w, 1)
+            values = slab[a0-i:a1-i, y0:y1, z0:z1]
+            wV = w * volume[a0:a1, y0:y1, z0:z1]
+            sums[r] += (wV.sum(), (wV*values).sum(), ((wV*values*errs[a0-i:a1-i, y0:y1, z0:z1])**2).sum())
+            if np.any(w > 0):
+                maxima[r] = max(maxima[r], values[w > 0].max())
+
+    # 3. Statistics of every region
+    statistics = []
+    for (name, boxes), (vol, integral, variance), maximum in zip(regions, sums, maxima):
+        statistics.append({"name": name, "boxes": len(boxes), "volume": float(vol), "integral": float(integral),
+                           "mean": float(integral/vol) if vol > 0 else 0.0, "max": float(maximum) if vol > 0 else 0.0,
+                           "error": float(np.sqrt(variance)/abs(integral)) if integral != 0 else 0.0})
+    return statistics
+
+
+def meshHistogram(xAxis, yAxis, zAxis, talval, edges, weighted=True, slabBytes=2**24):
+    """ Returns the histogram of the values of a 3D mesh (as returned by loadMesh) over the given bin edges of the values,
+    as (counts, below, above): the volume [cm³] of the mesh bins whose value falls in every histogram bin, and the volume of those
+    below edges[0] (e.g. zeros) and above edges[-1]. With weighted=False, mesh bins are counted instead of their volumes.
+    Like meshProjections, the histogram is built in a single pass over slabs of whole x planes.
+    """
+    nx, ny, nz = talval.shape
+    planes = min(nx, max(1, slabBytes // (ny*nz*8)))
+    dx, dy, dz = [np.diff(np.asarray(a, dtype=float)) for a in (xAxis, yAxis, zAxis)]
+    area = dy[:, None] * dz[None, :]
+
+    counts, below, above = np.zeros(len(edges)-1), 0.0, 0.0
+    for i in range(0, nx, planes):
+        slab = np.asarray(talval[i:i+planes], dtype=float)
+        weights = dx[i:i+len(slab), None, None] * area[None] if weighted else np.ones(slab.shape)
+        counts += np.histogram(slab, bins=edges, weights=weights)[0]
+        below  += weights[slab < edges[0]].sum()
+        above  += weights[slab > edges[-1]].sum()
+    return counts, below, above
+
+
+def renderVolumeHistogram(thresholds, above, total, title, xLabel, yLabel="Volume above threshold [cm³]",
+                          limits=None, fontsize=12, pyplot=False):
+    """ Returns the figure of a cumulative volume histogram: the volume (above) whose value is at least every threshold,
+    with the fraction of the total volume on a second axis.
+    limits are the design limits to mark, as (limit, volume above the limit) pairs.
+    """
+    fig = newFigure((16, 9), pyplot, layout="tight")
+    ax = fig.subplots()
+    ax.step(thresholds, above, where="post", color="k")
+    ax.set_xscale("log")
+    if np.any(above > 0):
+        ax.set_yscale("log")
+    ax.set_xlabel(xLabel, fontsize=fontsize)
+    ax.set_ylabel(yLabel, fontsize=fontsize)
+    ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
+    ax.grid(which="both", alpha=0.4)
+
+    # Fraction of the total volume
+    if total > 0:
+        fraction = ax.secondary_yaxis("right", functions=(lambda v: v/total, lambda f: f*total))
+        fraction.set_ylabel("Fraction of the mesh volume", fontsize=fontsize)
+        fraction.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
+
+    # Design limits
+    for limit, volume in limits or []:
+        ax.axvline(limit, color="tab:red", linestyle="--")
+        ax.annotate(" %.3g above %g" % (volume, limit), (limit, 0.95), xycoords=("data", "axes fraction"),
+                    color="tab:red", fontsize=fontsize*0.85, verticalalignment="top")
+    ax.set_title(title, fontsize=fontsize*1.15)
+    return fig
+
+
+def meshProjectionFigure(talType, method, axis, xAxis, yAxis, zAxis, projection, fm=1, **options):
+    """ Returns the figure of a projection of an f1 or f3 ("talType") mesh along axis (see meshProjections).
+    Other keyword arguments are passed to meshPlaneFigure (e.g. switchAxis and plot limits) and renderCS.
+    """
+    a, b  = [d for d in "xyz" if d != axis]
+    title = '%s%s-plane %s projection of the %s along %s\n' % (a, b, projectionNames[method], meshStyles[talType]["quantity"], axis)
+    return meshPlaneFigure(talType, axis, projection.transpose()*fm, xAxis, yAxis, zAxis, title, **options)
+
+
+def meshLineFigure(talType, axis, indices, xAxis, yAxis, zAxis, talval, fm=1, talval_label=None, **options):
+    """ Returns the line-scan figure of an f1 or f3 ("talType") mesh along axis ("x", "y" or "z").
+
+    indices are the bin edge indices of the two remaining axes in x, y, z order (e.g. (y, z) for an x line scan),
+    counted like in the names of the saved line-scan plots. Other keyword arguments are passed to renderLine.
+    """
+    style = meshStyles[talType]
+    edges = {"x": xAxis, "y": yAxis, "z": zAxis}
+    a, b  = [d for d in "xyz" if d != axis]
+    select = [indices[0]-1, indices[1]-1]
+    select.insert("xyz".index(axis), slice(None))
+    line = talval[tuple(select)]*fm
+
+    title = '%s-axis 1D distribution at %s =%scm and %s=%scm\n' % (axis, a, str(edges[a][indices[0]]), b, str(edges[b][indices[1]]))
+    if talval_label == None:
+        talval_label = style["talval_label"]
+    options.setdefault("markersize", style["markersize"])
+    return renderLine(edges[axis][1:], line, axis+' [cm]', title, talval_label=talval_label, **options)
+
+
+def meshLineFamilyFigure(talType, axis, index, xAxis, yAxis, zAxis, talval, talerr=None, fm=1, lines=None,
+                         talval_label=None, **options):
+    """ Returns the figure of all line scans of an f1 or f3 ("talType") mesh along axis at bin edge index of the fixed axis
+    (see familyAxes, e.g. all x line scans at one z), coloured by the remaining axis.
+
+    lines optionally selects the line scans by the bin edge indices of the colouring axis (all line scans by default).
+    With talerr, the line scans get error bands (see renderLineFamily). Other keyword arguments are passed to renderLineFamily.
+    """
+    style = meshStyles[talType]
+    edges = {"x": xAxis, "y": yAxis, "z": zAxis}
+    fixed = familyAxes[axis]
+    colour = [d for d in "xyz" if d not in (axis, fixed)][0]
+    if lines == None:
+        lines = meshIndices(edges[colour])
+    rows = [i-1 for i in lines]
+
+    # Lines are the rows of the (colour, axis) plane at the fixed bin
+    def family(values):
+        plane = meshPlane(values, "xyz".index(fixed), index-1)
+        plane = np.moveaxis(plane, [d for d in "xyz" if d != fixed].index(colour), 0)
+        return plane[rows]
+
+    title = '%s-axis 1D distributions at %s =%scm, coloured by %s\n' % (axis, fixed, str(edges[fixed][index]), colour)
+    if talval_label == None:
+        talval_label = style["talval_label"]
+    options.setdefault("markersize", style["markersize"])
+    errors = family(talerr) if talerr is not None else None
+    return renderLineFamily(edges[axis][1:], family(talval)*fm, np.asarray(edges[colour])[lines], axis+' [cm]',
+                            colour+' [cm]', title, errors=errors, talval_label=talval_label, **options)
+
+
+def writeLineScans(file, axis, xAxis, yAxis, zAxis, talval, talerr):
+    """ Writes every line scan of a mesh along axis ("x", "y" or "z") into one .npz file.
+
+    "values" and "errors" hold the tally values and relative errors with the line axis last,
+    e.g. shape (ny, nz, nx) for x line scans, so that values[yy-1, zz-1] is the line saved as f1_xLine_y{yy}_z{zz}.
+    "x", "y" and "z" hold the upper bin edges, i.e. the positions at which line scans are plotted and named.
+    """
+    a = "xyz".index(axis)
+    np.savez(file, axis=axis,
+             values=np.ascontiguousarray(np.moveaxis(talval, a, -1)),
+             errors=np.ascontiguousarray(np.moveaxis(talerr, a, -1)),
+             x=np.asarray(xAxis[1:]), y=np.asarray(yAxis[1:]), z=np.asarray(zAxis[1:]))
+
+
+def writeVTK(file, xAxis, yAxis, zAxis, talval, talerr, compress=True, slabBytes=2**22):
+    """ Writes a mesh into a binary VTK rectilinear grid file (.vtr) with the cell fields "values" and "errors" (relative errors).
+
+    The mesh is streamed in slabs of whole z planes of about slabBytes each, so memory stays bounded for memory-mapped meshes.
+    compress=True compresses every slab with zlib (vtkZLibDataCompressor). Compressed sizes are only known once a slab is written,
+    so the array offsets in the XML header and the block sizes of every array are written as placeholders and patched afterwards.
+    """
+    nx, ny, nz = talval.shape
+    planes = min(nz, max(1, slabBytes // (nx*ny*8)))
+    extent = "0 %i 0 %i 0 %i" % (nx, ny, nz)
+
+    # 1. XML header. Offsets are fixed-width placeholders, so they can be patched without moving the appended data.
+    placeholder = "%020i" % 0
+    header  = '<?xml version="1.0"?>\n'
+    header += '<VTKFile type="RectilinearGrid" version="1.0" byte_order="LittleEndian" header_type="UInt64"'
+    header += ' compressor="vtkZLibDataCompressor">\n' if compress else '>\n'
+    header += '  <RectilinearGrid WholeExtent="%s">\n' % extent
+    header += '    <Piece Extent="%s">\n' % extent
+    header += '      <CellData Scalars="values">\n'
+    offsets = {}
+    for name in ("values", "errors", "x", "y", "z"):
+        if name == "x":
+            header += '      </CellData>\n      <Coordinates>\n'
+        header += '        <DataArray type="Float64" Name="%s" format="appended" offset="' % name
+        offsets[name] = len(header)
+        header += placeholder + '"/>\n'
+    header += '      </Coordinates>\n    </Piece>\n  </RectilinearGrid>\n  <AppendedData encoding="raw">\n   _'
+
+    def slabs(values):
+        # Cell data is ordered with x fastest, i.e. (z, y, x) in C order.
+        for k in range(0, nz, planes):
+            yield np.asarray(values[:, :, k:k+planes], dtype='<f8').transpose(2, 1, 0).tobytes()
+
+    with open(file, 'wb') as f:
+        f.write(header.encode('ascii'))
+        dataStart = f.tell()
+
+        # 2. Appended data: every array starts with its UInt64 header (byte count, or block count and sizes if compressed).
+        for name, blocks, nBytes, blockSize in (("values", slabs(talval), talval.size*8, nx*ny*planes*8),
+                                                ("errors", slabs(talerr), talerr.size*8, nx*ny*planes*8),
+                                                ("x", [np.asarray(xAxis, dtype='<f8').tobytes()], len(xAxis)*8, len(xAxis)*8),
+                                                ("y", [np.asarray(yAxis, dtype='<f8').tobytes()], len(yAxis)*8, len(yAxis)*8),
+                                                ("z", [np.asarray(zAxis, dtype='<f8').tobytes()], len(zAxis)*8, len(zAxis)*8)):
+            offset = f.tell() - dataStart
+            end = f.tell()
+            f.seek(offsets[name])
+            f.write(b"%020i" % offset)
+            f.seek(end)
+
+            if not compress:
+                f.write(np.uint64(nBytes).astype('<u8').tobytes())
+                for block in blocks:
+                    f.write(block)
+            else:
+                nBlocks = -(-nBytes // blockSize)
+                blockHeader = f.tell()
+                f.write(bytes(8*(3+nBlocks)))
+                sizes = []
+                for block in blocks:
+                    block = zlib.compress(block)
+                    sizes.append(len(block))
+                    f.write(block)
+                end = f.tell()
+                f.seek(blockHeader)
+                f.write(np.array([nBlocks, blockSize, nBytes % blockSize] + sizes, dtype='<u8').tobytes())
+                f.seek(end)
+
+        f.write(b'\n  </AppendedData>\n</VTKFile>\n')
+
+
+def f4Wavelength(erg, flxE):
+    """ Converts an F4 neutron flux spectrum from energy [MeV] bins to wavelength [Å] bins.
+
+    The bin at E=0 is removed (MCNP always tallies between E=0 and the lowest energy bin).
+    Returns (erg, flxE, wave, flxW), where flxW is the flux normalised to wavelength.
+    """
+    # Defines constants for energy to wavelength conversion.
+    # Constant                  Unit           Description
+    h = 6.62607015e-34          # [kg-m^2/s]    Plank's constant
+    m = 1.674927498e-27         # [kg]          Mass of neutron
+    j = 1.60217733e-13          # [kg-m^2/s^2]  Mev to J conversion operator
+    C = h*1e10/np.sqrt(2*m*j)   # [Å]           Combining constants into C
+
+    erg  = np.asarray(erg, dtype=float)
+    flxE = np.asarray(flxE, dtype=float)
+    dE = np.diff(erg)
+    if erg[0] == 0:
+        erg  = erg[1:]
+        flxE = flxE[1:]
+    else:
+        dE = np.append(dE, dE[-1])
+
+    wave = C/np.sqrt(erg)
+    dW = np.diff(wave)
+    dW = np.append(dW, dW[-1])
+    flxW = flxE*(-dE/dW)
+    return erg, flxE, wave, flxW
+
+
+def renderF4(x, flux, cell, x_axis="E", fontsize=12, xlim=(None, None), ylim=(None, None), pyplot=False):
+    """ Returns the figure of an F4 neutron flux spectrum of a cell versus energy (x_axis="E") or wavelength (x_axis="W")."""
+    fig = newFigure((16, 9), pyplot)
+    ax = fig.subplots()
+    ax.plot(x, flux, 'ko', markersize=3)
+    if x_axis == "E":
+        fig.suptitle("Flux averaged over cell %i" %(cell), fontsize=fontsize*1.4)
+        ax.set_title("per energy [MeV]", fontsize=fontsize*1.2)
+        ax.set_xlabel("Neutron energy [MeV]", fontsize=fontsize)
+    else:
+        fig.suptitle("Flux averaged over cell %i" %(cell), fontsize=fontsize*1.5)
+        ax.set_title("per wavelength [Å]", fontsize=fontsize*1.33)
+        ax.set_xlabel("Neutron wavelength [Å]", fontsize=fontsize)
+    ax.set_ylabel("Neutron flux [n/cm2-s]", fontsize=fontsize)
+    ax.set_xlim(*xlim)
+    ax.set_ylim(*ylim)
+    ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
+    ax.xaxis.offsetText.set_fontsize(fontsize*0.85)
+    ax.yaxis.offsetText.set_fontsize(fontsize*0.85)
+    ax.grid()
+    return fig
+
+
+def renderF6(labels, erg, err, tally, fontsize=12, ymin=None, ymax=None, nBars=None, pyplot=False):
+    """ Returns the bar graph of the energy deposition (erg, with absolute errors err) of the cells in labels.
+    nBars sets the bar width and error bar cap size (by default, the number of labels).
+    """
+    if nBars == None:
+        nBars = len(labels)
+    fig = newFigure((10, 5), pyplot)
+    ax = fig.subplots()
+    ax.bar(labels, erg, yerr=err, align='center', color='black', alpha=0.6, ecolor='black', capsize=80/nBars, width=2/nBars)
+    ax.set_title("Energy deposition averaged over cell", fontsize=fontsize*1.4)
+    ax.set_xlabel("Cells", fontsize=fontsize*1.2)
+    ax.set_ylabel("Average energy deposited [MeV/g]", fontsize=fontsize*1.2)
+    ax.set_xticks(range(len(labels)))
+    ax.set_xticklabels(labels, fontsize=fontsize)
+    ax.tick_params(axis='y', which='major', labelsize=fontsize)
+    ax.set_ylim([ymin, ymax])
+    ax.yaxis.grid(True)
+    fig.suptitle(f"Tally f{str(tally)}", fontsize=fontsize*1.5, horizontalalignment='center')
+    return fig
+
+
+def readTFC(mctalFile):
+    """ Returns the tally fluctuation charts (TFC) of a mctal file as {tally: array}.
+    Every array has one row per TFC entry (MCNP records the tally at regular NPS intervals) and the columns [nps, mean, relative error, FOM].
+
+    Only the tally and tfc keyword lines are searched (with a regular expression over the whole file), so that
+    successive dumps of a running problem can be checked without parsing (or extracting) the tallies.
+    """
+    with open(mctalFile, "rb") as f:
+        data = f.read()
+    tfc = OrderedDict()
+    tally = None
+    for match in re.finditer(rb"^(tally|tfc)[ \t]+(\d+)[^\n]*\n", data, re.M):
+        if match.group(1) == b"tally":
+            tally = int(match.group(2))
+            continue
+        entries = int(match.group(2))
+        end = match.end()
+        for _ in range(entries):
+            end = data.index(b"\n", end) + 1
+        chart = np.array(data[match.end():end].split(), dtype=float)
+        if entries > 0 and tally != None:
+            tfc[tally] = chart.reshape(entries, -1)[:, :4]
+    return tfc
+
+
+# MCNP's ten statistical checks that the tally fluctuation charts of a mctal file allow (MCNP numbering).
+# The checks of the variance of the variance (5-7) and of the slope of the history score distribution (10) need data that mctal files do not carry.
+convergenceChecks = OrderedDict([(1, "Mean: no up or down trend in the last half"),
+                                 (2, "Relative error: below 0.1 (0.05 for point detectors)"),
+                                 (3, "Relative error: decreasing in the last half"),
+                                 (4, "Relative error: decreasing as 1/sqrt(NPS) in the last half"),
+                                 (8, "FOM: constant (within 10%) in the last half"),
+                                 (9, "FOM: no up or down trend in the last half")])
+
+
+def checkConvergence(tfc, tallies=None):
+    """ Runs the convergenceChecks on the tally fluctuation charts of all tallies at once (see readTFC).
+    Returns the final [nps, mean, relative error, FOM] of every tally and a boolean array of passed checks
+    (one row per tally, one column per convergenceChecks). A tally has converged if it passes all checks.
+
+    The last half of the problem is every TFC entry recorded after half of the final NPS. Trend checks need at least 3 entries there,
+    and tallies without score (a relative error of 0) fail all checks.
+
+    ARGUMENTS:
+        tfc    : Tally fluctuation charts as returned by readTFC
+        tallies: A list of the tallies in tfc to be checked (all of them by default)
+    """
+    if tallies == None:
+        tallies = list(tfc)
+
+    # 1. Pads the charts into (tallies, entries) arrays, so that every check runs on all tallies at once
+    entries = np.array([len(tfc[tally]) for tally in tallies], dtype=int)
+    charts = np.full((len(tallies), entries.max(initial=1), 4), np.nan)
+    for row, tally in enumerate(tallies):
+        charts[row, :entries[row]] = tfc[tally]
+    nps, mean, error, fom = np.moveaxis(charts, 2, 0)
+    final = charts[np.arange(len(tallies)), entries-1]
+
+    # 2. Last half of the problem, and its consecutive entries
+    with np.errstate(invalid="ignore"):
+        half = nps >= final[:, :1]/2
+    pairs = half[:, 1:] & half[:, :-1]
+    enough = pairs.sum(axis=1) >= 2
+    scored = (final[:, 2] > 0) & (final[:, 1] != 0)
+
+    def monotonic(values, sign):
+        return np.all(~pairs | (sign*np.diff(np.nan_to_num(values), axis=1) >= 0), axis=1)
+
+    def trend(values):
+        changes = np.any(pairs & (np.diff(np.nan_to_num(values), axis=1) != 0), axis=1)
+        return (monotonic(values, 1) | monotonic(values, -1)) & changes
+
+    def halfMean(values, mask):
+        return np.where(mask, values, 0).sum(axis=1) / np.maximum(mask.sum(axis=1), 1)
+
+    def logSlope(x, y):
+        with np.errstate(invalid="ignore"):
+            mask = half & (x > 0) & (y > 0)
+        lx, ly = np.log(np.where(mask, x, 1)), np.log(np.where(mask, y, 1))
+        dx = np.where(mask, lx - halfMean(lx, mask)[:, None], 0)
+        dy = np.where(mask, ly - halfMean(ly, mask)[:, None], 0)
+        sxx = (dx*dx).sum(axis=1)
+        return (dx*dy).sum(axis=1) / np.where(sxx > 0, sxx, np.inf)
+
+    # 3. Checks (see convergenceChecks)
+    fomMean = halfMean(fom, half)
+    fomSpread = np.sqrt(halfMean((np.nan_to_num(fom) - fomMean[:, None])**2, half))
+    errorLimit = np.array([0.05 if str(tally)[-1] == "5" else 0.1 for tally in tallies])
+    checks = np.column_stack([~trend(mean) & enough,
+                              final[:, 2] < errorLimit,
+                              monotonic(error, -1) & enough,
+                              (np.abs(logSlope(nps, error) + 0.5) <= 0.1) & enough,
+                              (fomSpread <= 0.1*fomMean) & enough,
+                              ~trend(fom) & enough])
+    return final, checks & scored[:, None]
+
+
+def renderConvergence(tallies, tfc, checks, fontsize=12, pyplot=False):
+    """ Returns the convergence dashboard of tallies: the relative error and the FOM (relative to its final value) against NPS
+    of all tallies (green: converged, red: not converged), and a chart of the passed convergenceChecks of every tally.
+    """
+    converged = checks.all(axis=1)
+    colours = np.where(converged, "tab:green", "tab:red")
+    fig = newFigure((16, max(5, 0.25*len(tallies) + 2)), pyplot, layout="tight")
+    errorAx, fomAx, checksAx = fig.subplots(1, 3, gridspec_kw={"width_ratios": (2, 2, 1)})
+
+    # All tallies are drawn as a single line collection per plot
+    errors = [tfc[tally][tfc[tally][:, 2] > 0][:, [0, 2]] for tally in tallies]
+    foms   = [np.column_stack((tfc[tally][:, 0], tfc[tally][:, 3] / (tfc[tally][-1, 3] or 1))) for tally in tallies]
+    errorAx.add_collection(LineCollection(errors, colors=colours, linewidths=1))
+    errorAx.set_xscale("log")
+    errorAx.set_yscale("log")
+    errorAx.axhline(0.1, color="black", linestyle="--", linewidth=1)
+    fomAx.add_collection(LineCollection(foms, colors=colours, linewidths=1))
+    fomAx.set_xscale("log")
+    fomAx.axhspan(0.9, 1.1, color="grey", alpha=0.2)
+    for ax, label in ((errorAx, "Relative error"), (fomAx, "FOM / final FOM")):
+        ax.autoscale_view()
+        ax.set_xlabel("NPS", fontsize=fontsize*1.2)
+        ax.set_ylabel(label, fontsize=fontsize*1.2)
+        ax.tick_params(axis='both', which='major', labelsize=fontsize)
+        ax.grid(True, which="major", alpha=0.5)
+
+    checksAx.imshow(checks, cmap=ListedColormap(["tab:red", "tab:green"]), vmin=0, vmax=1, aspect="auto", interpolation="nearest")
+    checksAx.set_xticks(range(len(convergenceChecks)))
+    checksAx.set_xticklabels(list(convergenceChecks), fontsize=fontsize)
+    checksAx.set_yticks(range(len(tallies)))
+    checksAx.set_yticklabels(["f"+str(tally) for tally in tallies], fontsize=fontsize*0.85)
+    checksAx.set_xlabel("MCNP statistical check", fontsize=fontsize*1.2)
+
+    fig.suptitle("Convergence of %i tallies (%i converged)" % (len(tallies), converged.sum()), fontsize=fontsize*1.5, horizontalalignment='center')
+    return fig
+
+
+def saveFigure(fig, file, dpi=None, format=None, writer=None, written=None, archive=None):
+    """ Saves a figure to file (a path or a file object) with a tight bounding box.
+    With an imageWriter, the figure is only rasterized here, and the image is encoded and written in the background.
+    With an imageArchive, the image is saved into the container of its directory instead of its own file.
+    written(file) is called once the image file is written (archived images are reported by the imageArchive instead).
+    """
+    if archive != None and archive.kind == "pdf":
+        archive.savePage(fig, file, dpi=dpi)
+    elif writer != None:
+        writer.put(rasterize(fig, dpi), file, dpi=dpi or fig.dpi, written=written)
+    elif archive != None:
+        archive.add(file, figureBytes(fig, dpi=dpi))
+    else:
+        with drawLock:
+            fig.savefig(file, format=format, bbox_inches='tight', dpi=dpi)
+        if written:
+            written(file)
+
+
+class rgbaPixels:
+    """ File object that receives the raw RGBA buffer of a figure saved with format="rgba" (see rasterize)."""
+
+    def write(self, buffer):
+        self.pixels = np.array(buffer, dtype=np.uint8)
+
+    def seek(self, *args):
+        pass
+
+
+def rasterize(fig, dpi=None):
+    """ Returns the pixels of a figure as saved with a tight bounding box, as a (height, width, 4) RGBA array."""
+    capture = rgbaPixels()
+    with drawLock:
+        fig.savefig(capture, format="rgba", bbox_inches='tight', dpi=dpi)
+    return capture.pixels
+
+
+class imageWriter:
+    """ Output stage that encodes and writes rendered images in background threads,
+    so that rendering the next figure overlaps with image compression and disk latency.
+
+    Renderers rasterize their figures (see saveFigure) and hand the pixels to a bounded queue.
+    put() blocks while the queue is full, so rendering runs at most queueSize images ahead of the disk.
+    Images are encoded like matplotlib's savefig (matplotlib.image.imsave), with the chosen PNG compression level.
+
+    ARGUMENTS:
+        workers      : Number of threads that encode and write images
+        queueSize    : Number of rendered images that may wait to be written
+        compressLevel: PNG compression level from 0 (fastest, largest files) to 9 (smallest files). matplotlib uses 6.
+        format       : Writes another image format than PNG instead (e.g. "webp", "jpeg" or "tiff"), see target()
+        archive      : zip imageArchive to store the encoded images in, instead of writing one file per image
+    """
+
+    def __init__(self, workers=2, queueSize=16, compressLevel=6, format=None, archive=None):
+        self.compressLevel = compressLevel
+        self.format  = format
+        self.archive = archive
+        self.queue   = queue.Queue(maxsize=queueSize)
+        self.errors  = []
+        self.threads = [threading.Thread(target=self.run, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def target(self, file):
+        """ Returns the path that an image saved as file is written to (with the extension of format, if given)."""
+        if self.format == None:
+            return file
+        return path.splitext(file)[0] + "." + self.format
+
+    def put(self, pixels, file, dpi=None, written=None):
+        """ Queues the RGBA pixels of an image for target(file). written(target(file)) is called once the file is written
+        (not for archived images, which the imageArchive reports).
+        """
+        self.queue.put((pixels, self.target(file), dpi, written))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                self.queue.task_done()
+                return
+            pixels, file, dpi, written = item
+            try:
+                format = path.splitext(file)[1][1:].lower()
+                options = {"compress_level": self.compressLevel} if format == "png" else {}
+                if self.archive != None:
+                    image = BytesIO()
+                    plt.imsave(image, pixels, format=format, dpi=dpi, pil_kwargs=options)
+                    self.archive.add(file, image.getvalue())
+                else:
+                    plt.imsave(file, pixels, format=format, dpi=dpi, pil_kwargs=options)
+                    if written:
+                        written(file)
+            except Exception as error:
+                self.errors.append(error)
+            finally:
+                self.queue.task_done()
+
+    def close(self):
+        """ Waits until all queued images are written, then stops the threads. Raises the error of a failed image, if any."""
+        for thread in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        if self.errors:
+            raise self.errors[0]
+
+
+def drawFigure(fig, dpi=None, format="png", compressLevel=None):
+    """ Draws a figure and returns the encoded image, in a worker process of a renderPool.
+    With compressLevel, the image is encoded like an imageWriter encodes it, otherwise like saveFigure saves it.
+    """
+    if compressLevel == None:
+        return figureBytes(fig, dpi=dpi, format=format)
+    image = BytesIO()
+    options = {"compress_level": compressLevel} if format == "png" else {}
+    plt.imsave(image, rasterize(fig, dpi), format=format, dpi=dpi or fig.dpi, pil_kwargs=options)
+    return image.getvalue()
+
+
+class renderPool:
+    """ Output stage that draws and encodes figures in worker processes, so that plots are rendered in parallel.
+
+    Drawing a figure (its layout, rasterization and encoding) is nearly all of the render cost, and matplotlib draws
+    one figure at a time in a process (see drawLock). Figures are therefore built by the caller, pickled to a process pool
+    and drawn there (see drawFigure). A background thread writes the encoded images in the order they were put,
+    so put() blocks while queueSize images are being drawn.
+
+    ARGUMENTS:
+        workers: Number of processes that draw figures
+        writer : imageWriter whose image format and PNG compression level are used (figures are saved like saveFigure without one)
+        archive: zip imageArchive to store the encoded images in, instead of writing one file per image
+    """
+
+    def __init__(self, workers=2, writer=None, archive=None):
+        self.writer  = writer
+        self.archive = archive
+        self.pool    = ProcessPoolExecutor(max_workers=workers)
+        self.queue   = queue.Queue(maxsize=2*workers)
+        self.errors  = []
+        self.thread  = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def target(self, file):
+        """ Returns the path that an image saved as file is written to (see imageWriter.target)."""
+        return self.writer.target(file) if self.writer else file
+
+    def put(self, fig, file, dpi=None, written=None):
+        """ Draws a figure for target(file) in the pool. written(target(file)) is called once the file is written
+        (not for archived images, which the imageArchive reports).
+        """
+        file = self.target(file)
+        format = path.splitext(file)[1][1:].lower()
+        compressLevel = self.writer.compressLevel if self.writer else None
+        self.queue.put((self.pool.submit(drawFigure, fig, dpi, format, compressLevel), file, written))
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            image, file, written = item
+            try:
+                image = image.result()
+                if self.archive != None:
+                    self.archive.add(file, image)
+                else:
+                    with open(file, "wb") as f:
+                        f.write(image)
+                    if written:
+                        written(file)
+            except Exception as error:
+                self.errors.append(error)
+
+    def close(self):
+        """ Waits until all figures are drawn and written, then stops the pool. Raises the error of a failed image, if any."""
+        self.queue.put(None)
+        self.thread.join()
+        self.pool.shutdown()
+        if self.errors:
+            raise self.errors[0]
+
+
+class imageArchive:
+    """ Output sink that saves all images of a plot directory into a single container file next to it,
+    e.g. tallies/F1/f1_plots/xCS.pdf instead of tallies/F1/f1_plots/xCS/*.png,
+    so that plotting a tally creates a handful of files instead of one file per cross section or line scan.
+
+    Containers are opened on their first image and written from scratch, so the images of a plot directory
+    must be saved by a single plot call between opening the archive and close(). Their images are therefore always rendered
+    (they are not skipped when current, see saveRender).
+
+    ARGUMENTS:
+        kind   : "pdf" : multi-page PDF, one page per image in the order the images are saved (plot_f1/plot_f3 save them in the order
+                         of their work units, see runUnits). close() writes the index of the pages next to it,
+                         e.g. tallies/F1/f1_plots/xCS.txt with the page number and image file name of every page.
+                 "zip" : uncompressed (stored) zip archive of the PNG images; its central directory indexes the images by file name,
+                         so that single images can be read without scanning the archive (e.g. zipfile.ZipFile(container).read(name))
+        written: Optional written(file, size) callback that reports the bytes every image adds to its container (see talliesReader.wroteImage).
+                 PDF images are partly written when the container is closed, which reports the rest with the container name as file.
+    """
+
+    kinds = ("pdf", "zip")
+
+    def __init__(self, kind, written=None):
+        if kind not in self.kinds:
+            raise Warning("Archive kind must be one of %s, not %s" % (", ".join(self.kinds), str(kind)))
+        self.kind       = kind
+        self.written    = written
+        self.containers = OrderedDict()
+        self.handles    = {}
+        self.pages      = {}
+        self.sizes      = {}
+        self.lock       = threading.Lock()
+
+    def container(self, file):
+        """ Returns the open container of the plot directory of file (opens it on the first image)."""
+        name = path.dirname(file) + "." + self.kind
+        with self.lock:
+            if name not in self.containers:
+                makedirs(path.dirname(name), exist_ok=True)
+                if self.kind == "pdf":
+                    self.handles[name] = open(name, "wb")
+                    self.containers[name] = PdfPages(self.handles[name])
+                    self.pages[name], self.sizes[name] = [], 0
+                else:
+                    self.containers[name] = zipfile.ZipFile(name, "w", zipfile.ZIP_STORED)
+            return self.containers[name]
+
+    def savePage(self, fig, file, dpi=None):
+        """ Adds a figure as the next page of the PDF container of file, and the file name of file to its page index."""
+        pages = self.container(file)
+        name  = path.dirname(file) + ".pdf"
+        with drawLock:
+            start = self.handles[name].tell()
+            pages.savefig(fig, bbox_inches='tight', dpi=dpi)
+            size = self.handles[name].tell() - start
+            self.pages[name].append(path.basename(file))
+            self.sizes[name] += size
+        if self.written:
+            self.written(file, size)
+
+    def add(self, file, image):
+        """ Stores an encoded image in the zip container of file, under the file name of file."""
+        archive = self.container(file)
+        with self.lock:
+            archive.writestr(path.basename(file), image)
+        if self.written:
+            self.written(file, len(image))
+
+    def close(self):
+        """ Closes all containers, and writes the page index of every PDF container."""
+        for name, container in self.containers.items():
+            container.close()
+            if name in self.handles:
+                self.handles[name].close()
+                if self.written and path.getsize(name) > self.sizes[name]:
+                    self.written(name, path.getsize(name) - self.sizes[name])
+                with open(path.splitext(name)[0] + ".txt", "w") as index:
+                    index.write("page\tfile\n")
+                    index.write("".join("%i\t%s\n" % (page, image) for page, image in enumerate(self.pages[name], 1)))
+        self.containers.clear()
+        self.handles.clear()
+
+
+def imagePipeline(plotMethod):
+    """ Decorates the plot_* methods: with self.imageWriters > 0, their images are written by an imageWriter,
+    with self.archiveKind, they are saved into an imageArchive, and with self.progressMode, their progress is reported (see progressReport).
+    All are closed (all images written) before the method returns.
+    """
+    @wraps(plotMethod)
+    def plotWithPipeline(self, *args, **kwargs):
+        if self.progressMode and self.progress == None:
+            self.progress = progressReport(self.progressMode)
+            try:
+                return plotWithPipeline(self, *args, **kwargs)
+            finally:
+                progress, self.progress = self.progress, None
+                progress.close()
+        if (self.imageWriters < 1 and not self.archiveKind) or self.writer != None or self.archive != None:
+            return plotMethod(self, *args, **kwargs)
+        self.archive = imageArchive(self.archiveKind, written=self.wroteImage) if self.archiveKind else None
+        if self.imageWriters > 0:
+            self.writer = imageWriter(self.imageWriters, compressLevel=self.compressLevel, format=self.imageFormat, archive=self.archive)
+        try:
+            return plotMethod(self, *args, **kwargs)
+        finally:
+            writer, archive = self.writer, self.archive
+            self.writer, self.archive = None, None
+            try:
+                if writer:
+                    writer.close()
+            finally:
+                if archive:
+                    archive.close()
+    return plotWithPipeline
+
+
+class progressReport:
+    """ Progress of a plotting run per tally and plot kind: work units done out of total, images per second, MB written and ETA.
+    Units are reported as they finish (from any render thread), so the counts stay correct when plots are rendered concurrently.
+
+    ARGUMENTS:
+        mode    : "bar" redraws a compact progress bar on one line, "json" writes one JSON line per interval (for batch logs),
+                  "auto" draws the bar on a terminal and writes JSON lines otherwise
+        stream  : Where the progress is written (sys.stderr by default, so that it does not mix with reports on stdout)
+        interval: Seconds between two JSON lines (the bar is redrawn at most 5 times per second)
+    """
+
+    def __init__(self, mode="auto", stream=None, interval=10):
+        self.stream = stream if stream != None else sys.stderr
+        if mode == "auto":
+            mode = "bar" if self.stream.isatty() else "json"
+        if mode not in ("bar", "json"):
+            raise Warning('The progress mode must be "auto", "bar" or "json"')
+        self.mode     = mode
+        self.interval = interval if mode == "json" else 0.2
+        self.units    = OrderedDict()
+        self.bytes    = 0
+        self.current  = None
+        self.start    = time.time()
+        self.shown    = 0
+        self.lock     = threading.Lock()
+
+    def expect(self, tally, plot, units):
+        """ Adds units of a plot kind of tally to the total."""
+        with self.lock:
+            done, total = self.units.get((tally, plot), (0, 0))
+            self.units[(tally, plot)] = (done, total + units)
+
+    def done(self, tally, plot, units=1):
+        """ Reports finished units of a plot kind of tally."""
+        with self.lock:
+            done, total = self.units.get((tally, plot), (0, 0))
+            self.units[(tally, plot)] = (done + units, max(total, done + units))
+            self.current = (tally, plot)
+            if time.time() - self.shown >= self.interval:
+                self.show()
+
+    def wrote(self, size):
+        """ Reports an image of size bytes written to disk."""
+        with self.lock:
+            self.bytes += size
+
+    def status(self):
+        done  = sum(d for d, t in self.units.values())
+        total = sum(t for d, t in self.units.values())
+        elapsed = time.time() - self.start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else None
+        return done, total, elapsed, rate, eta
+
+    def show(self, final=False):
+        self.shown = time.time()
+        done, total, elapsed, rate, eta = self.status()
+        if self.mode == "json":
+            tallies = OrderedDict()
+            for (tally, plot), (d, t) in self.units.items():
+                tallies.setdefault(str(tally), OrderedDict())[plot] = [d, t]
+            line = OrderedDict([("elapsed", round(elapsed, 1)), ("done", done), ("total", total), ("imagesPerSecond", round(rate, 3)),
+                                ("MB", round(self.bytes/2**20, 2)), ("eta", None if eta == None else round(eta, 1)),
+                                ("finished", final), ("tallies", tallies)])
+            self.stream.write(json.dumps(line) + "\n")
+        else:
+            width = 30
+            filled = int(width*done/total) if total else width
+            tally, plot = self.current if self.current else ("", "")
+            d, t = self.units.get(self.current, (0, 0))
+            self.stream.write("\r[%s%s] %3i%% %i/%i | f%s %s %i/%i | %.1f img/s | %.1f MB | ETA %s " % (
+                "#"*filled, "."*(width-filled), 100*done/total if total else 100, done, total, str(tally), plot, d, t,
+                rate, self.bytes/2**20, "-" if eta == None else time.strftime("%H:%M:%S", time.gmtime(eta))))
+            if final:
+                self.stream.write("\n")
+        self.stream.flush()
+
+    def close(self):
+        """ Shows the final progress."""
+        with self.lock:
+            self.show(final=True)
+
+
+def figureBytes(fig, dpi=None, format="png"):
+    """ Saves a figure into memory and returns the encoded image."""
+    buffer = BytesIO()
+    saveFigure(fig, buffer, dpi=dpi, format=format)
+    return buffer.getvalue()
+
+
+class renderCache:
+    """ Size-bounded, thread-safe LRU cache of rendered images.
+    Once maxBytes is exceeded, the least recently used images are dropped.
+    """
+
+    def __init__(self, maxBytes=256*2**20):
+        self.maxBytes = maxBytes
+        self.nBytes   = 0
+        self.hits     = 0
+        self.misses   = 0
+        self.images   = OrderedDict()
+        self.lock     = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key in self.images:
+                self.hits += 1
+                self.images.move_to_end(key)
+                return self.images[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, image):
+        with self.lock:
+            if key in self.images:
+                self.nBytes -= len(self.images.pop(key))
+            self.images[key] = image
+            self.nBytes += len(image)
+            while self.nBytes > self.maxBytes and len(self.images) > 1:
+                _, dropped = self.images.popitem(last=False)
+                self.nBytes -= len(dropped)
+
+
+def renderDigest(*inputs):
+    """ Returns a hash of the inputs of a plot (e.g. a slice and the plot options).
+    Arrays are hashed by their dtype, shape and values, and other inputs by their repr.
+    """
+    digest = hashlib.sha1()
+    for x in inputs:
+        if isinstance(x, np.ndarray):
+            digest.update(repr((x.dtype.str, x.shape)).encode())
+            digest.update(np.ascontiguousarray(x).data)
+        else:
+            digest.update(repr(x).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def sliceStamp(mesh, where, read):
+    """ Returns the data of a plot of mesh (e.g. a plane) for renderDigest: the stamp of mesh (see meshData) and where the plot lies in it,
+    e.g. ("x", 5) for the plane at x bin edge 5, so that current images are found without reading the mesh.
+    Meshes without a stamp (e.g. tuples built by hand) return read(), the plotted slice, which is then hashed by its values.
+    """
+    if getattr(mesh, "stamp", None) != None:
+        return (mesh.stamp, where)
+    return read()
+
+
+def fileStamp(file):
+    """ Returns the path and modification time of an optional input file (e.g. overlayImg), so that renderDigest notices changes."""
+    if file:
+        return (file, path.getmtime(file))
+    return None
+
+
+class renderIndex:
+    """ Thread-safe index of saved images and the digest of their inputs (see renderDigest), kept in a small text file.
+
+    An image is current when it exists and was saved from inputs with the same digest, so it is only rendered again
+    when its data or plot options change. Every saved image appends a "digest path" line to the file (the last line
+    of an image wins), and the file is rewritten without outdated lines when it is opened.
+    """
+
+    def __init__(self, file):
+        self.file    = file
+        self.digests = {}
+        self.lock    = threading.Lock()
+
+        lines = 0
+        if path.isfile(file):
+            with open(file) as f:
+                for line in f:
+                    digest, _, image = line.rstrip("\n").partition(" ")
+                    self.digests[image] = digest
+                    lines += 1
+        if lines > len(self.digests):
+            with open(file, "w") as f:
+                f.writelines(digest + " " + image + "\n" for image, digest in self.digests.items())
+
+    def current(self, image, digest):
+        with self.lock:
+            return self.digests.get(image) == digest and path.isfile(image)
+
+    def record(self, image, digest):
+        with self.lock:
+            self.digests[image] = digest
+            with open(self.file, "a") as f:
+                f.write(digest + " " + image + "\n")
+
+
+class sparseMesh:
+    """ Block-sparse N-D array for mostly-zero mesh tallies (e.g. shielded regions or vacuum), see sparseMeshes.
+
+    The last three axes (x, y, z) are split into blocks of blockShape bins, and only blocks with nonzero values are stored (blocks).
+    ids maps every block, for every bin of the other axes, to its row in blocks, or to -1 for a block of zeros.
+    Indexing with integers and slices returns the numpy array a dense array would return, filled from the blocks it crosses.
+    Selecting bins of the other axes only (e.g. meshTally.view) returns a sparseMesh that shares the blocks instead.
+    np.asarray() returns the whole array as a dense array.
+    """
+    ndim  = property(lambda self: len(self.shape))
+    size  = property(lambda self: int(np.prod(self.shape)))
+    dtype = property(lambda self: self.blocks.dtype)
+
+    def __init__(self, shape, ids, blocks):
+        self.shape  = tuple(shape)
+        self.ids    = ids
+        self.blocks = blocks
+        self.blockShape = (1,)*(len(shape)-3) + tuple(blocks.shape[1:])
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.region([(0, n) for n in self.shape])
+        return dense if dtype == None else dense.astype(dtype)
+
+    def __getitem__(self, index):
+        # 1. Expand the index to one integer or slice per axis
+        index = index if type(index) == tuple else (index,)
+        if any(i is Ellipsis for i in index):
+            e = [i is Ellipsis for i in index].index(True)
+            index = index[:e] + (slice(None),)*(self.ndim - len(index) + 1) + index[e+1:]
+        index = index + (slice(None),)*(self.ndim - len(index))
+        if len(index) != self.ndim or not all(isinstance(i, (slice, int, np.integer)) for i in index):
+            raise TypeError("sparseMesh only supports indexing with integers and slices")
+        ranges, select = [], []
+        for i, n in zip(index, self.shape):
+            if isinstance(i, slice) and i.step in (None, 1):
+                start, stop, step = i.indices(n)
+                ranges.append((start, max(start, stop)))
+                select.append(slice(None))
+            elif isinstance(i, slice):
+                ranges.append((0, n))
+                select.append(i)
+            else:
+                if not -n <= i < n:
+                    raise IndexError("index %i is out of bounds for an axis with %i bins" % (i, n))
+                ranges.append((i % n, i % n + 1))
+                select.append(0)
+
+        # 2. Bins of the other axes only: a sparse view of the same blocks
+        if all(s == slice(None) and r == (0, n) for s, r, n in zip(select[-3:], ranges[-3:], self.shape[-3:])) and \
+           all(s == slice(None) or s == 0 for s in select[:-3]):
+            grid = tuple(r[0] if s == 0 else slice(*r) for s, r in zip(select[:-3], ranges[:-3]))
+            shape = [r[1]-r[0] for s, r in zip(select[:-3], ranges[:-3]) if s != 0] + list(self.shape[-3:])
+            return sparseMesh(shape, self.ids[grid], self.blocks)
+
+        # 3. Anything else: the dense region crossed by the index
+        return self.region(ranges)[tuple(select)]
+
+    def region(self, ranges):
+        """ Returns the dense array of the bins between the (start, stop) index of every axis, filled from the stored blocks it crosses."""
+        out  = np.zeros([stop-start for start, stop in ranges], dtype=self.dtype)
+        grid = tuple(slice(start//b, -(-stop//b)) for (start, stop), b in zip(ranges, self.blockShape))
+        ids  = self.ids[grid]
+        for position in np.argwhere(ids >= 0):
+            block  = self.blocks[ids[tuple(position)]].reshape(self.blockShape)
+            source, target = [], []
+            for (start, stop), b, g, p in zip(ranges, self.blockShape, grid, position):
+                first = (g.start + p)*b
+                lo, hi = max(start, first), min(stop, first+b)
+                source.append(slice(lo-first, hi-first))
+                target.append(slice(lo-start, hi-start))
+            out[tuple(target)] = block[tuple(source)]
+        return out
+
+    def stored(self):
+        """ Returns the N-D indices and values of all stored bins as (index arrays, values), like np.nonzero(a) and a[np.nonzero(a)].
+        Stored blocks may contain zeros; bins outside of them are zero.
+        """
+        positions = np.argwhere(self.ids >= 0)
+        if len(positions) == 0:
+            return tuple(np.zeros(0, dtype=int) for n in self.shape), np.zeros(0, dtype=self.dtype)
+        offsets = np.indices(self.blockShape).reshape(self.ndim, -1)
+        indices = positions[:, :, None]*np.array(self.blockShape)[None, :, None] + offsets[None]
+        values  = self.blocks[self.ids[tuple(positions.T)]].reshape(len(positions), -1)
+        inside  = np.all(indices < np.array(self.shape)[None, :, None], axis=1)
+        return tuple(indices[:, a][inside] for a in range(self.ndim)), values[inside]
+
+
+def sparseMeshes(values, errors, blockEdge=8, maxFill=0.5):
+    """ Returns the values and relative errors of an N-D mesh as two sparseMesh arrays with the same blocks (see sparseMesh),
+    or None if more than maxFill of the (blockEdge, blockEdge, blockEdge) blocks hold nonzero values or errors,
+    i.e. when a dense array is about as small and faster to read.
+    """
+    shape = values.shape
+    block = tuple(min(blockEdge, n) for n in shape[-3:])
+    grid  = tuple(-(-n//b) for n, b in zip(shape[-3:], block))
+    pad   = [(0, 0)]*(len(shape)-3) + [(0, g*b-n) for n, g, b in zip(shape[-3:], grid, block)]
+
+    # Split the x, y and z axes into (grid, block) pairs, and move the block axes last: (..., gx, gy, gz, bx, by, bz)
+    split = shape[:-3] + (grid[0], block[0], grid[1], block[1], grid[2], block[2])
+    order = tuple(range(len(shape)-3)) + tuple(len(shape)-3 + a for a in (0, 2, 4, 1, 3, 5))
+    blocked = [np.pad(a, pad).reshape(split).transpose(order) for a in (values, errors)]
+    nonzero = np.any(blocked[0] != 0, axis=(-3, -2, -1)) | np.any(blocked[1] != 0, axis=(-3, -2, -1))
+    if np.count_nonzero(nonzero) > maxFill*nonzero.size:
+        return None
+
+    ids = np.full(nonzero.shape, -1, dtype=np.int64)
+    ids[nonzero] = np.arange(np.count_nonzero(nonzero))
+    return tuple(sparseMesh(shape, ids, np.ascontiguousarray(a[nonzero])) for a in blocked)
+
+
+# Floating-point types of cached mesh tallies. float32 has about 7.2 significant digits, which is not enough to keep the 7 digits of the tally file:
+# some values change in the last digit, values above about 3.4e38 overflow and values below about 1e-38 lose digits.
+# Text reports are therefore written from float64 values (see talliesReader.exactMesh).
+meshPrecisions = ("float32", "float64")
+
+
+def saveMeshCache(cacheDir, values, errors, precision="float32"):
+    """ Saves N-D mesh values and relative errors into a cache folder, as block-sparse arrays when most of the mesh is zero
+    (ids.npy, valueBlocks.npy and errorBlocks.npy, see sparseMeshes), or as dense arrays (values.npy and errors.npy) otherwise.
+    The files of the other storage are removed. The last file written (see meshCacheFile) dates the cache.
+    precision is the floating-point type of the saved values and errors: "float32" (half the size) or "float64".
+    """
+    if precision not in meshPrecisions:
+        raise Warning("\nThe precision of mesh tallies must be one of: " + ", ".join(meshPrecisions))
+    makedirs(cacheDir, exist_ok=True)
+    values = np.asarray(values, dtype=precision)
+    errors = np.asarray(errors, dtype=precision)
+    sparse = sparseMeshes(values, errors)
+    if sparse:
+        files = {"ids.npy": sparse[0].ids, "valueBlocks.npy": sparse[0].blocks, "errorBlocks.npy": sparse[1].blocks}
+    else:
+        files = {"values.npy": values, "errors.npy": errors}
+    for name in ("values.npy", "errors.npy", "ids.npy", "valueBlocks.npy", "errorBlocks.npy"):
+        if name not in files and path.isfile(cacheDir + '/' + name):
+            remove(cacheDir + '/' + name)
+    for name, array in files.items():
+        np.save(cacheDir + '/' + name, array)
+
+
+def meshCacheFile(cacheDir):
+    """ Returns the last file written into a mesh cache folder (see saveMeshCache), or None if the folder holds no mesh."""
+    for name in ("errorBlocks.npy", "errors.npy"):
+        if path.isfile(cacheDir + '/' + name):
+            return cacheDir + '/' + name
+    return None
+
+
+def loadMeshCache(cacheDir, shape, mmap=False):
+    """ Returns the (values, errors) of a mesh cache folder with the N-D shape of the mesh: numpy arrays, or sparseMesh arrays
+    for block-sparse caches (see saveMeshCache). With mmap=True, the files are memory-mapped (read-only) instead of being read into memory.
+    """
+    mmapMode = 'r' if mmap else None
+    if meshCacheFile(cacheDir) == cacheDir + '/errorBlocks.npy':
+        ids = np.load(cacheDir + '/ids.npy')
+        return (sparseMesh(shape, ids, np.load(cacheDir + '/valueBlocks.npy', mmap_mode=mmapMode)),
+                sparseMesh(shape, ids, np.load(cacheDir + '/errorBlocks.npy', mmap_mode=mmapMode)))
+    return (np.load(cacheDir + '/values.npy', mmap_mode=mmapMode).reshape(shape),
+            np.load(cacheDir + '/errors.npy', mmap_mode=mmapMode).reshape(shape))
+
+
+class meshTally:
+    """ N-D values and relative errors of an f1 or f3 mesh tally, with one named axis per MCNP bin type.
+
+    parseMCTAL writes the bins in the order f, d, u, s, m, c, e, t, i, j, k, so the tally file reshapes (without copying)
+    into arrays with the axes ("f", "d", "u", "s", "m", "c", "e", "t", "x", "y", "z").
+    Energy, time and cosine bins therefore stay separate axes instead of being read as a larger mesh.
+    edges holds the bin values of each axis when mc-tools provides them (always for x, y and z).
+    stats is the sliceStatistics index of the mesh, if it was loaded with it (see loadMeshTally).
+
+    view() and mesh() select bins with basic indexing only, so they return views of the same arrays:
+    plots and exports can iterate over every energy/time bin without re-reading or copying the tally.
+    """
+    axes = ("f", "d", "u", "s", "m", "c", "e", "t", "x", "y", "z")
+
+    def __init__(self, values, errors, edges, stats=None):
+        self.values = values
+        self.errors = errors
+        self.edges  = edges
+        self.stats  = stats
+        self.shape  = dict(zip(self.axes, values.shape))
+
+    def extraAxes(self):
+        """ Returns the names of the axes other than x, y and z that have more than one bin (e.g. ["e"])."""
+        return [a for a in self.axes[:-3] if self.shape[a] > 1]
+
+    def selections(self):
+        """ Returns one bin selection per combination of extra bins, e.g. [{"e": 0}, {"e": 1}, ...] ([{}] without extra bins)."""
+        extra = self.extraAxes()
+        return [dict(zip(extra, bins)) for bins in product(*[range(self.shape[a]) for a in extra])]
+
+    def view(self, **bins):
+        """ Returns (values, errors) views for a selection of 0-based bin indices by axis name, e.g. view(e=2, z=10).
+        Axes other than x, y and z that are not selected are set to their last bin (the total bin, if MCNP wrote one).
+        """
+        for a, b in bins.items():
+            if a not in self.axes:
+                raise Warning("\nUnknown mesh axis %s. Mesh axes are: %s" % (a, ", ".join(self.axes)))
+            if not 0 <= b < self.shape[a]:
+                raise Warning("\nBin %i does not exist on axis %s, which has %i bins" % (b, a, self.shape[a]))
+        index = tuple(bins.get(a, slice(None) if a in "xyz" else self.shape[a]-1) for a in self.axes)
+        return self.values[index], self.errors[index]
+
+    def mesh(self, **bins):
+        """ Returns the 3D mesh of a selection of extra bins as (xAxis, yAxis, zAxis, talval, talerr) (see view),
+        stamped with the content digest of the selection from the statistics index (see meshData).
+        """
+        stamp = self.stats.digest(bins) if self.stats != None else None
+        return meshData((self.edges["x"], self.edges["y"], self.edges["z"]) + self.view(**bins), stamp)
+
+
+class meshData(tuple):
+    """ The (xAxis, yAxis, zAxis, talval, talerr) tuple of a 3D mesh returned by meshTally.mesh and loadMesh.
+    stamp identifies its data without reading it (the content digest of the mesh, see sliceStatistics.digest), or is None.
+    """
+
+    def __new__(cls, mesh, stamp=None):
+        self = tuple.__new__(cls, mesh)
+        self.stamp = stamp
+        return self
+
+
+def binLabel(bins):
+    """ Returns the file name label of a selection of extra mesh bins, e.g. "_e2_t0" for {"e": 2, "t": 0} ("" without extra bins)."""
+    if not bins:
+        return ""
+    return "".join("_%s%i" % (a, b) for a, b in bins.items())
+
+
+powersOf10 = 10.0**np.arange(309)
+mantissaHeads = np.array(["%i.%02i" % divmod(n, 100) for n in range(1000)], dtype="S4").view("<u4")
+digitQuads = np.array(["%04i" % n for n in range(10**4)], dtype="S4").view("<u4")
+exponentWords = np.array([("e%+03i" % n)[:4] for n in range(-400, 401)], dtype="S4").view("<u4")
+
+def formatExp(a):
+    """ Returns the "%e" text of a float array as a bytes array, identical to Python's "%e" % x.
+
+    The 7 significant digits and the exponent are computed with numpy. Values whose rounding is too close to call in float
+    arithmetic (and nan, inf and subnormal values) are formatted by Python instead, so the result is always exact.
+    The array is as wide as its longest text (12 characters, plus the sign and a third exponent digit when needed).
+    """
+    a = np.asarray(a, dtype=float).ravel()
+    neg = np.signbit(a)
+    
+    # 1. Scales every value to 7 integer digits (1000000 <= scaled < 10000000)
+    mag = np.abs(a)
+    normal = (mag >= 1e-300) & (mag <= np.finfo(float).max)
+    if not normal.all():
+        mag = np.where(normal, mag, 0)
+    exp = np.floor(np.log10(np.where(normal, mag, 1))).astype(np.int32)
+    def scale(e):
+        factor = powersOf10[np.abs(6-e)]
+        scaled = np.multiply(mag, factor, where=e <= 6, out=np.empty_like(mag))
+        return np.divide(mag, factor, where=e > 6, out=scaled)
+    scaled = scale(exp)
+    off = (scaled >= 1e7).astype(np.int32) - (normal & (scaled < 1e6))
+    if off.any():
+        exp += off
+        scaled = scale(exp)
+
+    # 2. Rounds to the last digit (carrying 9.9999995 to 1.000000e+01) and finds the values to format in Python
+    rounded = np.rint(scaled)
+    python = np.flatnonzero((np.abs(scaled - rounded) > 0.5 - 1e-6) | ~normal & (a != 0))
+    pythonText = [("%e" % a[n]).encode() for n in python]
+    digits = rounded.astype(np.int32)
+    carry = digits >= 10**7
+    if carry.any():
+        digits = np.where(carry, digits // 10, digits)
+        exp += carry
+
+    # 3. Writes "d.dddddde+dd" as 3 words of 4 characters ("d.dd", "dddd" and "e+dd") looked up in tables.
+    #    Exponents of 3 digits keep their first 2 digits in the last word and get an extra column for the last one.
+    head, tail = np.divmod(digits, 10**4)
+    words = np.empty((a.size, 3), dtype="<u4")
+    words[:, 0] = mantissaHeads[head]
+    words[:, 1] = digitQuads[tail]
+    words[:, 2] = exponentWords[exp + 400]
+    text = words.view("S12").ravel()
+    absExp = np.abs(exp)
+    wide = absExp >= 100
+
+    # 4. Adds the sign and the third exponent digit only when some value needs them, then fills in the values formatted by Python
+    signed, threeDigits = bool(neg.any()), bool(wide.any())
+    width = max([12 + signed + threeDigits] + [len(t) for t in pythonText])
+    if width > 12:
+        chars = np.zeros((a.size, width), dtype=np.uint8)
+        chars[:, signed:signed + 12] = text.view(np.uint8).reshape(-1, 12)
+        if threeDigits:
+            chars[:, signed + 12] = np.where(wide, absExp % 10 + ord("0"), 0)
+        if signed:
+            chars[:, 0] = np.where(neg, ord("-"), 0)
+            if not neg.all():
+                chars[~neg, :-1] = chars[~neg, 1:]
+                chars[~neg, -1] = 0
+        text = chars.view("S%i" % width).ravel()
+    text[python] = pythonText
+    return text
+
+
+def writeTallyText(file, cells, ergs, vals, errs, compress=False, chunk=2**16, bufferSize=2**22):
+    """ Writes a tally file with one "%-5i%e\t%e\t%e\n" row per bin: [cell, erg, val, err].
+
+    The output is byte-identical to writing every row with file.write("%-5i%e\t%e\t%e\n" % (cell,erg,val,err)),
+    but the columns are formatted in bulk (see formatExp) and written in chunks of rows through a large buffer.
+    
+    ARGUMENTS:
+        file: Path of the tally file (e.g. ./tallies/F1/f1)
+        cells, ergs, vals, errs: Columns of the tally file (1D arrays of the same length)
+        compress: If True, writes a gzip file to file + ".gz" instead (np.loadtxt reads both)
+        chunk: Number of rows formatted at once
+        bufferSize: Size of the write buffer in bytes
+    """
+    cells = np.asarray(cells, dtype=np.int64).ravel()
+    ergs, vals, errs = np.ravel(ergs), np.ravel(vals), np.ravel(errs)
+
+    def runs(col, fmt):
+        # cells and energies repeat over long runs of rows, so only the first value of each run is formatted
+        starts = np.flatnonzero(np.r_[True, col[1:] != col[:-1]])
+        return np.repeat(fmt(col[starts]), np.diff(np.r_[starts, len(col)]))
+
+    def cellText(c):
+        return np.array(["%-5i" % i for i in c.tolist()], dtype=bytes)
+
+    if compress:
+        out = gzip.open(file + ".gz", "wb", compresslevel=6)
+    else:
+        out = open(file, "wb", buffering=bufferSize)
+
+    # Lays out the fields of a chunk of rows side by side in a structured array. Fields are padded with zero bytes to the
+    # longest text of their column, so the padding is only dropped when some field of the chunk is shorter.
+    with out:
+        for start in range(0, len(cells), chunk):
+            rows = slice(start, start + chunk)
+            columns = [runs(cells[rows], cellText), runs(ergs[rows], formatExp), formatExp(vals[rows]), formatExp(errs[rows])]
+            row = np.dtype([("cell", columns[0].dtype), ("erg", columns[1].dtype), ("tab1", "u1"),
+                            ("val", columns[2].dtype), ("tab2", "u1"), ("err", columns[3].dtype), ("newline", "u1")])
+            table = np.empty(len(columns[0]), dtype=row)
+            for name, col in zip(("cell", "erg", "val", "err"), columns):
+                table[name] = col
+            table["tab1"] = table["tab2"] = ord("\t")
+            table["newline"] = ord("\n")
+            table = table.view(np.uint8)
+            padded = any((col.view(np.uint8)[col.itemsize-1::col.itemsize] == 0).any() for col in columns)
+            out.write(table[table != 0] if padded else table)
+
+
+def extractTally(tal, talliesDir, precision="float32", compress=False):
+    """ Writes the tally file of a mc-tools tally object: a text file with [cell, erg, val, err] rows
+    (e.g. ./tallies/F1/f1), and for f1/f3 mesh tallies also the .npy cache read by loadMeshTally, with floating-point type precision.
+    With compress=True, the tally file is gzip-compressed (e.g. ./tallies/F1/f1.gz, see talliesReader.tallyFile).
+    It only depends on its arguments, so parseMCTAL can run it for several tallies in parallel processes.
+    """
+    # 1. Obtains MCNP's 11D bins for value iteration
+    f_bin = tal.getNbins("f")  # f = cell, surface, or detector
+    d_bin = tal.getNbins("d")  # d = total vs. direct or flagged vs. unflagged
+    u_bin = tal.getNbins("u")  # u = user-defined
+    s_bin = tal.getNbins("s")  # s = segment
+    m_bin = tal.getNbins("m")  # m = multiplier
+    c_bin = tal.getNbins("c")  # c = cosine
+    e_bin = tal.getNbins("e")  # e = energy [MeV]
+    t_bin = tal.getNbins("t")  # t = time   [s]
+    i_bin = tal.getNbins("i")  # i = mesh i coordinates
+    j_bin = tal.getNbins("j")  # j = mesh j coordinates
+    k_bin = tal.getNbins("k")  # k = mesh k coordinates
+    shape = (f_bin, d_bin, u_bin, s_bin, m_bin, c_bin, e_bin, t_bin, i_bin, j_bin, k_bin)
     
+    # 2. Creates a tally type folder
+    tallyTypeFolder = talliesDir+"/F%s" %str(tal.tallyNumber)[-1]
+    makedirs(tallyTypeFolder, exist_ok=True)
+
+    # 3. Reads the values and relative errors of every bin into arrays, in the order of the 11D bins.
+    #    mc-tools keeps them in one array (tal.valsErrors), which is read in bulk; other tally objects are read bin by bin.
+    valsErrors = getattr(tal, "valsErrors", None)
+    if valsErrors is not None and np.shape(valsErrors) == shape + (2,):
+        valsErrors = np.asarray(valsErrors, dtype=float)
+        vals = valsErrors[..., 0]
+        errs = valsErrors[..., 1]
+    else:
+        vals = np.empty(shape)
+        errs = np.empty(shape)
+        for bins in np.ndindex(*shape):
+            vals[bins] = tal.getValue(*bins, 0)
+            errs[bins] = tal.getValue(*bins, 1)
+
+    ergs = np.zeros(e_bin)
+    for e in range(e_bin):
+        try:
+            ergs[e] = tal.getAxis("e")[e]
+        except:
+            ergs[e] = 0
+    cells = np.broadcast_to(np.arange(f_bin).reshape((-1,) + (1,)*10), shape)
+    ergs = np.broadcast_to(ergs.reshape((1,)*6 + (-1,) + (1,)*4), shape)
+
+    # 4. Writes the [cell, erg, val, err] rows to a text file for every tally (f#), see writeTallyText
+    #    A tally file left by a previous run in the other format is removed, so that readers find the new one.
+    talFile = tallyTypeFolder + "/f" + str(tal.tallyNumber)
+    writeTallyText(talFile, cells, ergs, vals, errs, compress=compress)
+    staleFile = talFile if compress else talFile + ".gz"
+    if path.isfile(staleFile):
+        remove(staleFile)
+
+    # 5. Writes the cache of mesh tallies after the tally file, so loadMeshTally finds it up to date.
+    #    The values are rounded like in the tally file, and then to the cache precision, so the cache and its index hold the same numbers.
+    #    Mostly-zero meshes are cached as block-sparse arrays (see saveMeshCache).
+    if str(tal.tallyNumber)[-1] in "13":
+        cacheDir = talFile + '_cache'
+        vals = formatExp(vals).astype(float).astype(precision).reshape(shape)
+        errs = formatExp(errs).astype(float).astype(precision).reshape(shape)
+        saveMeshCache(cacheDir, vals, errs, precision)
+
+        # 5.1. Indexes the planes and line scans of the mesh while it is in memory (see sliceStatistics)
+        indexSlices(vals, errs).save(cacheDir + '/stats.npz')
+    return tal.tallyNumber
+
 
 class talliesReader: 
     """ This class reads the mctal file and holds its tally attributes.
@@ -27,15 +1998,26 @@ class talliesReader:
         self.f1Tallies  = []
         self.f4Tallies  = []
         self.f6Tallies  = []
+        self.workers    = 1
+        self.renders    = None
+        self.imageWriters  = 0
+        self.imageFormat   = None
+        self.compressLevel = 6
+        self.writer        = None
+        self.renderer      = None
+        self.archiveKind   = None
+        self.archive       = None
+        self.tfc           = OrderedDict()
+        self.meshCache     = None
+        self.progressMode  = None
+        self.progress      = None
+        self.diagnostics   = diagnosticCounter()
+        self.precision     = "float32"
+        self.compressTallies = False
+        self.exactMeshes   = {}
     
-    def parseMCTAL(self):
-        """ This method must be called after an object is instantiated so we can obtain the tally attributes.
-        
-        By default, the mctal file is assumed to be in the same directory as this code.
-        To set a different mctal directory, modify the object attribute "self.mctalFile" if this module is imported, or see main() if this module is run as a script.
-        """
-
-        # 1. Looks for and reads the mctal file, then creates a /tallies folder.
+    def openTalliesDir(self):
+        """ Looks for the mctal file and creates the /tallies folder next to it (self.talliesDir)."""
         if self.mctalFile == "":
             self.mctalFile = "./mctal"
             self.talliesDir = "./tallies"
@@ -55,54 +2037,55 @@ class talliesReader:
             else:
                 raise FileNotFoundError("mctal file not found. Please check mctalPath")
 
+    def parseMCTAL(self):
+        """ This method must be called after an object is instantiated so we can obtain the tally attributes.
+        
+        By default, the mctal file is assumed to be in the same directory as this code.
+        To set a different mctal directory, modify the object attribute "self.mctalFile" if this module is imported, or see main() if this module is run as a script.
+        To extract the tallies in parallel, set the object attribute "self.workers" to the number of processes.
+        Mesh tallies are cached as float32 arrays, which halves their memory and disk usage; set "self.precision" to "float64" to keep doubles.
+        To write gzip-compressed tally files (e.g. ./tallies/F1/f1.gz), set "self.compressTallies" to True.
+        """
+
+        # 1. Looks for and reads the mctal file, then creates a /tallies folder.
+        self.openTalliesDir()
+
+        # 1.1. Opens the index of saved plots, so that plots are only rendered again when their inputs change (see saveRender)
+        self.renders = renderIndex(self.talliesDir + "/renders.idx")
+
         # 2. Creates an object for all talies using mc-tools' Read() method
+        self.exactMeshes = {}
         self.allTals = mc_tools(self.mctalFile).Read()
 
-        # 3. Obtains MCNP's 11D bins for value iteration
-        for tal in self.allTals:
-            f_bin = tal.getNbins("f")  # f = cell, surface, or detector
-            d_bin = tal.getNbins("d")  # d = total vs. direct or flagged vs. unflagged
-            u_bin = tal.getNbins("u")  # u = user-defined
-            s_bin = tal.getNbins("s")  # s = segment
-            m_bin = tal.getNbins("m")  # m = multiplier
-            c_bin = tal.getNbins("c")  # c = cosine
-            e_bin = tal.getNbins("e")  # e = energy [MeV]
-            t_bin = tal.getNbins("t")  # t = time   [s]
-            i_bin = tal.getNbins("i")  # i = mesh i coordinates
-            j_bin = tal.getNbins("j")  # j = mesh j coordinates
-            k_bin = tal.getNbins("k")  # k = mesh k coordinates
-            
-            # 4. Creates a tally type folder
-            tallyTypeFolder = self.talliesDir+"/F%s" %str(tal.tallyNumber)[-1]
-            if not path.exists(tallyTypeFolder):
-                makedirs(tallyTypeFolder)
-
-            # 5. Creates an empty text file for every tally (f#). 
-            # Then, it writes [cell, erg, val, err] data to it by iterating over the 11D bins.
-            talFile = tallyTypeFolder + "/f" + str(tal.tallyNumber)
-
-            with open(talFile, 'w') as file:
-                for f in range(f_bin):
-                    cell = f 
-                    for d in range(d_bin):
-                        for u in range(u_bin):
-                            for s in range(s_bin):
-                                for m in range(m_bin):
-                                    for c in range(c_bin):
-                                        for e in range(e_bin):
-                                            try:
-                                                eVal = tal.getAxis("e")[e]
-                                            except:
-                                                eVal = 0
-                                            for t in range(t_bin):
-                                                for i in range(i_bin):
-                                                    for j in range(j_bin):
-                                                        for k in range(k_bin):
-                                                            val = tal.getValue(f,d,u,s,m,c,e,t,i,j,k,0)
-                                                            err = tal.getValue(f,d,u,s,m,c,e,t,i,j,k,1)
-                                                            file.write("%-5i%e\t%e\t%e\n" % (cell,eVal,val,err))
-
-        # 6. Updates tally lists (used by tallyPlotter classes for iterations).
+        # 2.1. Reads the tally fluctuation charts, which mc-tools does not keep (see readTFC and convergenceMonitor)
+        self.tfc = readTFC(self.mctalFile)
+
+        # 3. Extracts every tally into its own tally file (see extractTally).
+        #    Tallies are independent, so with self.workers > 1 they are extracted in parallel by a process pool.
+        #    Extracted tallies are reported as they come back from the pool (with self.progressMode, see progressReport).
+        progress = progressReport(self.progressMode) if self.progressMode else None
+        if progress:
+            for tal in self.allTals:
+                progress.expect(tal.tallyNumber, "extract", 1)
+        if self.workers > 1 and len(self.allTals) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                for tallyNumber in pool.map(extractTally, self.allTals, [self.talliesDir]*len(self.allTals), [self.precision]*len(self.allTals),
+                                            [self.compressTallies]*len(self.allTals)):
+                    if progress:
+                        progress.done(tallyNumber, "extract")
+        else:
+            for tal in self.allTals:
+                extractTally(tal, self.talliesDir, self.precision, self.compressTallies)
+                if progress:
+                    progress.done(tal.tallyNumber, "extract")
+        if progress:
+            progress.close()
+
+        # 4. Updates tally lists once all tallies are extracted (used by tallyPlotter classes for iterations).
+        self.listTallies()
+
+    def listTallies(self):
+        """ Lists the tally numbers of self.allTals by tally type (self.f1Tallies, self.f3Tallies, ...)."""
         self.Tallies   = [tal.tallyNumber for tal in self.allTals]
         self.f1Tallies = [tal for tal in self.Tallies if str(tal)[-1] == str(1)]
         self.f2Tallies = [tal for tal in self.Tallies if str(tal)[-1] == str(2)]
@@ -114,403 +2097,611 @@ class talliesReader:
         self.f8Tallies = [tal for tal in self.Tallies if str(tal)[-1] == str(8)]
         ## Plotting f2, f5, f7, and f8 is currently not supported
 
+    def checkMeshTallies(self, meshTally=None):
+        """ Returns the list of f1/f3 tallies to be exported or analysed: meshTally if given (checked), otherwise all f1 and f3 tallies."""
+        meshTallies = self.f1Tallies + self.f3Tallies
+        if meshTallies == []:
+            raise FileNotFoundError("This mctal file has no tallies of type f1 or f3 to be exported or analysed")
+        if meshTally == None:
+            return meshTallies
+        if not type(meshTally) == list:
+            raise TypeError("meshTally must be a list")
+        for mT in meshTally:
+            if mT not in meshTallies:
+                raise Warning("meshTally has a tally number that does not exist in f1Tallies or f3Tallies")
+        return meshTally
+
+    def imageCurrent(self, file, inputs, dpi=None):
+        """ Returns True if the image that saveRender would save to file from inputs is current (see renderIndex).
+        Archived images (see imageArchive) are never current, since their containers are written from scratch.
+        """
+        if self.archive:
+            return False
+        image = self.writer.target(file) if self.writer else file
+        return self.renders.current(image, renderDigest(image, dpi, *inputs))
+
+    def saveRender(self, file, plot, inputs, dpi=None):
+        """ Saves the figure returned by plot() to file, unless the saved image is current (see renderIndex).
+        inputs are all data and options the figure depends on (e.g. plot limits and colour bar range).
+        The plotted data is given by sliceStamp, so that checking an image of a mesh tally does not read the mesh.
+        Archived images (see imageArchive) are always saved, since their containers are written from scratch.
+        With self.renderer (see runUnits), the figure is drawn in its process pool, except for the pages of PDF containers.
+        """
+        if self.archive:
+            if self.renderer and self.archive.kind == "zip":
+                self.renderer.put(plot(), file, dpi=dpi)
+            else:
+                saveFigure(plot(), file, dpi=dpi, writer=self.writer, archive=self.archive)
+            return
+        image  = self.writer.target(file) if self.writer else file
+        digest = renderDigest(image, dpi, *inputs)
+        if not self.renders.current(image, digest):
+            makedirs(path.dirname(file), exist_ok=True)
+            def written(image):
+                self.renders.record(image, digest)
+                self.wroteImage(image)
+            if self.renderer:
+                self.renderer.put(plot(), file, dpi=dpi, written=written)
+            else:
+                saveFigure(plot(), file, dpi=dpi, writer=self.writer, written=written)
+
+    def wroteImage(self, file, size=None):
+        """ Reports the size of a written image (the size of file by default) to self.progress (see progressReport)."""
+        if self.progress:
+            self.progress.wrote(path.getsize(file) if size == None else size)
+
+    def runUnits(self, tally, run, selections, units, workers=1):
+        """ Runs run(bins, unit) for every bin selection and work unit (see meshWorkUnits) in order,
+        and reports every finished unit to self.progress by plot kind (e.g. "xCS").
+        With workers > 1, the figures saved by the units are drawn by a renderPool of workers processes (see saveRender).
+        """
+        if self.progress:
+            for plot in OrderedDict.fromkeys(unit[0] for unit in units):
+                self.progress.expect(tally, plot, len(selections)*sum(1 for unit in units if unit[0] == plot))
+
+        def runUnit(bins, unit):
+            run(bins, unit)
+            if self.progress:
+                self.progress.done(tally, unit[0])
+
+        if workers > 1:
+            self.renderer = renderPool(workers, writer=self.writer, archive=self.archive)
+        try:
+            for bins in selections:
+                for unit in units:
+                    runUnit(bins, unit)
+        finally:
+            renderer, self.renderer = self.renderer, None
+            if renderer:
+                renderer.close()
+
+    def tallyFile(self, tallyNumber):
+        """ Returns the path of the tally file written by parseMCTAL (e.g. ./tallies/F1/f1), or of its gzip file (e.g. ./tallies/F1/f1.gz)."""
+        file = self.talliesDir+'/F%s/' %str(tallyNumber)[-1] +'f'+str(tallyNumber)
+        if not path.isfile(file) and path.isfile(file + ".gz"):
+            return file + ".gz"
+        return file
+
+    def loadTally(self, tallyNumber):
+        """ Returns the tally file written by parseMCTAL as an array with the columns [cell, erg, val, err]."""
+        if tallyNumber not in self.Tallies:
+            raise Warning("Tally %s does not exist in this mctal file" % str(tallyNumber))
+        return np.loadtxt(self.tallyFile(tallyNumber), ndmin=2)
+
+    def loadMeshTally(self, tallyNumber, mmap=False, precision=None):
+        """ Returns the full N-D mesh of an f1 or f3 tally as a meshTally, including energy, time and cosine bins.
+
+        The first call reads the tally file written by parseMCTAL and saves the values and relative errors as .npy files in a cache folder
+        next to it (e.g. ./tallies/F1/f1_cache/). Later calls load the cache instead, until parseMCTAL rewrites the tally file
+        or self.precision changes (the cache holds float32 values by default, see saveMeshCache).
+        With mmap=True, the cached arrays are memory-mapped (read-only) instead of being read into memory.
+        Mostly-zero meshes are cached and loaded as block-sparse arrays (see sparseMesh), which index like the dense arrays of other meshes.
+        The statistics index of the mesh (meshTally.stats, see sliceStatistics) is cached in the same folder, and indexed again when it is older than the cache.
+        While self.meshCache is a dictionary (e.g. during a jobRunner run), every mesh is only loaded once and then shared
+        (a mesh read into memory is also shared with calls that ask for a memory-mapped one).
+        A precision other than self.precision is cached in a subfolder named after it (e.g. ./tallies/F1/f1_cache/float64/, see exactMesh).
+        """
+        if precision == None:
+            precision = self.precision
+        if self.meshCache != None:
+            for key in ((tallyNumber, False, precision), (tallyNumber, mmap, precision)):
+                if key in self.meshCache:
+                    return self.meshCache[key]
+        for tal in self.allTals:
+            if tal.tallyNumber == tallyNumber:
+                edges = {"x": tal.getAxis("i"), "y": tal.getAxis("j"), "z": tal.getAxis("k")}
+                for a in "cet":
+                    try:
+                        if len(tal.getAxis(a)) > 0:
+                            edges[a] = tal.getAxis(a)
+                    except:
+                        pass
+                shape = tuple(tal.getNbins(a) for a in "fdusmcet") + tuple(len(edges[a])-1 for a in "xyz")
+
+                file = self.tallyFile(tallyNumber)
+                cacheDir = self.talliesDir+'/F%s/' %str(tallyNumber)[-1] +'f'+str(tallyNumber) + '_cache'
+                if precision != self.precision:
+                    cacheDir += '/' + precision
+                cacheFile = meshCacheFile(cacheDir)
+                if not (cacheFile and path.getmtime(cacheFile) >= path.getmtime(file) and np.load(cacheFile, mmap_mode='r').dtype == precision):
+                    data = np.loadtxt(file, usecols=(2, 3), ndmin=2)
+                    saveMeshCache(cacheDir, data[:, 0].reshape(shape), data[:, 1].reshape(shape), precision)
+                    cacheFile = meshCacheFile(cacheDir)
+                talval, talerr = loadMeshCache(cacheDir, shape, mmap=mmap)
+
+                # The index is rebuilt if it is outdated or was saved without content digests
+                statsFile = cacheDir + '/stats.npz'
+                stats = None
+                if path.isfile(statsFile) and path.getmtime(statsFile) >= path.getmtime(cacheFile):
+                    with np.load(statsFile) as data:
+                        stats = sliceStatistics(dict(data))
+                if stats == None or stats.digest() == None:
+                    stats = indexSlices(talval, talerr)
+                    stats.save(statsFile)
+                mesh = meshTally(talval, talerr, edges, stats)
+                if self.meshCache != None:
+                    self.meshCache[(tallyNumber, mmap, precision)] = mesh
+                return mesh
+
+        raise Warning("Tally %s does not exist in this mctal file" % str(tallyNumber))
+
+    def exactMesh(self, tallyNumber, bins=None):
+        """ Returns the mesh of an f1 or f3 tally like loadMesh, with the float64 values and errors of the tally file, for text reports.
+        float32 caches (see saveMeshCache) change the last digit of some values and overflow above about 3.4e38.
+        With float32 caches, the float64 mesh is cached on first use (see loadMeshTally) and memory-mapped.
+        The meshTally of the last tally is kept in self.exactMeshes, so line scan exports do not load it for every line.
+        bins is the energy/time bin selection (see meshTally.selections), the last bins by default.
+        """
+        if tallyNumber not in self.exactMeshes:
+            self.exactMeshes = {tallyNumber: self.loadMeshTally(tallyNumber, mmap=True, precision="float64")}
+        return self.exactMeshes[tallyNumber].mesh(**(bins or {}))
+
+    def loadMesh(self, tallyNumber, mmap=False, **bins):
+        """ Returns the mesh of an f1 or f3 tally as (xAxis, yAxis, zAxis, talval, talerr).
+
+        xAxis, yAxis and zAxis are the (i,j,k) bin edges from mc-tools' getAxis function.
+        talval and talerr are the tally values and relative errors, with shape (len(xAxis)-1, len(yAxis)-1, len(zAxis)-1).
+        For tallies with energy, time or cosine bins, select the bins with 0-based indices, e.g. loadMesh(1, e=2).
+        By default, the last bin is used (see meshTally.view). To iterate over all bins, use loadMeshTally instead.
+        """
+        return self.loadMeshTally(tallyNumber, mmap=mmap).mesh(**bins)
+
+    def loadStatistics(self, tallyNumber):
+        """ Returns the sliceStatistics of an f1 or f3 tally from its cache folder without reading the mesh (see loadMeshTally),
+        or None if the tally has not been extracted since the mctal file was written (e.g. before parseMCTAL or during a dry run).
+        """
+        statsFile = self.talliesDir+'/F%s/' %str(tallyNumber)[-1] +'f'+str(tallyNumber) + '_cache/stats.npz'
+        if not (path.isfile(statsFile) and path.getmtime(statsFile) >= path.getmtime(self.mctalFile)):
+            return None
+        with np.load(statsFile) as data:
+            return sliceStatistics(dict(data))
+
 
 class f1Plotter(talliesReader):
     """ This class produces f1 mesh distributions in 1D and 2D for all x,y,z coordinates.
     Please see the docstring of method "plot_f1" for more details.
     """ 
 
-    def f1_xCS(self, show=False,
+    def f1_xCS(self, tal1, xx, mesh, show=False, bins=None, planeRange=None,
                      suptitle=None, fontsize=12,
                      xCSdpi=120, saveTo=None,
                      overlayImg=None,
                      switchAxis=False, 
                      cbar_label=None, 
                      vmin=None, vmax=None, fm=1,
+                     exact=False, lodMethod='mean',
                      xCS_ymin=None, xCS_ymax=None,
                      xCS_zmin=None, xCS_zmax=None,
                 ):
+        """ Plots the yz-plane of f1 tally tal1 between the x bin edges xx-1 and xx.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh. It is only read, so it can be shared between threads.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        planeRange is the (min, max) of the plane from the statistics index of the mesh (see sliceStatistics), so empty planes are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
 
-       ## 1. Prepare a function to plot the figures
-        def f1_xCS_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-
-            # Axes and values
-            if switchAxis == False:
-                im = ax.pcolormesh(self.xCS_y, self.xCS_z, self.talval_yz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax))
-                ax.set_xlabel('y [cm]', fontsize=fontsize)
-                ax.set_ylabel('z [cm]', fontsize=fontsize)
-                plt.xlim(xmin=xCS_ymin,xmax=xCS_ymax)
-                plt.ylim(ymin=xCS_zmin,ymax=xCS_zmax)
-            else: 
-                im = ax.pcolormesh(self.xCS_z, self.xCS_y, self.talval_yz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax))
-                ax.set_xlabel('z [cm]', fontsize=fontsize)
-                ax.set_ylabel('y [cm]', fontsize=fontsize)
-                plt.xlim(xmin=xCS_zmin,xmax=xCS_zmax)
-                plt.ylim(ymin=xCS_ymin,ymax=xCS_ymax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-
-            # Colour bar
-            cbar = plt.colorbar(im)
-            cbar.ax.tick_params(labelsize=fontsize*0.85)
-            if cbar_label:
-                cbar.set_label(cbar_label, fontsize=fontsize)
-
-            # Titles and layout
-            if suptitle:
-                plt.suptitle(suptitle, fontsize=fontsize*1.4, horizontalalignment='center', x=0.6)
-            ax.set_title('yz-plane 2D distribution between x = '+str(self.xAxis[self.xx-1])+'cm and x ='+str(self.xAxis[self.xx])+'cm\n',
-            fontsize=fontsize*1.15)
-            ax.set_aspect('equal')
-            fig.tight_layout()
-            self.fig = fig
-
-            # Option to add image on top of plot
-            if overlayImg:
-                img = plt.imread(overlayImg)
-                if switchAxis == False:
-                    ax.imshow(img, zorder=3, extent=[self.yAxis[0], self.yAxis[-1], self.zAxis[0], self.zAxis[-1] ])
-                else:
-                    ax.imshow(img, zorder=3, extent=[self.zAxis[0], self.zAxis[-1], self.yAxis[0], self.yAxis[-1] ])
+        ## 1. Prepare a function to plot the figures
+        def f1_xCS_plot(pyplot=False):
+            return meshCSFigure("f1", "x", xx, xAxis, yAxis, zAxis, talval, fm=fm, switchAxis=switchAxis,
+                                amin=xCS_ymin, amax=xCS_ymax, bmin=xCS_zmin, bmax=xCS_zmax,
+                                cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                exact=exact, lodMethod=lodMethod, dpi=xCSdpi, pyplot=pyplot)
 
         ## 2. Either show or save the plot
         # 2.1. Ensure that a range of values exists
-        if self.talval_yz.min() != self.talval_yz.max():  
+        if planeRange:
+            low, high = planeRange
+        else:
+            talval_yz = talval[xx-1, :, :]
+            low, high = talval_yz.min(), talval_yz.max()
+        if low != high:  
 
             # 2.2. Only show the plot (without saving)
             if show == True:
-                f1_xCS_plot(self)
+                f1_xCS_plot(pyplot=True)
                 plt.show()
 
-            # 2.3. Save the plot (will not save if a file with the same name already exists)
+            # 2.3. Save the plot (will not render it again if the saved image is current, see saveRender)
             else:
                 if saveTo:
                     xCS_path=saveTo
                 else:
-                    xCS_path = self.talliesDir+'/F1/f'+str(self.tal1)+'_plots/xCS'
-                xCS_file = '/f'+str(self.tal1)+'_xCS'+ str(self.xx)+'.png'
-
-                if not path.isfile(xCS_path+xCS_file):
-                    if not path.exists(xCS_path):
-                        makedirs(xCS_path)
-                    f1_xCS_plot(self)
-                    self.fig.savefig(xCS_path+xCS_file, bbox_inches='tight', dpi=xCSdpi)
-                    plt.close()
+                    xCS_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/xCS'
+                xCS_file = '/f'+str(tal1)+binLabel(bins)+'_xCS'+ str(xx)+'.png'
+
+                self.saveRender(xCS_path+xCS_file, f1_xCS_plot, dpi=xCSdpi,
+                                inputs=(sliceStamp(mesh, ("x", xx), lambda: talval[xx-1, :, :]), xAxis, yAxis, zAxis, fm, switchAxis, xCS_ymin, xCS_ymax, xCS_zmin, xCS_zmax,
+                                        cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod))
         else:
-            print(f"Value range is 0. No xCS plots can be made at x={self.xx}, y={self.yy}, z={self.zz}")
+            self.diagnostics.add(tal1, "xCS", "x=%s%s" % (xx, binLabel(bins)))
 
 
-    def f1_yCS(self, show=False,
+    def f1_yCS(self, tal1, yy, mesh, show=False, bins=None, planeRange=None,
                      suptitle=None, fontsize=12,
                      yCSdpi=120, saveTo=None,
                      overlayImg=None,
                      switchAxis=False, 
                      cbar_label=None, 
                      vmin=None, vmax=None, fm=1,
+                     exact=False, lodMethod='mean',
                      yCS_xmin=None, yCS_xmax=None,
                      yCS_zmin=None, yCS_zmax=None,
                 ):
+        """ Plots the xz-plane of f1 tally tal1 between the y bin edges yy-1 and yy.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh. It is only read, so it can be shared between threads.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        planeRange is the (min, max) of the plane from the statistics index of the mesh (see sliceStatistics), so empty planes are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
 
         ## 1. Prepare a function to plot the figures
-        def f1_yCS_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-
-            # Axes and values
-            if switchAxis == False:
-                im = ax.pcolormesh(self.yCS_x, self.yCS_z, self.talval_xz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax))
-                ax.set_xlabel('x [cm]', fontsize=fontsize)
-                ax.set_ylabel('z [cm]', fontsize=fontsize)
-                plt.xlim(xmin=yCS_xmin,xmax=yCS_xmax)
-                plt.ylim(ymin=yCS_zmin,ymax=yCS_zmax)
-            else: 
-                im = ax.pcolormesh(self.yCS_z, self.yCS_x, self.talval_xz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax),cmap=None)
-                ax.set_xlabel('z [cm]', fontsize=fontsize)
-                ax.set_ylabel('x [cm]', fontsize=fontsize)
-                plt.xlim(xmin=yCS_zmin,xmax=yCS_zmax)
-                plt.ylim(ymin=yCS_xmin,ymax=yCS_xmax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-
-            # Colour bar
-            cbar = plt.colorbar(im)
-            cbar.ax.tick_params(labelsize=fontsize*0.85)
-            if cbar_label:
-                cbar.set_label(cbar_label, fontsize=fontsize)
-
-            # Titles and layout
-            if suptitle:
-                plt.suptitle(suptitle, fontsize=fontsize*1.4, horizontalalignment='center', x=0.6)
-            ax.set_title('xz-plane 2D distribution between y = '+str(self.yAxis[self.yy-1])+'cm and y ='+str(self.yAxis[self.yy])+'cm\n',
-                            fontsize=fontsize*1.15)
-            ax.set_aspect('equal')
-            fig.tight_layout()
-            self.fig = fig
-
-            # Option to add image on top of plot
-            if overlayImg:
-                img = plt.imread(overlayImg)
-                if switchAxis == False:
-                    ax.imshow(img, zorder=3, extent=[self.xAxis[0], self.xAxis[-1], self.zAxis[0], self.zAxis[-1] ])
-                else:
-                    ax.imshow(img, zorder=3, extent=[self.zAxis[0], self.zAxis[-1], self.xAxis[0], self.xAxis[-1] ])
+        def f1_yCS_plot(pyplot=False):
+            return meshCSFigure("f1", "y", yy, xAxis, yAxis, zAxis, talval, fm=fm, switchAxis=switchAxis,
+                                amin=yCS_xmin, amax=yCS_xmax, bmin=yCS_zmin, bmax=yCS_zmax,
+                                cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                exact=exact, lodMethod=lodMethod, dpi=yCSdpi, pyplot=pyplot)
 
         ## 2. Either show or save the plot
         # 2.1. Ensure that a range of values exists
-        if self.talval_xz.min() != self.talval_xz.max():  
+        if planeRange:
+            low, high = planeRange
+        else:
+            talval_xz = talval[:, yy-1, :]
+            low, high = talval_xz.min(), talval_xz.max()
+        if low != high:  
 
             # 2.2. Only show the plot (without saving)
             if show == True:
-                f1_yCS_plot(self)
+                f1_yCS_plot(pyplot=True)
                 plt.show()
 
-            # 2.3. Save the plot (will not save if a file with the same name already exists)
+            # 2.3. Save the plot (will not render it again if the saved image is current, see saveRender)
             else:
                 if saveTo:
                     yCS_path=saveTo
                 else:
-                    yCS_path = self.talliesDir+'/F1/f'+str(self.tal1)+'_plots/yCS'
-                yCS_file = '/f'+str(self.tal1)+'_yCS'+ str(self.yy)+'.png'
-
-                if not path.isfile(yCS_path+yCS_file):
-                    if not path.exists(yCS_path):
-                        makedirs(yCS_path)
-                    f1_yCS_plot(self)
-                    self.fig.savefig(yCS_path+yCS_file, bbox_inches='tight', dpi=yCSdpi)
-                    plt.close()
+                    yCS_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/yCS'
+                yCS_file = '/f'+str(tal1)+binLabel(bins)+'_yCS'+ str(yy)+'.png'
+
+                self.saveRender(yCS_path+yCS_file, f1_yCS_plot, dpi=yCSdpi,
+                                inputs=(sliceStamp(mesh, ("y", yy), lambda: talval[:, yy-1, :]), xAxis, yAxis, zAxis, fm, switchAxis, yCS_xmin, yCS_xmax, yCS_zmin, yCS_zmax,
+                                        cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod))
         else:
-            print(f"Value range is 0. No yCS plots can be made at x={self.xx}, y={self.yy}, z={self.zz}")
+            self.diagnostics.add(tal1, "yCS", "y=%s%s" % (yy, binLabel(bins)))
 
 
-    def f1_zCS(self, show=False,
+    def f1_zCS(self, tal1, zz, mesh, show=False, bins=None, planeRange=None,
                      suptitle=None, fontsize=12,
                      zCSdpi=120, saveTo=None,
                      overlayImg=None,
                      switchAxis=False, 
                      cbar_label=None, 
                      vmin=None, vmax=None, fm=1,
+                     exact=False, lodMethod='mean',
                      zCS_xmin=None, zCS_xmax=None,
                      zCS_ymin=None, zCS_ymax=None,
                 ):
-        
+        """ Plots the xy-plane of f1 tally tal1 between the z bin edges zz-1 and zz.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh. It is only read, so it can be shared between threads.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        planeRange is the (min, max) of the plane from the statistics index of the mesh (see sliceStatistics), so empty planes are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
+
         ## 1. Prepare a function to plot the figures
-        def f1_zCS_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-
-            # Axes and values
-            if switchAxis == False:
-                im = ax.pcolormesh(self.zCS_x, self.zCS_y, self.talval_xy*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax))
-                ax.set_xlabel('x [cm]', fontsize=fontsize)
-                ax.set_ylabel('y [cm]', fontsize=fontsize)
-                plt.xlim(xmin=zCS_xmin,xmax=zCS_xmax)
-                plt.ylim(ymin=zCS_ymin,ymax=zCS_ymax)
-            else: 
-                im = ax.pcolormesh(self.zCS_y, self.zCS_x, self.talval_xy*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax))
-                ax.set_xlabel('y [cm]', fontsize=fontsize)
-                ax.set_ylabel('x [cm]', fontsize=fontsize)
-                plt.xlim(xmin=zCS_ymin,xmax=zCS_ymax)
-                plt.ylim(ymin=zCS_xmin,ymax=zCS_xmax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-
-            # Colour bar
-            cbar = plt.colorbar(im)
-            cbar.ax.tick_params(labelsize=fontsize*0.85)
-            if cbar_label:
-                cbar.set_label(cbar_label, fontsize=fontsize)
-
-            # Titles and layout
-            if suptitle:
-                plt.suptitle(suptitle, fontsize=fontsize*1.4, verticalalignment='center')#, x=0.6)
-            ax.set_title('xy-plane 2D distribution between z = '+str(self.zAxis[self.zz-1])+'cm and z ='+str(self.zAxis[self.zz])+'cm\n',
-                            fontsize=fontsize*1.15)
-            ax.set_aspect('equal')
-            fig.tight_layout()
-            self.fig = fig
-
-            # Option to add image on top of plot
-            if overlayImg:
-                img = plt.imread(overlayImg)
-                if switchAxis == False:
-                    ax.imshow(img, zorder=3, extent=[self.xAxis[0], self.xAxis[-1], self.yAxis[0], self.yAxis[-1] ])
-                else:
-                    ax.imshow(img, zorder=3, extent=[self.yAxis[0], self.yAxis[-1], self.xAxis[0], self.xAxis[-1] ])
+        def f1_zCS_plot(pyplot=False):
+            return meshCSFigure("f1", "z", zz, xAxis, yAxis, zAxis, talval, fm=fm, switchAxis=switchAxis,
+                                amin=zCS_xmin, amax=zCS_xmax, bmin=zCS_ymin, bmax=zCS_ymax,
+                                cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                exact=exact, lodMethod=lodMethod, dpi=zCSdpi, pyplot=pyplot)
 
         ## 2. Either show or save the plot
         # 2.1. Ensure that a range of values exists
-        if self.talval_xy.min() != self.talval_xy.max():  
+        if planeRange:
+            low, high = planeRange
+        else:
+            talval_xy = talval[:, :, zz-1]
+            low, high = talval_xy.min(), talval_xy.max()
+        if low != high:  
 
             # 2.2. Only show the plot (without saving)
             if show == True:
-                f1_zCS_plot(self)
+                f1_zCS_plot(pyplot=True)
                 plt.show()
 
-            # 2.3. Save the plot (will not save if a file with the same name already exists)
+            # 2.3. Save the plot (will not render it again if the saved image is current, see saveRender)
             else:
                 if saveTo:
                     zCS_path=saveTo
                 else:
-                    zCS_path = self.talliesDir+'/F1/f'+str(self.tal1)+'_plots/zCS'
-                zCS_file = '/f'+str(self.tal1)+'_zCS'+ str(self.zz)+'.png'
-
-                if not path.isfile(zCS_path+zCS_file):
-                    if not path.exists(zCS_path):
-                        makedirs(zCS_path)
-                    f1_zCS_plot(self)
-                    self.fig.savefig(zCS_path+zCS_file, bbox_inches='tight', dpi=zCSdpi)
-                    plt.close()
+                    zCS_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/zCS'
+                zCS_file = '/f'+str(tal1)+binLabel(bins)+'_zCS'+ str(zz)+'.png'
+
+                self.saveRender(zCS_path+zCS_file, f1_zCS_plot, dpi=zCSdpi,
+                                inputs=(sliceStamp(mesh, ("z", zz), lambda: talval[:, :, zz-1]), xAxis, yAxis, zAxis, fm, switchAxis, zCS_xmin, zCS_xmax, zCS_ymin, zCS_ymax,
+                                        cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod))
         else:
-            print(f"Value range is 0. No zCS plots can be made at x={self.xx}, y={self.yy}, z={self.zz}")
+            self.diagnostics.add(tal1, "zCS", "z=%s%s" % (zz, binLabel(bins)))
 
 
-    def f1_xLine(self, show=False, fontsize=12,
+    def f1_xLine(self, tal1, yy, zz, mesh, show=False, bins=None, lineRange=None, fontsize=12,
                  saveTo=None, exportLS=False, 
                  talval_label=None, logscale=True,
                  xLine_xmin=None, xLine_xmax=None, 
                  xLine_ymin=None, xLine_ymax=None):
-        
-        def f1_xLine_plot(self):     
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-            ax.plot(self.xAxis[1:], self.talval_xLine, "ko", markersize=3)
-            ax.set_title('x-axis 1D distribution at y ='+str(self.yAxis[self.yy])+'cm and z='+str(self.zAxis[self.zz])+'cm\n',
-                        fontsize=fontsize*1.33)
-            ax.set_xlabel('x [cm]', fontsize=fontsize)
-            if talval_label:
-                ax.set_ylabel(talval_label, fontsize=fontsize)
-            if logscale==True:
-                ax.set_yscale('log')
-            ax.set_xlim(xmin=xLine_xmin, xmax=xLine_xmax)
-            ax.set_ylim(ymin=xLine_ymin, ymax=xLine_ymax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-            ax.grid()
-            fig.tight_layout()
-            self.fig = fig
-
-        def exportLSx(self):        
-            file=open(self.xLine_path+self.xLine_file, 'w')
+        """ Plots the x-axis line scan of f1 tally tal1 at the y and z bin edges yy and zz.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        lineRange is the (min, max) of the line scan from the statistics index of the mesh (see sliceStatistics), so empty line scans are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
+
+        def f1_xLine_plot(pyplot=False):
+            return meshLineFigure("f1", "x", (yy, zz), xAxis, yAxis, zAxis, talval,
+                                  talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                  xlim=(xLine_xmin, xLine_xmax), ylim=(xLine_ymin, xLine_ymax), pyplot=pyplot)
+
+        def exportLSx(xLine_path, xLine_file):
+            # The values are written with the digits of the tally file (see exactMesh)
+            talval, talerr = self.exactMesh(tal1, bins)[3:]
+            talval_xLine = talval[:, yy-1, zz-1]
+            talerr_xLine = talerr[:, yy-1, zz-1]
+            file=open(xLine_path+xLine_file, 'w')
             file.write("x axis bin\ttally value \terror value\n")
-            for i in range(len(self.talval_xLine)):
-                file.write("%-10i\t%e\t%e\n"%(self.xAxis[1:][i], self.talval_xLine[i],self.talerr_xLine[i]))
+            for i in range(len(talval_xLine)):
+                file.write("%-10i\t%e\t%e\n"%(xAxis[1:][i], talval_xLine[i],talerr_xLine[i]))
             file.close()
 
+        # Empty line scans (all values are 0) are not drawn, but their text exports are still written
+        if lineRange:
+            low, high = lineRange
+        else:
+            talval_xLine = talval[:, yy-1, zz-1]
+            low, high = talval_xLine.min(), talval_xLine.max()
+        empty = low == 0 and high == 0
+        if empty:
+            self.diagnostics.add(tal1, "xLine", "y=%s z=%s%s" % (yy, zz, binLabel(bins)))
+
         if show == True:
-            f1_xLine_plot(self)
-            plt.show()
+            if not empty:
+                f1_xLine_plot(pyplot=True)
+                plt.show()
         else:
             if saveTo:
-                self.xLine_path=saveTo
+                xLine_path=saveTo
             else:
-                self.xLine_path = self.talliesDir+'/F1/f'+str(self.tal1)+'_plots/xLineScan/'
+                xLine_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/xLineScan/'
             
-            self.xLine_file = 'f'+str(self.tal1)+'_xLine_y'+str(self.yy)+'_z'+str(self.zz)
-            if not path.isfile(self.xLine_path+self.xLine_file+'.png'):
-                if not path.exists(self.xLine_path):
-                    makedirs(self.xLine_path)
-                f1_xLine_plot(self)
-                self.fig.savefig(self.xLine_path+self.xLine_file+'.png', bbox_inches='tight')
-                plt.close()
+            xLine_file = 'f'+str(tal1)+binLabel(bins)+'_xLine_y'+str(yy)+'_z'+str(zz)
+            if not empty:
+                self.saveRender(xLine_path+xLine_file+'.png', f1_xLine_plot,
+                                inputs=(sliceStamp(mesh, ("x", yy, zz), lambda: talval[:, yy-1, zz-1]), xAxis, yAxis, zAxis, talval_label, logscale, fontsize,
+                                        xLine_xmin, xLine_xmax, xLine_ymin, xLine_ymax))
             if exportLS:
-                exportLSx(self)
+                makedirs(xLine_path, exist_ok=True)
+                exportLSx(xLine_path, xLine_file)
 
 
-    def f1_yLine(self, show=False, fontsize=12,
+    def f1_yLine(self, tal1, xx, zz, mesh, show=False, bins=None, lineRange=None, fontsize=12,
                  saveTo=None, exportLS=False, 
                  talval_label=None, logscale=True,
                  yLine_xmin=None, yLine_xmax=None, 
                  yLine_ymin=None, yLine_ymax=None):
-
-        def f1_yLine_plot(self):        
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-            ax.plot(self.yAxis[:-1], self.talval_yLine, "ko", markersize=3)
-            ax.set_title('y-axis 1D distribution at x ='+str(self.xAxis[self.xx])+'cm and z='+str(self.zAxis[self.zz])+'cm\n',
-                        fontsize=fontsize*1.33)
-            ax.set_xlabel('y [cm]', fontsize=fontsize)
-            if talval_label:
-                ax.set_ylabel(talval_label, fontsize=fontsize)
-            if logscale==True:
-                ax.set_yscale('log')
-            ax.set_xlim(xmin=yLine_xmin, xmax=yLine_xmax)
-            ax.set_ylim(ymin=yLine_ymin, ymax=yLine_ymax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)            
-            ax.grid()
-            fig.tight_layout()
-            self.fig = fig
-
-
-        def exportLSy(self):        
-            file=open(self.yLine_path+self.yLine_file, 'w')
+        """ Plots the y-axis line scan of f1 tally tal1 at the x and z bin edges xx and zz.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        lineRange is the (min, max) of the line scan from the statistics index of the mesh (see sliceStatistics), so empty line scans are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
+
+        def f1_yLine_plot(pyplot=False):
+            return meshLineFigure("f1", "y", (xx, zz), xAxis, yAxis, zAxis, talval,
+                                  talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                  xlim=(yLine_xmin, yLine_xmax), ylim=(yLine_ymin, yLine_ymax), pyplot=pyplot)
+
+        def exportLSy(yLine_path, yLine_file):
+            # The values are written with the digits of the tally file (see exactMesh)
+            talval, talerr = self.exactMesh(tal1, bins)[3:]
+            talval_yLine = talval[xx-1, :, zz-1]
+            talerr_yLine = talerr[xx-1, :, zz-1]
+            file=open(yLine_path+yLine_file, 'w')
             file.write("y axis bin\ttally value \terror value\n")
-            for i in range(len(self.talval_yLine)):
-                file.write("%-10i\t%e\t%e\n"%(self.yAxis[1:][i], self.talval_yLine[i],self.talerr_yLine[i]))
+            for i in range(len(talval_yLine)):
+                file.write("%-10i\t%e\t%e\n"%(yAxis[1:][i], talval_yLine[i],talerr_yLine[i]))
             file.close()
 
+        # Empty line scans (all values are 0) are not drawn, but their text exports are still written
+        if lineRange:
+            low, high = lineRange
+        else:
+            talval_yLine = talval[xx-1, :, zz-1]
+            low, high = talval_yLine.min(), talval_yLine.max()
+        empty = low == 0 and high == 0
+        if empty:
+            self.diagnostics.add(tal1, "yLine", "x=%s z=%s%s" % (xx, zz, binLabel(bins)))
+
         if show == True:
-            f1_yLine_plot(self)
-            plt.show()
+            if not empty:
+                f1_yLine_plot(pyplot=True)
+                plt.show()
         else:
             if saveTo: 
-                self.yLine_path=saveTo
+                yLine_path=saveTo
             else:
-                self.yLine_path = self.talliesDir+'/F1/f'+str(self.tal1)+'_plots/yLineScan/'
-
-            self.yLine_file = 'f'+str(self.tal1)+'_yLine_x'+str(self.xx)+'_z'+str(self.zz)
-            if not path.isfile(self.yLine_path+self.yLine_file+'.png'):
-                if not path.exists(self.yLine_path):
-                    makedirs(self.yLine_path)
-                f1_yLine_plot(self)
-                self.fig.savefig(self.yLine_path+self.yLine_file+'.png', bbox_inches='tight')
-                plt.close()
+                yLine_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/yLineScan/'
+
+            yLine_file = 'f'+str(tal1)+binLabel(bins)+'_yLine_x'+str(xx)+'_z'+str(zz)
+            if not empty:
+                self.saveRender(yLine_path+yLine_file+'.png', f1_yLine_plot,
+                                inputs=(sliceStamp(mesh, ("y", xx, zz), lambda: talval[xx-1, :, zz-1]), xAxis, yAxis, zAxis, talval_label, logscale, fontsize,
+                                        yLine_xmin, yLine_xmax, yLine_ymin, yLine_ymax))
             if exportLS:
-                exportLSy(self)
+                makedirs(yLine_path, exist_ok=True)
+                exportLSy(yLine_path, yLine_file)
 
 
-    def f1_zLine(self, show=False, fontsize=12,
+    def f1_zLine(self, tal1, xx, yy, mesh, show=False, bins=None, lineRange=None, fontsize=12,
                  saveTo=None, exportLS=False,
                  talval_label=None, logscale=True,
                  zLine_xmin=None, zLine_xmax=None, 
                  zLine_ymin=None, zLine_ymax=None):
-        
-        def f1_zLine_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-            ax.plot(self.zAxis[1:], self.talval_zLine, "ko", markersize=3)
-            ax.set_title('z-axis 1D distribution at x ='+str(self.xAxis[self.xx])+'cm and y='+str(self.yAxis[self.yy])+'cm\n',
-                        fontsize=fontsize*1.33)
-            ax.set_xlabel('z [cm]', fontsize=fontsize)
-            if talval_label:
-                ax.set_ylabel(talval_label, fontsize=fontsize)
-            if logscale==True:
-                ax.set_yscale('log')
-            ax.set_xlim(xmin=zLine_xmin, xmax=zLine_xmax)
-            ax.set_ylim(ymin=zLine_ymin, ymax=zLine_ymax)            
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-            ax.grid()
-            fig.tight_layout()
-            self.fig = fig
-
-        def exportLSz(self):        
-            file=open(self.zLine_path+self.zLine_file, 'w')
+        """ Plots the z-axis line scan of f1 tally tal1 at the x and y bin edges xx and yy.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        lineRange is the (min, max) of the line scan from the statistics index of the mesh (see sliceStatistics), so empty line scans are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
+
+        def f1_zLine_plot(pyplot=False):
+            return meshLineFigure("f1", "z", (xx, yy), xAxis, yAxis, zAxis, talval,
+                                  talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                  xlim=(zLine_xmin, zLine_xmax), ylim=(zLine_ymin, zLine_ymax), pyplot=pyplot)
+
+        def exportLSz(zLine_path, zLine_file):
+            # The values are written with the digits of the tally file (see exactMesh)
+            talval, talerr = self.exactMesh(tal1, bins)[3:]
+            talval_zLine = talval[xx-1, yy-1, :]
+            talerr_zLine = talerr[xx-1, yy-1, :]
+            file=open(zLine_path+zLine_file, 'w')
             file.write("y axis bin\ttally value \terror value\n")
-            for i in range(len(self.talval_zLine)):
-                file.write("%-10i\t%e\t%e\n"%(self.zAxis[1:][i], self.talval_zLine[i],self.talerr_zLine[i]))
+            for i in range(len(talval_zLine)):
+                file.write("%-10i\t%e\t%e\n"%(zAxis[1:][i], talval_zLine[i],talerr_zLine[i]))
             file.close()
 
+        # Empty line scans (all values are 0) are not drawn, but their text exports are still written
+        if lineRange:
+            low, high = lineRange
+        else:
+            talval_zLine = talval[xx-1, yy-1, :]
+            low, high = talval_zLine.min(), talval_zLine.max()
+        empty = low == 0 and high == 0
+        if empty:
+            self.diagnostics.add(tal1, "zLine", "x=%s y=%s%s" % (xx, yy, binLabel(bins)))
+
         if show == True:
-            f1_zLine_plot(self)
-            plt.show()
+            if not empty:
+                f1_zLine_plot(pyplot=True)
+                plt.show()
         else:
             if saveTo: 
-                self.zLine_path=saveTo
+                zLine_path=saveTo
             else:
-                self.zLine_path = self.talliesDir+'/F1/f'+str(self.tal1)+'_plots/zLineScan/'
+                zLine_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/zLineScan/'
             
-            self.zLine_file = 'f'+str(self.tal1)+'_zLine_x'+str(self.xx)+'_y'+str(self.yy)
-            if not path.isfile(self.zLine_path+self.zLine_file+'.png'):
-                if not path.exists(self.zLine_path):
-                    makedirs(self.zLine_path)
-                f1_zLine_plot(self)
-                self.fig.savefig(self.zLine_path+self.zLine_file+'.png', bbox_inches='tight')
-                plt.close()
+            zLine_file = 'f'+str(tal1)+binLabel(bins)+'_zLine_x'+str(xx)+'_y'+str(yy)
+            if not empty:
+                self.saveRender(zLine_path+zLine_file+'.png', f1_zLine_plot,
+                                inputs=(sliceStamp(mesh, ("z", xx, yy), lambda: talval[xx-1, yy-1, :]), xAxis, yAxis, zAxis, talval_label, logscale, fontsize,
+                                        zLine_xmin, zLine_xmax, zLine_ymin, zLine_ymax))
             if exportLS:
-                exportLSz(self)
+                makedirs(zLine_path, exist_ok=True)
+                exportLSz(zLine_path, zLine_file)
             
 
+    def f1_lineFamily(self, tal1, axis, index, mesh, show=False, bins=None, lines=None, errorBands=False,
+                      fontsize=12, saveTo=None, talval_label=None, logscale=True,
+                      xlim=(None, None), ylim=(None, None)):
+        """ Plots all line scans of f1 tally tal1 along axis ("x", "y" or "z") in one figure, at bin edge index of the fixed axis
+        (x and y line scans at one z, z line scans at one y), coloured by the remaining axis (see meshLineFamilyFigure).
+        lines optionally selects the line scans by the bin edge indices of the colouring axis. errorBands adds the relative errors as bands.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
+
+        def f1_lineFamily_plot(pyplot=False):
+            return meshLineFamilyFigure("f1", axis, index, xAxis, yAxis, zAxis, talval,
+                                        talerr=talerr if errorBands else None, lines=lines,
+                                        talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                        xlim=xlim, ylim=ylim, pyplot=pyplot)
+
+        if show == True:
+            f1_lineFamily_plot(pyplot=True)
+            plt.show()
+        else:
+            if saveTo:
+                family_path = saveTo
+            else:
+                family_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/'+axis+'LineScan/'
+
+            family_file = 'f'+str(tal1)+binLabel(bins)+'_'+axis+'Lines_'+familyAxes[axis]+str(index)
+            fixed = "xyz".index(familyAxes[axis])
+            self.saveRender(family_path+family_file+'.png', f1_lineFamily_plot,
+                            inputs=(sliceStamp(mesh, (axis, index), lambda: meshPlane(talval, fixed, index-1)),
+                                    sliceStamp(mesh, (axis, index, "errors"), lambda: meshPlane(talerr, fixed, index-1)) if errorBands else None,
+                                    xAxis, yAxis, zAxis, lines, talval_label, logscale, fontsize, xlim, ylim))
+
+    def f1_projections(self, tal1, mesh, show=False, bins=None, methods=("max", "mean", "sum"),
+                       suptitle=None, fontsize=12, dpi=120, saveTo=None,
+                       overlayImg=None, switchAxis=False, cbar_label=None,
+                       vmin=None, vmax=None, fm=1, exact=False, lodMethod='mean'):
+        """ Plots the projections of f1 tally tal1 along x, y and z for every projection method (see meshProjections),
+        i.e. up to 9 summary images instead of one image per mesh bin.
+        mesh is the (xAxis, yAxis, zAxis, talval, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        """
+        xAxis, yAxis, zAxis, talval, talerr = mesh
+        if saveTo:
+            proj_path = saveTo
+        else:
+            proj_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/projections'
+
+        def projectionFile(method, axis):
+            return proj_path+'/f'+str(tal1)+binLabel(bins)+'_'+axis+'Proj_'+method+'.png'
+
+        def projectionInputs(method, axis, projection=None):
+            return (sliceStamp(mesh, ("projection", method, axis), lambda: projection), xAxis, yAxis, zAxis, fm, switchAxis,
+                    cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod)
+
+        ## 1. Skip the mesh if the images of all its projections are current (checked without reading the mesh, see sliceStamp)
+        if show == False and getattr(mesh, "stamp", None) != None and \
+           all(self.imageCurrent(projectionFile(method, axis), projectionInputs(method, axis), dpi=dpi) for method in methods for axis in "xyz"):
+            return
+
+        ## 2. Compute all projections in a single pass over the mesh
+        projections = meshProjections(talval, methods)
+
+        for (method, axis), projection in projections.items():
+            def f1_projection_plot(pyplot=False):
+                return meshProjectionFigure("f1", method, axis, xAxis, yAxis, zAxis, projection, fm=fm, switchAxis=switchAxis,
+                                            cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                            suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                            exact=exact, lodMethod=lodMethod, dpi=dpi, pyplot=pyplot)
+
+            ## 3. Either show or save the plot, if a range of values exists
+            if projection.min() != projection.max():
+                if show == True:
+                    f1_projection_plot(pyplot=True)
+                    plt.show()
+                else:
+                    self.saveRender(projectionFile(method, axis), f1_projection_plot, dpi=dpi,
+                                    inputs=projectionInputs(method, axis, projection))
+            else:
+                self.diagnostics.add(tal1, "projection", "%s along %s%s" % (method, axis, binLabel(bins)))
+
     def get_f1x(self, f1Tally=None):
         if f1Tally == None:
             f1Tally = self.f1Tallies
@@ -569,16 +2760,20 @@ class f1Plotter(talliesReader):
                         print(zAxis)
 
                 
+    @imagePipeline
     def plot_f1(self, f1Tally=None,     show=False,    verbose=False, 
                       fontsize=12,      fm=1,          saveTo=None,
+                      workers=1,
 
                       x=None,           y=None,        z=None,
                       xLine=False,      yLine=False,   zLine=False,
                       xCS=False,        yCS=False,     zCS=False,                      
+                      projection=False, hotspots=None, maxError=None,
                     # CS plot settings
                       cbar_label=None,  vmin=None,     vmax=None,
                       xCSdpi=120,       yCSdpi=120,    zCSdpi=120,
                       switchAxis=False, suptitle=None, overlayImg=None, 
+                      exact=False,      lodMethod='mean', sharedScale=False,
                       xCS_ymin=None, xCS_ymax=None,
                       xCS_zmin=None, xCS_zmax=None, 
                       yCS_xmin=None, yCS_xmax=None,
@@ -587,7 +2782,7 @@ class f1Plotter(talliesReader):
                       zCS_ymin=None, zCS_ymax=None, 
                     # Line plot settings
                       talval_label=None, logscale=True,
-                      exportLS=False,
+                      exportLS=False,   lineFamily=False, errorBands=False,
                       xLine_xmin = None, xLine_xmax = None, 
                       xLine_ymin = None, xLine_ymax = None,
                       yLine_xmin = None, yLine_xmax = None, 
@@ -598,7 +2793,7 @@ class f1Plotter(talliesReader):
         """ Main function for plotting f1 mesh tallies: 
         Produces distribution plots in 1D line scans and/or 2D cross sections.
         By default, no plots are produced unless the user specifies at least one of the following plot options as "True":
-        xLine, yLine, zLine, xCS, yCS, zCS
+        xLine, yLine, zLine, xCS, yCS, zCS, projection
         
         ARGUMENTS:
         f1Tally: A list that contains f1 tallies that are to be plotted
@@ -606,6 +2801,7 @@ class f1Plotter(talliesReader):
         verbose: Prints tally details and x, y, and z axis size
         fm     : Performs a similar function as FM cards; multiplies the tally value (talval) by a scalar value
         saveTo : Allows the user to save plots somewhere other than the mctalPath directory.
+        workers: Number of processes that draw and save plots in parallel (see renderPool; not used when show=True).
         x,y,z  : Allows the user to choose a specific axis bin (otherwise iterates over all axis bins).
         xLine  : Produces 1D line distributions of the x-axis at some y and z points.
         yLine  : Produces 1D line distributions of the y-axis at some x and z points.
@@ -613,6 +2809,11 @@ class f1Plotter(talliesReader):
         xCS    : Produces 2D mesh distributions on the yz-plane at some x-axis cross-section
         yCS    : Produces 2D mesh distributions on the xz-plane at some y-axis cross-section
         zCS    : Produces 2D mesh distributions on the xy-plane at some z-axis cross-section
+        projection: Produces maximum, mean and summed projections of the mesh along x, y and z (9 summary images per tally),
+                    computed in a single pass over the mesh. A list of methods limits the projections, e.g. projection=["max"].
+        hotspots: Only produces the CS plots and line scans through this number of largest mesh values (see findHotspots),
+                  instead of those at all bins (x, y and z are then ignored).
+        maxError: Hotspots whose relative error is above maxError (e.g. 0.1) are skipped.
         vmin   : Choose a minimum value for the colour bar in 2D plots.
         vmax   : Choose a maximum value for the colour bar in 2D plots.
         switchAxis  : When True, the x and y axis switch places (gets inverted)in CS plots only.
@@ -622,6 +2823,19 @@ class f1Plotter(talliesReader):
         cbar_label  : For 2D plots, adds a colour bar label (Not default, because F1/TMESH1 tally can be flux and/or energy)
         fontsize    : Sets the font size for the axis labels, and maintains ratios with other fontsizes.
         logscale    : Adjusts the axis scale for line scans only. Logscale is always switched on for CS plots.
+        exportLS    : Exports the line scan data: True (or "text") writes one text file per line scan next to its plot.
+                      "bulk" writes all line scans along each requested axis into one .npz file per axis (see writeLineScans).
+        lineFamily  : When True, xLine, yLine and zLine plot families of line scans instead of one figure per line scan:
+                      all x and y line scans at each z, and all z line scans at each y, coloured by the remaining axis.
+                      A list of bin edge indices of the colouring axis only plots those line scans in every family.
+                      Text exports (exportLS=True) are written per line scan, so they are skipped in this mode; use exportLS="bulk".
+        errorBands  : Adds the relative errors of line-scan families as bands around the lines.
+        exact       : When True, CS plots draw every mesh bin with pcolormesh. By default, level-of-detail (LOD) rendering is used:
+                      slices with more bins than the figure has pixels are block-reduced to the output pixel grid,
+                      and uniform meshes are drawn with imshow.
+        lodMethod   : How bins are merged by LOD rendering: "mean" (default), "max" (keeps peaks visible) or "min".
+        sharedScale : When True, all CS plots of an energy/time bin share one colour scale, from its smallest positive to its largest value
+                      (read from the statistics index of the mesh, see sliceStatistics). vmin and vmax still take precedence.
 
         Pixel density arguments are set by default to xCSdpi = yCSdpi = zCSdpi = 120 dots/inch. 
         This produces 1920x1080 figures because figsize=16x9[inch^2]
@@ -631,6 +2845,12 @@ class f1Plotter(talliesReader):
         # 0. Check if there are any f1 tallies
         if self.f1Tallies == []:
             raise FileNotFoundError("This mctal file has no tallies of type f1 to be plotted")
+        if exportLS not in (False, True, "text", "bulk"):
+            raise Warning('\nexportLS must be True (or "text") for one text file per line scan, or "bulk" for one file per axis')
+        textLS = exportLS in (True, "text") and not lineFamily
+        lineLimits = {"x": ((xLine_xmin, xLine_xmax), (xLine_ymin, xLine_ymax)),
+                      "y": ((yLine_xmin, yLine_xmax), (yLine_ymin, yLine_ymax)),
+                      "z": ((zLine_xmin, zLine_xmax), (zLine_ymin, zLine_ymax))}
 
         # 1. Check if user has entered specific f1 tallies.
         if f1Tally == None:
@@ -646,217 +2866,181 @@ class f1Plotter(talliesReader):
             pass
 
         # 2. Iterate over all f1Tallies and only run plotters for user-specified tallies (f1Tally=[]).
-        for self.tal1 in self.f1Tallies:
-            if self.tal1 in f1Tally:
-                for tal in self.allTals:
-                    if tal.tallyNumber == self.tal1:
-
-                        tal1 = self.tal1
+        for tal1 in self.f1Tallies:
+            if tal1 in f1Tally:
 
-                        # 3.1. Obtain the (i,j,k) coordinates using mc-tools' getAxis function.
-                        xAxis = tal.getAxis("i")
-                        yAxis = tal.getAxis("j")
-                        zAxis = tal.getAxis("k")
+                # 3. Obtain the (i,j,k) coordinates and the N-D tally values and errors (see loadMeshTally).
+                meshes = self.loadMeshTally(tal1)
+                xAxis, yAxis, zAxis, talval, talerr = meshes.mesh()
+
+                xi = xAxis[0]
+                xf = xAxis[-1]
+                dx = (xf-xi)/(len(xAxis)-1)
+
+                yi = yAxis[0]
+                yf = yAxis[-1]
+                dy = (yf-yi)/(len(yAxis)-1)
+
+                zi = zAxis[0]
+                zf = zAxis[-1]
+                dz = (zf-zi)/(len(zAxis)-1)
+
+                # 4. Print tally size and talval details
+                if verbose:
+                    print("\n=================== Tally "+str(tal1)+" ====================\n")
+                    print("\nAxis \t initial point \t final point \t step \t bins")
+                    print("______________________________________________________")
+                    print("x \t %-15.2f %-15.2f %-7i %-8i" % (xi, xf, dx, len(xAxis)) )
+                    print("y \t %-15.2f %-15.2f %-7i %-8i" % (yi, yf, dy, len(yAxis)) )
+                    print("z \t %-15.2f %-15.2f %-7i %-8i" % (zi, zf, dz, len(zAxis)) )
+                    print('\nTally '+str(tal1)+' has length '+f"{meshes.values.size:,}"+' and shape '+str(talval.shape), "\n")
+                    for a in meshes.extraAxes():
+                        print('Tally '+str(tal1)+' has '+str(meshes.shape[a])+' '+a+' bins, which are plotted separately')
+                    print("\n")
+
+                # 5. If user specifies x,y, or z --> check that the given values correspond to existing axis values.
+                if not x == None:
+                    if x not in xAxis:
+                        raise Warning("\nThe given x value must be equal to one of the existing x-axis bins.\nCheck x-axis bins using get_f1x()")
+                if not y == None:
+                    if y not in yAxis:
+                        raise Warning("\nThe given y value must be equal to one of the existing y-axis bins.\nCheck y-axis bins using get_f1y()")
+                if not z == None:
+                    if z not in zAxis:
+                        raise Warning("\nThe given z value must be equal to one of the existing z-axis bins.\nCheck z-axis bins using get_f1z()")
+
+                # 6. List the plots at the user-specified x, y, and z bins (all bins by default),
+                #    or only the plots through the hotspots of the mesh.
+                if hotspots:
+                    hot = [index for index, _, _ in findHotspots(talval, talerr, hotspots, maxError)]
+                    units = hotspotWorkUnits(hot, xCS=xCS, yCS=yCS, zCS=zCS,
+                                             xLine=xLine, yLine=yLine, zLine=zLine, lineFamily=bool(lineFamily))
+                else:
+                    units = meshWorkUnits(meshIndices(xAxis, x), meshIndices(yAxis, y), meshIndices(zAxis, z),
+                                          xCS=xCS, yCS=yCS, zCS=zCS,
+                                          xLine=xLine, yLine=yLine, zLine=zLine, lineFamily=bool(lineFamily))
+
+                    # 6.1. Order the plots of each kind by importance (largest sum of values first, see sliceStatistics.rank),
+                    #      so that interrupted or budgeted runs have produced the plots that matter most
+                    units = meshes.stats.rank(units)
+
+                # 7. Export all line scans along each requested axis in bulk (one file per axis instead of one per line scan).
+                if exportLS == "bulk" and not show:
+                    for axis, line in zip("xyz", (xLine, yLine, zLine)):
+                        if line:
+                            if saveTo:
+                                lines_path = saveTo
+                            else:
+                                lines_path = self.talliesDir+'/F1/f'+str(tal1)+'_plots/'+axis+'LineScan/'
+                            makedirs(lines_path, exist_ok=True)
+                            for bins in meshes.selections():
+                                writeLineScans(lines_path+'f'+str(tal1)+binLabel(bins)+'_'+axis+'Lines.npz', axis, *meshes.mesh(**bins))
+
+                # 8. Produce summary projections along x, y and z (a few images instead of one per mesh bin)
+                if projection:
+                    methods = ("max", "mean", "sum") if projection == True else projection
+                    if self.progress:
+                        self.progress.expect(tal1, "projection", len(meshes.selections()))
+                    for bins in meshes.selections():
+                        self.f1_projections(tal1, meshes.mesh(**bins), show=show, bins=bins, methods=methods,
+                                            saveTo=saveTo, fm=fm, vmin=vmin, vmax=vmax,
+                                            exact=exact, lodMethod=lodMethod,
+                                            switchAxis=switchAxis, cbar_label=cbar_label,
+                                            suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg)
+                        if self.progress:
+                            self.progress.done(tal1, "projection")
+
+                # 9. Produce plots as per user request
+                def f1Unit(bins, unit):
+                    mesh = meshes.mesh(**bins)
+                    plot, indices = unit
+
+                    # CS planes are checked (and scaled with sharedScale) with the statistics index of the mesh instead of the mesh itself
+                    low, high = vmin, vmax
+                    if sharedScale:
+                        limits = [None if limit == None else limit*fm for limit in meshes.stats.limits(bins)]
+                        low  = vmin if vmin != None else limits[0]
+                        high = vmax if vmax != None else limits[1]
+                    planeRange = meshes.stats.planeRange(plot[0], indices[0], bins) if plot.endswith("CS") else None
+                    lineRange  = meshes.stats.lineRange(plot[0], indices, bins) if plot.endswith("Line") else None
+                    if plot == "xCS":
+                        self.f1_xCS(tal1, *indices, mesh, show=show, bins=bins, planeRange=planeRange, saveTo=saveTo,
+                                    xCSdpi=xCSdpi,
+                                    vmin=low, vmax=high, fm=fm,
+                                    exact=exact, lodMethod=lodMethod,
+                                    xCS_ymin=xCS_ymin,
+                                    xCS_ymax=xCS_ymax,
+                                    xCS_zmin=xCS_zmin, 
+                                    xCS_zmax=xCS_zmax,
+                                    switchAxis=switchAxis, 
+                                    cbar_label=cbar_label,
+                                    suptitle=suptitle, 
+                                    fontsize=fontsize,
+                                    overlayImg=overlayImg)
+                    elif plot == "yCS":
+                        self.f1_yCS(tal1, *indices, mesh, show=show, bins=bins, planeRange=planeRange, saveTo=saveTo,
+                                    yCSdpi=yCSdpi, 
+                                    vmin=low, vmax=high, fm=fm,
+                                    exact=exact, lodMethod=lodMethod,
+                                    yCS_xmin=yCS_xmin,
+                                    yCS_xmax=yCS_xmax,
+                                    yCS_zmin=yCS_zmin, 
+                                    yCS_zmax=yCS_zmax,
+                                    switchAxis=switchAxis, 
+                                    cbar_label=cbar_label,
+                                    suptitle=suptitle, 
+                                    fontsize=fontsize,
+                                    overlayImg=overlayImg)
+                    elif plot == "zCS":
+                        self.f1_zCS(tal1, *indices, mesh, show=show, bins=bins, planeRange=planeRange, saveTo=saveTo,
+                                    zCSdpi=zCSdpi,
+                                    vmin=low, vmax=high, fm=fm,
+                                    exact=exact, lodMethod=lodMethod,
+                                    zCS_xmin=zCS_xmin,
+                                    zCS_xmax=zCS_xmax,
+                                    zCS_ymin=zCS_ymin, 
+                                    zCS_ymax=zCS_ymax,
+                                    switchAxis=switchAxis, 
+                                    cbar_label=cbar_label,
+                                    suptitle=suptitle, 
+                                    fontsize=fontsize,
+                                    overlayImg=overlayImg)
+                    elif plot == "xLine":
+                        self.f1_xLine(tal1, *indices, mesh, show=show, bins=bins, lineRange=lineRange, saveTo=saveTo,
+                                      talval_label=talval_label,
+                                      exportLS=textLS,
+                                      fontsize=fontsize, logscale=logscale,
+                                      xLine_xmin=xLine_xmin, xLine_xmax=xLine_xmax,
+                                      xLine_ymin=xLine_ymin, xLine_ymax=xLine_ymax)
+                    elif plot == "yLine":
+                        self.f1_yLine(tal1, *indices, mesh, show=show, bins=bins, lineRange=lineRange, saveTo=saveTo,
+                                      talval_label=talval_label, 
+                                      exportLS=textLS,
+                                      fontsize=fontsize, logscale=logscale,
+                                      yLine_xmin=yLine_xmin, yLine_xmax=yLine_xmax,
+                                      yLine_ymin=yLine_ymin, yLine_ymax=yLine_ymax)
+                    elif plot == "zLine":
+                        self.f1_zLine(tal1, *indices, mesh, show=show, bins=bins, lineRange=lineRange, saveTo=saveTo,
+                                      talval_label=talval_label,
+                                      exportLS=textLS,
+                                      fontsize=fontsize, logscale=logscale,
+                                      zLine_xmin=zLine_xmin, zLine_xmax=zLine_xmax,
+                                      zLine_ymin=zLine_ymin, zLine_ymax=zLine_ymax)
+                    elif plot in ("xFamily", "yFamily", "zFamily"):
+                        axis = plot[0]
+                        self.f1_lineFamily(tal1, axis, *indices, mesh, show=show, bins=bins, saveTo=saveTo,
+                                           lines=None if lineFamily == True else lineFamily,
+                                           errorBands=errorBands,
+                                           talval_label=talval_label,
+                                           fontsize=fontsize, logscale=logscale,
+                                           xlim=lineLimits[axis][0], ylim=lineLimits[axis][1])
+
+                # 9.1. Plots are produced for every energy/time bin. With workers > 1, saved plots are drawn in parallel by worker processes.
+                self.runUnits(tal1, f1Unit, meshes.selections(), units, workers=workers if show == False else 1)
+
+                # 10. Log the skipped plots of the tally as summaries (see diagnosticCounter)
+                self.diagnostics.summarize(tal1)
 
-                        xi = xAxis[0]
-                        xf = xAxis[-1]
-                        dx = (xf-xi)/(len(xAxis)-1)
-
-                        yi = yAxis[0]
-                        yf = yAxis[-1]
-                        dy = (yf-yi)/(len(yAxis)-1)
-
-                        zi = zAxis[0]
-                        zf = zAxis[-1]
-                        dz = (zf-zi)/(len(zAxis)-1)
-
-                        # 3.2. create meshgrids for x, y, and z cross sections (CS)
-                        zCS_x , zCS_y = np.meshgrid(xAxis,yAxis)  # To pronounce "zCS_x": x axis at fixed z CS
-                        yCS_x , yCS_z = np.meshgrid(xAxis,zAxis)
-                        xCS_y , xCS_z = np.meshgrid(yAxis,zAxis)
-
-                        # 4.1. Extract tally values (talval) from f1 tally file
-                        file = self.talliesDir+'/F%s/' %str(tal1)[-1] +'f'+str(tal1)
-                        with open(file) as f:
-                            talval = []
-                            talerr = []
-                            for line in f:
-                                parts = [float(i) for i in line.split()]
-                                talval.append(parts[2])
-                                talerr.append(parts[3])
-                        
-                        # 4.2. Reshape the talval and talerr arrays to match the x,y,z shape.
-                        talval = np.array(talval)
-                        talval2 = talval.reshape(len(xAxis)-1, len(yAxis)-1, len(zAxis)-1)
-                        talerr = np.array(talerr)
-                        talerr2 = talerr.reshape(len(xAxis)-1, len(yAxis)-1, len(zAxis)-1)
-                        
-                        # 5. Print tally size and talval details
-                        if verbose:
-                            print("\n=================== Tally "+str(tal1)+" ====================\n")
-                            print("\nAxis \t initial point \t final point \t step \t bins")
-                            print("______________________________________________________")
-                            print("x \t %-15.2f %-15.2f %-7i %-8i" % (xi, xf, dx, len(xAxis)) )
-                            print("y \t %-15.2f %-15.2f %-7i %-8i" % (yi, yf, dy, len(yAxis)) )
-                            print("z \t %-15.2f %-15.2f %-7i %-8i" % (zi, zf, dz, len(zAxis)) )
-                            print('\nTally '+str(tal1)+' has length '+f"{len(talval):,}"+' and shape '+str(talval2.shape), "\n\n")
-                        
-                        # 6. Obtain the 2D planer distribution at points x, y, and z.
-                        for self.xx in range(len(xAxis)):
-                            for self.yy in range(len(yAxis)):
-                                for self.zz in range(len(zAxis)):
-
-                                    # 6.1. 2D cross-sectional distribution
-                                    talval_yz = talval2[ (self.xx-1) ,       :      ,       :      ]
-                                    talval_xz = talval2[      :      ,  (self.yy-1) ,       :      ]
-                                    talval_xy = talval2[      :      ,       :      ,  (self.zz-1) ]
-                                    talval_yz = talval_yz.transpose()
-                                    talval_xz = talval_xz.transpose()
-                                    talval_xy = talval_xy.transpose()
-
-                                    talerr_yz = talerr2[ (self.xx-1) ,       :      ,       :      ]
-                                    talerr_xz = talerr2[      :      ,  (self.yy-1) ,       :      ]
-                                    talerr_xy = talerr2[      :      ,       :      ,  (self.zz-1) ]
-                                    talerr_yz = talerr_yz.transpose()
-                                    talerr_xz = talerr_xz.transpose()
-                                    talerr_xy = talerr_xy.transpose()
-
-                                    # 6.2. 1D linear distributions
-                                    self.talval_xLine = talval_xz[self.zz-1,     :   ]
-                                    self.talval_yLine = talval_xy[    :    ,self.xx-1]
-                                    self.talval_zLine = talval_yz[    :    ,self.yy-1]
-
-                                    self.talerr_xLine = talerr_xz[self.zz-1,     :   ]
-                                    self.talerr_yLine = talerr_xy[    :    ,self.xx-1]
-                                    self.talerr_zLine = talerr_yz[    :    ,self.yy-1]
-
-                                    # 6.3. Pass variables to class scope
-                                    self.xAxis = xAxis
-                                    self.yAxis = yAxis
-                                    self.zAxis = zAxis
-                                    self.xCS_y = xCS_y
-                                    self.xCS_z = xCS_z
-                                    self.yCS_x = yCS_x
-                                    self.yCS_z = yCS_z
-                                    self.zCS_x = zCS_x
-                                    self.zCS_y = zCS_y
-                                    self.talval_yz = talval_yz
-                                    self.talval_xz = talval_xz
-                                    self.talval_xy = talval_xy
-                                    self.talerr_yz = talerr_yz
-                                    self.talerr_xz = talerr_xz
-                                    self.talerr_xy = talerr_xy
-
-                                    # 7. Produce plots as per user request
-                                    def f1ArgsChecker(self):
-                                        if xCS:
-                                            self.f1_xCS(show=show, saveTo=saveTo,
-                                                        xCSdpi=xCSdpi,
-                                                        vmin=vmin, vmax=vmax, fm=fm,
-                                                        xCS_ymin=xCS_ymin,
-                                                        xCS_ymax=xCS_ymax,
-                                                        xCS_zmin=xCS_zmin, 
-                                                        xCS_zmax=xCS_zmax,
-                                                        switchAxis=switchAxis, 
-                                                        cbar_label=cbar_label,
-                                                        suptitle=suptitle, 
-                                                        fontsize=fontsize,
-                                                        overlayImg=overlayImg)
-                                        if yCS:
-                                            self.f1_yCS(show=show, saveTo=saveTo,
-                                                        yCSdpi=yCSdpi, 
-                                                        vmin=vmin, vmax=vmax, fm=fm,
-                                                        yCS_xmin=yCS_xmin,
-                                                        yCS_xmax=yCS_xmax,
-                                                        yCS_zmin=yCS_zmin, 
-                                                        yCS_zmax=yCS_zmax,
-                                                        switchAxis=switchAxis, 
-                                                        cbar_label=cbar_label,
-                                                        suptitle=suptitle, 
-                                                        fontsize=fontsize,
-                                                        overlayImg=overlayImg)
-                                        if zCS:
-                                            self.f1_zCS(show=show, saveTo=saveTo,
-                                                        zCSdpi=zCSdpi,
-                                                        vmin=vmin, vmax=vmax, fm=fm,
-                                                        zCS_xmin=zCS_xmin,
-                                                        zCS_xmax=zCS_xmax,
-                                                        zCS_ymin=zCS_ymin, 
-                                                        zCS_ymax=zCS_ymax,
-                                                        switchAxis=switchAxis, 
-                                                        cbar_label=cbar_label,
-                                                        suptitle=suptitle, 
-                                                        fontsize=fontsize,
-                                                        overlayImg=overlayImg)
-                                        if xLine:
-                                            self.f1_xLine(show=show, saveTo=saveTo,
-                                                          talval_label=talval_label,
-                                                          exportLS=exportLS,
-                                                          fontsize=fontsize, logscale=logscale,
-                                                          xLine_xmin=xLine_xmin, xLine_xmax=xLine_xmax,
-                                                          xLine_ymin=xLine_ymin, xLine_ymax=xLine_ymax)
-                                        if yLine:
-                                            self.f1_yLine(show=show, saveTo=saveTo,
-                                                          talval_label=talval_label, 
-                                                          exportLS=exportLS,
-                                                          fontsize=fontsize, logscale=logscale,
-                                                          yLine_xmin=yLine_xmin, yLine_xmax=yLine_xmax,
-                                                          yLine_ymin=yLine_ymin, yLine_ymax=yLine_ymax)
-                                        if zLine:
-                                            self.f1_zLine(show=show, saveTo=saveTo,
-                                                          talval_label=talval_label,
-                                                          exportLS=exportLS,
-                                                          fontsize=fontsize, logscale=logscale,
-                                                          zLine_xmin=zLine_xmin, zLine_xmax=zLine_xmax,
-                                                          zLine_ymin=zLine_ymin, zLine_ymax=zLine_ymax)
-
-                                    # 7.1. If user specifies x,y, or z --> check that the given values correspond to existing axis values.
-                                    if not x == None:
-                                        if x not in xAxis:
-                                            raise Warning("\nThe given x value must be equal to one of the existing x-axis bins.\nCheck x-axis bins using get_f1x()")
-                                    if not y == None:
-                                        if y not in yAxis:
-                                            raise Warning("\nThe given y value must be equal to one of the existing y-axis bins.\nCheck y-axis bins using get_f1y()")
-                                    if not z == None:
-                                        if z not in zAxis:
-                                            raise Warning("\nThe given z value must be equal to one of the existing z-axis bins.\nCheck z-axis bins using get_f1z()")
-
-                                    # 7.2. We ignore the first point (Fencepost: We get 1 talval between 2 bins)
-                                    if xAxis[self.xx] != xAxis[0]:
-                                        if yAxis[self.yy] != yAxis[0]:
-                                            if zAxis[self.zz] != zAxis[0]:
-
-                                                # 7.3. If user inputs x,y, and z --> only produce plots at these x,y, and z
-                                                if not x == None and not y == None and not z == None:
-                                                    if x == xAxis[self.xx] and y == yAxis[self.yy] and z == zAxis[self.zz]:
-                                                        f1ArgsChecker(self)
-                                                
-                                                elif not x == None and not y == None:
-                                                    if x == xAxis[self.xx] and y == yAxis[self.yy]:
-                                                        f1ArgsChecker(self)
-
-                                                elif not x == None and not z == None:
-                                                    if x == xAxis[self.xx] and z == zAxis[self.zz]:
-                                                        f1ArgsChecker(self)
-
-                                                elif not z == None and not y == None:
-                                                    if z == zAxis[self.zz] and y == yAxis[self.yy]:
-                                                        f1ArgsChecker(self)
-
-                                                elif not x == None:
-                                                    if x == xAxis[self.xx]:
-                                                        f1ArgsChecker(self)
-                                                
-                                                elif not y == None:
-                                                    if y == yAxis[self.yy]:
-                                                        f1ArgsChecker(self)
-
-                                                elif not z == None:
-                                                    if z == zAxis[self.zz]:
-                                                        f1ArgsChecker(self)
-
-                                                else:
-                                                    f1ArgsChecker(self)
         if verbose:
             print('\n=====================\n    f1 completed\n=====================')
 
@@ -866,406 +3050,425 @@ class f3Plotter(talliesReader):
     Please see the docstring of method "plot_f3" for more details.
     """ 
 
-    def f3_xCS(self, show=False,
+    def f3_xCS(self, tal3, xx, mesh, show=False, bins=None, planeRange=None,
                      suptitle=None, fontsize=12,
                      xCSdpi=120, saveTo=None,
                      overlayImg=None,
                      switchAxis=False, 
                      cbar_label=None, 
                      vmin=None, vmax=None, fm=1,
+                     exact=False, lodMethod='mean',
                      xCS_ymin=None, xCS_ymax=None,
                      xCS_zmin=None, xCS_zmax=None,
                 ):
+        """ Plots the yz-plane of f3 tally tal3 between the x bin edges xx-1 and xx.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh. It is only read, so it can be shared between threads.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        planeRange is the (min, max) of the plane from the statistics index of the mesh (see sliceStatistics), so empty planes are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
 
-       ## 1. Prepare a function to plot the figures
-        def f3_xCS_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-
-            # Axes and values
-            if switchAxis == False:
-                im = ax.pcolormesh(self.xCS_y, self.xCS_z, self.heat_yz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax), cmap='plasma')
-                ax.set_xlabel('y [cm]', fontsize=fontsize)
-                ax.set_ylabel('z [cm]', fontsize=fontsize)
-                plt.xlim(xmin=xCS_ymin,xmax=xCS_ymax)
-                plt.ylim(ymin=xCS_zmin,ymax=xCS_zmax)
-            else: 
-                im = ax.pcolormesh(self.xCS_z, self.xCS_y, self.heat_yz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax), cmap='plasma')
-                ax.set_xlabel('z [cm]', fontsize=fontsize)
-                ax.set_ylabel('y [cm]', fontsize=fontsize)
-                plt.xlim(xmin=xCS_zmin,xmax=xCS_zmax)
-                plt.ylim(ymin=xCS_ymin,ymax=xCS_ymax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-
-            # Colour bar
-            cbar = plt.colorbar(im)
-            cbar.ax.tick_params(labelsize=fontsize*0.85)
-            if cbar_label:
-                cbar.set_label(cbar_label, fontsize=fontsize)
-            else:
-                cbar.set_label('Heat load [MeV/cm³]', fontsize=fontsize)
-
-            # Titles and layout
-            if suptitle:
-                plt.suptitle(suptitle, fontsize=fontsize*1.4, horizontalalignment='center', x=0.6)
-            ax.set_title('yz-plane 2D heat load between x = '+str(self.xAxis[self.xx-1])+'cm and x ='+str(self.xAxis[self.xx])+'cm\n',
-            fontsize=fontsize*1.15)
-            ax.set_aspect('equal')
-            fig.tight_layout()
-            self.fig = fig
-
-            # Option to add image on top of plot
-            if overlayImg:
-                img = plt.imread(overlayImg)
-                if switchAxis == False:
-                    ax.imshow(img, zorder=3, extent=[self.yAxis[0], self.yAxis[-1], self.zAxis[0], self.zAxis[-1] ])
-                else:
-                    ax.imshow(img, zorder=3, extent=[self.zAxis[0], self.zAxis[-1], self.yAxis[0], self.yAxis[-1] ])
+        ## 1. Prepare a function to plot the figures
+        def f3_xCS_plot(pyplot=False):
+            return meshCSFigure("f3", "x", xx, xAxis, yAxis, zAxis, heat, fm=fm, switchAxis=switchAxis,
+                                amin=xCS_ymin, amax=xCS_ymax, bmin=xCS_zmin, bmax=xCS_zmax,
+                                cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                exact=exact, lodMethod=lodMethod, dpi=xCSdpi, pyplot=pyplot)
 
         ## 2. Either show or save the plot
         # 2.1. Ensure that a range of values exists
-        if self.heat_yz.min() != self.heat_yz.max():  
+        if planeRange:
+            low, high = planeRange
+        else:
+            heat_yz = heat[xx-1, :, :]
+            low, high = heat_yz.min(), heat_yz.max()
+        if low != high:  
 
             # 2.2. Only show the plot (without saving)
             if show == True:
-                f3_xCS_plot(self)
+                f3_xCS_plot(pyplot=True)
                 plt.show()
 
-            # 2.3. Save the plot (will not save if a file with the same name already exists)
+            # 2.3. Save the plot (will not render it again if the saved image is current, see saveRender)
             else:
                 if saveTo:
                     xCS_path=saveTo
                 else:
-                    xCS_path = self.talliesDir+'/F3/f'+str(self.tal3)+'_plots/xCS'
-                xCS_file = '/f'+str(self.tal3)+'_xCS'+ str(self.xx)+'.png'
-
-                if not path.isfile(xCS_path+xCS_file):
-                    if not path.exists(xCS_path):
-                        makedirs(xCS_path)
-                    f3_xCS_plot(self)
-                    self.fig.savefig(xCS_path+xCS_file, bbox_inches='tight', dpi=xCSdpi)
-                    plt.close()
+                    xCS_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/xCS'
+                xCS_file = '/f'+str(tal3)+binLabel(bins)+'_xCS'+ str(xx)+'.png'
+
+                self.saveRender(xCS_path+xCS_file, f3_xCS_plot, dpi=xCSdpi,
+                                inputs=(sliceStamp(mesh, ("x", xx), lambda: heat[xx-1, :, :]), xAxis, yAxis, zAxis, fm, switchAxis, xCS_ymin, xCS_ymax, xCS_zmin, xCS_zmax,
+                                        cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod))
         else:
-            print(f"Value range is 0. No xCS plots can be made at x={self.xx}, y={self.yy}, z={self.zz}")
+            self.diagnostics.add(tal3, "xCS", "x=%s%s" % (xx, binLabel(bins)))
 
 
-    def f3_yCS(self, show=False,
+    def f3_yCS(self, tal3, yy, mesh, show=False, bins=None, planeRange=None,
                      suptitle=None, fontsize=12,
                      yCSdpi=120, saveTo=None,
                      overlayImg=None,
                      switchAxis=False, 
                      cbar_label=None, 
                      vmin=None, vmax=None, fm=1,
+                     exact=False, lodMethod='mean',
                      yCS_xmin=None, yCS_xmax=None,
                      yCS_zmin=None, yCS_zmax=None,
                 ):
+        """ Plots the xz-plane of f3 tally tal3 between the y bin edges yy-1 and yy.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh. It is only read, so it can be shared between threads.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        planeRange is the (min, max) of the plane from the statistics index of the mesh (see sliceStatistics), so empty planes are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
 
         ## 1. Prepare a function to plot the figures
-        def f3_yCS_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-
-            # Axes and values
-            if switchAxis == False:
-                im = ax.pcolormesh(self.yCS_x, self.yCS_z, self.heat_xz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax), cmap='plasma')
-                ax.set_xlabel('x [cm]', fontsize=fontsize)
-                ax.set_ylabel('z [cm]', fontsize=fontsize)
-                plt.xlim(xmin=yCS_xmin,xmax=yCS_xmax)
-                plt.ylim(ymin=yCS_zmin,ymax=yCS_zmax)
-            else: 
-                im = ax.pcolormesh(self.yCS_z, self.yCS_x, self.heat_xz*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax), cmap='plasma')
-                ax.set_xlabel('z [cm]', fontsize=fontsize)
-                ax.set_ylabel('x [cm]', fontsize=fontsize)
-                plt.xlim(xmin=yCS_zmin,xmax=yCS_zmax)
-                plt.ylim(ymin=yCS_xmin,ymax=yCS_xmax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-
-            # Colour bar
-            cbar = plt.colorbar(im)
-            cbar.ax.tick_params(labelsize=fontsize*0.85)
-            if cbar_label:
-                cbar.set_label(cbar_label, fontsize=fontsize)
-            else:
-                cbar.set_label('Heat load [MeV/cm³]', fontsize=fontsize)
-
-            # Titles and layout
-            if suptitle:
-                plt.suptitle(suptitle, fontsize=fontsize*1.4, horizontalalignment='center', x=0.6)
-            ax.set_title('xz-plane 2D heat load between y = '+str(self.yAxis[self.yy-1])+'cm and y ='+str(self.yAxis[self.yy])+'cm\n',
-                            fontsize=fontsize*1.15)
-            ax.set_aspect('equal')
-            fig.tight_layout()
-            self.fig = fig
-
-            # Option to add image on top of plot
-            if overlayImg:
-                img = plt.imread(overlayImg)
-                if switchAxis == False:
-                    ax.imshow(img, zorder=3, extent=[self.xAxis[0], self.xAxis[-1], self.zAxis[0], self.zAxis[-1] ])
-                else:
-                    ax.imshow(img, zorder=3, extent=[self.zAxis[0], self.zAxis[-1], self.xAxis[0], self.xAxis[-1] ])
+        def f3_yCS_plot(pyplot=False):
+            return meshCSFigure("f3", "y", yy, xAxis, yAxis, zAxis, heat, fm=fm, switchAxis=switchAxis,
+                                amin=yCS_xmin, amax=yCS_xmax, bmin=yCS_zmin, bmax=yCS_zmax,
+                                cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                exact=exact, lodMethod=lodMethod, dpi=yCSdpi, pyplot=pyplot)
 
         ## 2. Either show or save the plot
         # 2.1. Ensure that a range of values exists
-        if self.heat_xz.min() != self.heat_xz.max():  
+        if planeRange:
+            low, high = planeRange
+        else:
+            heat_xz = heat[:, yy-1, :]
+            low, high = heat_xz.min(), heat_xz.max()
+        if low != high:  
 
             # 2.2. Only show the plot (without saving)
             if show == True:
-                f3_yCS_plot(self)
+                f3_yCS_plot(pyplot=True)
                 plt.show()
 
-            # 2.3. Save the plot (will not save if a file with the same name already exists)
+            # 2.3. Save the plot (will not render it again if the saved image is current, see saveRender)
             else:
                 if saveTo:
                     yCS_path=saveTo
                 else:
-                    yCS_path = self.talliesDir+'/F3/f'+str(self.tal3)+'_plots/yCS'
-                yCS_file = '/f'+str(self.tal3)+'_yCS'+ str(self.yy)+'.png'
-
-                if not path.isfile(yCS_path+yCS_file):
-                    if not path.exists(yCS_path):
-                        makedirs(yCS_path)
-                    f3_yCS_plot(self)
-                    self.fig.savefig(yCS_path+yCS_file, bbox_inches='tight', dpi=yCSdpi)
-                    plt.close()
+                    yCS_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/yCS'
+                yCS_file = '/f'+str(tal3)+binLabel(bins)+'_yCS'+ str(yy)+'.png'
+
+                self.saveRender(yCS_path+yCS_file, f3_yCS_plot, dpi=yCSdpi,
+                                inputs=(sliceStamp(mesh, ("y", yy), lambda: heat[:, yy-1, :]), xAxis, yAxis, zAxis, fm, switchAxis, yCS_xmin, yCS_xmax, yCS_zmin, yCS_zmax,
+                                        cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod))
         else:
-            print(f"Value range is 0. No yCS plots can be made at x={self.xx}, y={self.yy}, z={self.zz}")
+            self.diagnostics.add(tal3, "yCS", "y=%s%s" % (yy, binLabel(bins)))
 
 
-    def f3_zCS(self, show=False,
+    def f3_zCS(self, tal3, zz, mesh, show=False, bins=None, planeRange=None,
                      suptitle=None, fontsize=12,
                      zCSdpi=120, saveTo=None,
                      overlayImg=None,
                      switchAxis=False, 
                      cbar_label=None, 
                      vmin=None, vmax=None, fm=1,
+                     exact=False, lodMethod='mean',
                      zCS_xmin=None, zCS_xmax=None,
                      zCS_ymin=None, zCS_ymax=None,
                 ):
-        
+        """ Plots the xy-plane of f3 tally tal3 between the z bin edges zz-1 and zz.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh. It is only read, so it can be shared between threads.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        planeRange is the (min, max) of the plane from the statistics index of the mesh (see sliceStatistics), so empty planes are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
+
         ## 1. Prepare a function to plot the figures
-        def f3_zCS_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-
-            # Axes and values
-            if switchAxis == False:
-                im = ax.pcolormesh(self.zCS_x, self.zCS_y, self.heat_xy*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax), cmap='plasma')
-                ax.set_xlabel('x [cm]', fontsize=fontsize)
-                ax.set_ylabel('y [cm]', fontsize=fontsize)
-                plt.xlim(xmin=zCS_xmin,xmax=zCS_xmax)
-                plt.ylim(ymin=zCS_ymin,ymax=zCS_ymax)
-            else: 
-                im = ax.pcolormesh(self.zCS_y, self.zCS_x, self.heat_xy*fm, snap=True, norm=LogNorm(vmin=vmin, vmax=vmax), cmap='plasma')
-                ax.set_xlabel('y [cm]', fontsize=fontsize)
-                ax.set_ylabel('x [cm]', fontsize=fontsize)
-                plt.xlim(xmin=zCS_ymin,xmax=zCS_ymax)
-                plt.ylim(ymin=zCS_xmin,ymax=zCS_xmax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-
-            # Colour bar
-            cbar = plt.colorbar(im)
-            cbar.ax.tick_params(labelsize=fontsize*0.85)
-            if cbar_label:
-                cbar.set_label(cbar_label, fontsize=fontsize)
-            else:
-                cbar.set_label('Heat load [MeV/cm³]', fontsize=fontsize)
-
-            # Titles and layout
-            if suptitle:
-                plt.suptitle(suptitle, fontsize=fontsize*1.4, horizontalalignment='center', x=0.6)
-            ax.set_title('xy-plane 2D distribution between z = '+str(self.zAxis[self.zz-1])+'cm and z ='+str(self.zAxis[self.zz])+'cm\n',
-                            fontsize=fontsize*1.15)
-            ax.set_aspect('equal')
-            fig.tight_layout()
-            self.fig = fig
-
-            # Option to add image on top of plot
-            if overlayImg:
-                img = plt.imread(overlayImg)
-                if switchAxis == False:
-                    ax.imshow(img, zorder=3, extent=[self.xAxis[0], self.xAxis[-1], self.yAxis[0], self.yAxis[-1] ])
-                else:
-                    ax.imshow(img, zorder=3, extent=[self.yAxis[0], self.yAxis[-1], self.xAxis[0], self.xAxis[-1] ])
+        def f3_zCS_plot(pyplot=False):
+            return meshCSFigure("f3", "z", zz, xAxis, yAxis, zAxis, heat, fm=fm, switchAxis=switchAxis,
+                                amin=zCS_xmin, amax=zCS_xmax, bmin=zCS_ymin, bmax=zCS_ymax,
+                                cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                exact=exact, lodMethod=lodMethod, dpi=zCSdpi, pyplot=pyplot)
 
         ## 2. Either show or save the plot
         # 2.1. Ensure that a range of values exists
-        if self.heat_xy.min() != self.heat_xy.max():  
+        if planeRange:
+            low, high = planeRange
+        else:
+            heat_xy = heat[:, :, zz-1]
+            low, high = heat_xy.min(), heat_xy.max()
+        if low != high:  
 
             # 2.2. Only show the plot (without saving)
             if show == True:
-                f3_zCS_plot(self)
+                f3_zCS_plot(pyplot=True)
                 plt.show()
 
-            # 2.3. Save the plot (will not save if a file with the same name already exists)
+            # 2.3. Save the plot (will not render it again if the saved image is current, see saveRender)
             else:
                 if saveTo:
                     zCS_path=saveTo
                 else:
-                    zCS_path = self.talliesDir+'/F3/f'+str(self.tal3)+'_plots/zCS'
-                zCS_file = '/f'+str(self.tal3)+'_zCS'+ str(self.zz)+'.png'
-
-                if not path.isfile(zCS_path+zCS_file):
-                    if not path.exists(zCS_path):
-                        makedirs(zCS_path)
-                    f3_zCS_plot(self)
-                    self.fig.savefig(zCS_path+zCS_file, bbox_inches='tight', dpi=zCSdpi)
-                    plt.close()
+                    zCS_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/zCS'
+                zCS_file = '/f'+str(tal3)+binLabel(bins)+'_zCS'+ str(zz)+'.png'
+
+                self.saveRender(zCS_path+zCS_file, f3_zCS_plot, dpi=zCSdpi,
+                                inputs=(sliceStamp(mesh, ("z", zz), lambda: heat[:, :, zz-1]), xAxis, yAxis, zAxis, fm, switchAxis, zCS_xmin, zCS_xmax, zCS_ymin, zCS_ymax,
+                                        cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod))
         else:
-            print(f"Value range is 0. No zCS plots can be made at x={self.xx}, y={self.yy}, z={self.zz}")
+            self.diagnostics.add(tal3, "zCS", "z=%s%s" % (zz, binLabel(bins)))
 
 
-    def f3_xLine(self, show=False, fontsize=12,
+    def f3_xLine(self, tal3, yy, zz, mesh, show=False, bins=None, lineRange=None, fontsize=12,
                  saveTo=None, exportLS=False, 
                  talval_label=None, logscale=True,
                  xLine_xmin=None, xLine_xmax=None, 
                  xLine_ymin=None, xLine_ymax=None):
-        
-        def f3_xLine_plot(self):     
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-            ax.plot(self.xAxis[1:], self.heat_xLine, "ko", markersize=2.5)
-            ax.set_title('x-axis 1D distribution at y ='+str(self.yAxis[self.yy])+'cm and z='+str(self.zAxis[self.zz])+'cm\n',
-                        fontsize=fontsize*1.33)
-            ax.set_xlabel('x [cm]', fontsize=fontsize)
-            if talval_label:
-                ax.set_ylabel(talval_label, fontsize=fontsize)
-            else:
-                ax.set_ylabel('Heat load [MeV/cm³]')
-            if logscale==True:
-                ax.set_yscale('log')
-            ax.set_xlim(xmin=xLine_xmin, xmax=xLine_xmax)
-            ax.set_ylim(ymin=xLine_ymin, ymax=xLine_ymax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-            ax.grid()
-            fig.tight_layout()
-            self.fig = fig
-
-        def exportLSx(self):        
-            file=open(self.xLine_path+self.xLine_file, 'w')
+        """ Plots the x-axis line scan of f3 tally tal3 at the y and z bin edges yy and zz.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        lineRange is the (min, max) of the line scan from the statistics index of the mesh (see sliceStatistics), so empty line scans are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
+
+        def f3_xLine_plot(pyplot=False):
+            return meshLineFigure("f3", "x", (yy, zz), xAxis, yAxis, zAxis, heat,
+                                  talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                  xlim=(xLine_xmin, xLine_xmax), ylim=(xLine_ymin, xLine_ymax), pyplot=pyplot)
+
+        def exportLSx(xLine_path, xLine_file):
+            # The values are written with the digits of the tally file (see exactMesh)
+            heat, talerr = self.exactMesh(tal3, bins)[3:]
+            heat_xLine = heat[:, yy-1, zz-1]
+            talerr_xLine = talerr[:, yy-1, zz-1]
+            file=open(xLine_path+xLine_file, 'w')
             file.write("x axis bin\ttally value \terror value\n")
-            for i in range(len(self.heat_xLine)):
-                file.write("%-10i\t%e\t%e\n"%(self.xAxis[1:][i], self.heat_xLine[i],self.talerr_xLine[i]))
+            for i in range(len(heat_xLine)):
+                file.write("%-10i\t%e\t%e\n"%(xAxis[1:][i], heat_xLine[i],talerr_xLine[i]))
             file.close()
 
+        # Empty line scans (all values are 0) are not drawn, but their text exports are still written
+        if lineRange:
+            low, high = lineRange
+        else:
+            heat_xLine = heat[:, yy-1, zz-1]
+            low, high = heat_xLine.min(), heat_xLine.max()
+        empty = low == 0 and high == 0
+        if empty:
+            self.diagnostics.add(tal3, "xLine", "y=%s z=%s%s" % (yy, zz, binLabel(bins)))
+
         if show == True:
-            f3_xLine_plot(self)
-            plt.show()
+            if not empty:
+                f3_xLine_plot(pyplot=True)
+                plt.show()
         else:
             if saveTo:
-                self.xLine_path=saveTo
+                xLine_path=saveTo
             else:
-                self.xLine_path = self.talliesDir+'/F3/f'+str(self.tal3)+'_plots/xLineScan/'
+                xLine_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/xLineScan/'
             
-            self.xLine_file = 'f'+str(self.tal3)+'_xLine_y'+str(self.yy)+'_z'+str(self.zz)
-            if not path.isfile(self.xLine_path+self.xLine_file+'.png'):
-                if not path.exists(self.xLine_path):
-                    makedirs(self.xLine_path)
-                f3_xLine_plot(self)
-                self.fig.savefig(self.xLine_path+self.xLine_file+'.png', bbox_inches='tight')
-                plt.close()
+            xLine_file = 'f'+str(tal3)+binLabel(bins)+'_xLine_y'+str(yy)+'_z'+str(zz)
+            if not empty:
+                self.saveRender(xLine_path+xLine_file+'.png', f3_xLine_plot,
+                                inputs=(sliceStamp(mesh, ("x", yy, zz), lambda: heat[:, yy-1, zz-1]), xAxis, yAxis, zAxis, talval_label, logscale, fontsize,
+                                        xLine_xmin, xLine_xmax, xLine_ymin, xLine_ymax))
             if exportLS:
-                exportLSx(self)
+                makedirs(xLine_path, exist_ok=True)
+                exportLSx(xLine_path, xLine_file)
 
 
-    def f3_yLine(self, show=False, fontsize=12,
+    def f3_yLine(self, tal3, xx, zz, mesh, show=False, bins=None, lineRange=None, fontsize=12,
                  saveTo=None, exportLS=False, 
                  talval_label=None, logscale=True,
                  yLine_xmin=None, yLine_xmax=None, 
                  yLine_ymin=None, yLine_ymax=None):
-
-        def f3_yLine_plot(self):        
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-            ax.plot(self.yAxis[:-1], self.heat_yLine, "ko", markersize=2.5)
-            ax.set_title('y-axis 1D distribution at x ='+str(self.xAxis[self.xx])+'cm and z='+str(self.zAxis[self.zz])+'cm\n',
-                        fontsize=fontsize*1.33)
-            ax.set_xlabel('y [cm]', fontsize=fontsize)
-            if talval_label:
-                ax.set_ylabel(talval_label, fontsize=fontsize)
-            else:
-                ax.set_ylabel('Heat load [MeV/cm³]')
-            if logscale==True:
-                ax.set_yscale('log')
-            ax.set_xlim(xmin=yLine_xmin, xmax=yLine_xmax)
-            ax.set_ylim(ymin=yLine_ymin, ymax=yLine_ymax)
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)            
-            ax.grid()
-            fig.tight_layout()
-            self.fig = fig
-
-        def exportLSy(self):        
-            file=open(self.yLine_path+self.yLine_file, 'w')
+        """ Plots the y-axis line scan of f3 tally tal3 at the x and z bin edges xx and zz.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        lineRange is the (min, max) of the line scan from the statistics index of the mesh (see sliceStatistics), so empty line scans are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
+
+        def f3_yLine_plot(pyplot=False):
+            return meshLineFigure("f3", "y", (xx, zz), xAxis, yAxis, zAxis, heat,
+                                  talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                  xlim=(yLine_xmin, yLine_xmax), ylim=(yLine_ymin, yLine_ymax), pyplot=pyplot)
+
+        def exportLSy(yLine_path, yLine_file):
+            # The values are written with the digits of the tally file (see exactMesh)
+            heat, talerr = self.exactMesh(tal3, bins)[3:]
+            heat_yLine = heat[xx-1, :, zz-1]
+            talerr_yLine = talerr[xx-1, :, zz-1]
+            file=open(yLine_path+yLine_file, 'w')
             file.write("y axis bin\ttally value \terror value\n")
-            for i in range(len(self.heat_yLine)):
-                file.write("%-10i\t%e\t%e\n"%(self.yAxis[1:][i], self.heat_yLine[i],self.talerr_yLine[i]))
+            for i in range(len(heat_yLine)):
+                file.write("%-10i\t%e\t%e\n"%(yAxis[1:][i], heat_yLine[i],talerr_yLine[i]))
             file.close()
 
+        # Empty line scans (all values are 0) are not drawn, but their text exports are still written
+        if lineRange:
+            low, high = lineRange
+        else:
+            heat_yLine = heat[xx-1, :, zz-1]
+            low, high = heat_yLine.min(), heat_yLine.max()
+        empty = low == 0 and high == 0
+        if empty:
+            self.diagnostics.add(tal3, "yLine", "x=%s z=%s%s" % (xx, zz, binLabel(bins)))
+
         if show == True:
-            f3_yLine_plot(self)
-            plt.show()
+            if not empty:
+                f3_yLine_plot(pyplot=True)
+                plt.show()
         else:
             if saveTo: 
-                self.yLine_path=saveTo
+                yLine_path=saveTo
             else:
-                self.yLine_path = self.talliesDir+'/F3/f'+str(self.tal3)+'_plots/yLineScan/'
-
-            self.yLine_file = 'f'+str(self.tal3)+'_yLine_x'+str(self.xx)+'_z'+str(self.zz)
-            if not path.isfile(self.yLine_path+self.yLine_file+'.png'):
-                if not path.exists(self.yLine_path):
-                    makedirs(self.yLine_path)
-                f3_yLine_plot(self)
-                self.fig.savefig(self.yLine_path+self.yLine_file+'.png', bbox_inches='tight')
-                plt.close()
+                yLine_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/yLineScan/'
+
+            yLine_file = 'f'+str(tal3)+binLabel(bins)+'_yLine_x'+str(xx)+'_z'+str(zz)
+            if not empty:
+                self.saveRender(yLine_path+yLine_file+'.png', f3_yLine_plot,
+                                inputs=(sliceStamp(mesh, ("y", xx, zz), lambda: heat[xx-1, :, zz-1]), xAxis, yAxis, zAxis, talval_label, logscale, fontsize,
+                                        yLine_xmin, yLine_xmax, yLine_ymin, yLine_ymax))
             if exportLS:
-                exportLSy(self)
+                makedirs(yLine_path, exist_ok=True)
+                exportLSy(yLine_path, yLine_file)
 
 
-    def f3_zLine(self, show=False, fontsize=12,
+    def f3_zLine(self, tal3, xx, yy, mesh, show=False, bins=None, lineRange=None, fontsize=12,
                  saveTo=None, exportLS=False,
                  talval_label=None, logscale=True,
                  zLine_xmin=None, zLine_xmax=None, 
                  zLine_ymin=None, zLine_ymax=None):
-        
-        def f3_zLine_plot(self):
-            fig, ax = plt.subplots(figsize=(16, 9)) 
-            ax.plot(self.zAxis[1:], self.heat_zLine, "ko", markersize=2.5)
-            ax.set_title('z-axis 1D line distribution between x ='+str(self.xAxis[self.xx])+'cm and y='+str(self.yAxis[self.yy])+'cm\n',
-                        fontsize=fontsize*1.33)
-            ax.set_xlabel('z [cm]', fontsize=fontsize)
-            if talval_label:
-                ax.set_ylabel(talval_label, fontsize=fontsize)
-            else: 
-                ax.set_ylabel('Heat load [MeV/cm³]')
-            if logscale==True:
-                ax.set_yscale('log')
-            ax.set_xlim(xmin=zLine_xmin, xmax=zLine_xmax)
-            ax.set_ylim(ymin=zLine_ymin, ymax=zLine_ymax)    
-            ax.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-            ax.grid()
-            fig.tight_layout()
-            self.fig = fig
-
-        def exportLSz(self):        
-            file=open(self.zLine_path+self.zLine_file, 'w')
+        """ Plots the z-axis line scan of f3 tally tal3 at the x and y bin edges xx and yy.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        lineRange is the (min, max) of the line scan from the statistics index of the mesh (see sliceStatistics), so empty line scans are skipped without reading them.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
+
+        def f3_zLine_plot(pyplot=False):
+            return meshLineFigure("f3", "z", (xx, yy), xAxis, yAxis, zAxis, heat,
+                                  talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                  xlim=(zLine_xmin, zLine_xmax), ylim=(zLine_ymin, zLine_ymax), pyplot=pyplot)
+
+        def exportLSz(zLine_path, zLine_file):
+            # The values are written with the digits of the tally file (see exactMesh)
+            heat, talerr = self.exactMesh(tal3, bins)[3:]
+            heat_zLine = heat[xx-1, yy-1, :]
+            talerr_zLine = talerr[xx-1, yy-1, :]
+            file=open(zLine_path+zLine_file, 'w')
             file.write("y axis bin\ttally value \terror value\n")
-            for i in range(len(self.heat_zLine)):
-                file.write("%-10i\t%e\t%e\n"%(self.zAxis[1:][i], self.heat_zLine[i],self.talerr_zLine[i]))
+            for i in range(len(heat_zLine)):
+                file.write("%-10i\t%e\t%e\n"%(zAxis[1:][i], heat_zLine[i],talerr_zLine[i]))
             file.close()
 
+        # Empty line scans (all values are 0) are not drawn, but their text exports are still written
+        if lineRange:
+            low, high = lineRange
+        else:
+            heat_zLine = heat[xx-1, yy-1, :]
+            low, high = heat_zLine.min(), heat_zLine.max()
+        empty = low == 0 and high == 0
+        if empty:
+            self.diagnostics.add(tal3, "zLine", "x=%s y=%s%s" % (xx, yy, binLabel(bins)))
+
         if show == True:
-            f3_zLine_plot(self)
-            plt.show()
+            if not empty:
+                f3_zLine_plot(pyplot=True)
+                plt.show()
         else:
             if saveTo: 
-                self.zLine_path=saveTo
+                zLine_path=saveTo
             else:
-                self.zLine_path = self.talliesDir+'/F3/f'+str(self.tal3)+'_plots/zLineScan/'
+                zLine_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/zLineScan/'
             
-            self.zLine_file = 'f'+str(self.tal3)+'_zLine_x'+str(self.xx)+'_y'+str(self.yy)
-            if not path.isfile(self.zLine_path+self.zLine_file+'.png'):
-                if not path.exists(self.zLine_path):
-                    makedirs(self.zLine_path)
-                f3_zLine_plot(self)
-                self.fig.savefig(self.zLine_path+self.zLine_file+'.png', bbox_inches='tight')
-                plt.close()
+            zLine_file = 'f'+str(tal3)+binLabel(bins)+'_zLine_x'+str(xx)+'_y'+str(yy)
+            if not empty:
+                self.saveRender(zLine_path+zLine_file+'.png', f3_zLine_plot,
+                                inputs=(sliceStamp(mesh, ("z", xx, yy), lambda: heat[xx-1, yy-1, :]), xAxis, yAxis, zAxis, talval_label, logscale, fontsize,
+                                        zLine_xmin, zLine_xmax, zLine_ymin, zLine_ymax))
             if exportLS:
-                exportLSz(self)
+                makedirs(zLine_path, exist_ok=True)
+                exportLSz(zLine_path, zLine_file)
+            
+
+    def f3_lineFamily(self, tal3, axis, index, mesh, show=False, bins=None, lines=None, errorBands=False,
+                      fontsize=12, saveTo=None, talval_label=None, logscale=True,
+                      xlim=(None, None), ylim=(None, None)):
+        """ Plots all line scans of f3 tally tal3 along axis ("x", "y" or "z") in one figure, at bin edge index of the fixed axis
+        (x and y line scans at one z, z line scans at one y), coloured by the remaining axis (see meshLineFamilyFigure).
+        lines optionally selects the line scans by the bin edge indices of the colouring axis. errorBands adds the relative errors as bands.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
+
+        def f3_lineFamily_plot(pyplot=False):
+            return meshLineFamilyFigure("f3", axis, index, xAxis, yAxis, zAxis, heat,
+                                        talerr=talerr if errorBands else None, lines=lines,
+                                        talval_label=talval_label, logscale=logscale, fontsize=fontsize,
+                                        xlim=xlim, ylim=ylim, pyplot=pyplot)
+
+        if show == True:
+            f3_lineFamily_plot(pyplot=True)
+            plt.show()
+        else:
+            if saveTo:
+                family_path = saveTo
+            else:
+                family_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/'+axis+'LineScan/'
+
+            family_file = 'f'+str(tal3)+binLabel(bins)+'_'+axis+'Lines_'+familyAxes[axis]+str(index)
+            fixed = "xyz".index(familyAxes[axis])
+            self.saveRender(family_path+family_file+'.png', f3_lineFamily_plot,
+                            inputs=(sliceStamp(mesh, (axis, index), lambda: meshPlane(heat, fixed, index-1)),
+                                    sliceStamp(mesh, (axis, index, "errors"), lambda: meshPlane(talerr, fixed, index-1)) if errorBands else None,
+                                    xAxis, yAxis, zAxis, lines, talval_label, logscale, fontsize, xlim, ylim))
+
+    def f3_projections(self, tal3, mesh, show=False, bins=None, methods=("max", "mean", "sum"),
+                       suptitle=None, fontsize=12, dpi=120, saveTo=None,
+                       overlayImg=None, switchAxis=False, cbar_label=None,
+                       vmin=None, vmax=None, fm=1, exact=False, lodMethod='mean'):
+        """ Plots the projections of f3 tally tal3 along x, y and z for every projection method (see meshProjections),
+        i.e. up to 9 summary images instead of one image per mesh bin.
+        mesh is the (xAxis, yAxis, zAxis, heat, talerr) tuple returned by loadMesh.
+        bins is the energy/time bin selection of mesh (see meshTally.selections), which labels the file names.
+        """
+        xAxis, yAxis, zAxis, heat, talerr = mesh
+        if saveTo:
+            proj_path = saveTo
+        else:
+            proj_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/projections'
+
+        def projectionFile(method, axis):
+            return proj_path+'/f'+str(tal3)+binLabel(bins)+'_'+axis+'Proj_'+method+'.png'
+
+        def projectionInputs(method, axis, projection=None):
+            return (sliceStamp(mesh, ("projection", method, axis), lambda: projection), xAxis, yAxis, zAxis, fm, switchAxis,
+                    cbar_label, vmin, vmax, suptitle, fontsize, fileStamp(overlayImg), exact, lodMethod)
+
+        ## 1. Skip the mesh if the images of all its projections are current (checked without reading the mesh, see sliceStamp)
+        if show == False and getattr(mesh, "stamp", None) != None and \
+           all(self.imageCurrent(projectionFile(method, axis), projectionInputs(method, axis), dpi=dpi) for method in methods for axis in "xyz"):
+            return
+
+        ## 2. Compute all projections in a single pass over the mesh
+        projections = meshProjections(heat, methods)
+
+        for (method, axis), projection in projections.items():
+            def f3_projection_plot(pyplot=False):
+                return meshProjectionFigure("f3", method, axis, xAxis, yAxis, zAxis, projection, fm=fm, switchAxis=switchAxis,
+                                            cbar_label=cbar_label, vmin=vmin, vmax=vmax,
+                                            suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg,
+                                            exact=exact, lodMethod=lodMethod, dpi=dpi, pyplot=pyplot)
+
+            ## 3. Either show or save the plot, if a range of values exists
+            if projection.min() != projection.max():
+                if show == True:
+                    f3_projection_plot(pyplot=True)
+                    plt.show()
+                else:
+                    self.saveRender(projectionFile(method, axis), f3_projection_plot, dpi=dpi,
+                                    inputs=projectionInputs(method, axis, projection))
+            else:
+                self.diagnostics.add(tal3, "projection", "%s along %s%s" % (method, axis, binLabel(bins)))
 
     def get_f3x(self, f3Tally=None):
         if f3Tally == None:
@@ -1325,16 +3528,20 @@ class f3Plotter(talliesReader):
                         print(zAxis)
 
                 
+    @imagePipeline
     def plot_f3(self, f3Tally=None,     show=False,    verbose=False, 
                       fontsize=12,      fm=1,          saveTo=None,
+                      workers=1,
 
                       x=None,           y=None,        z=None,
                       xLine=False,      yLine=False,   zLine=False,
                       xCS=False,        yCS=False,     zCS=False,                      
+                      projection=False, hotspots=None, maxError=None,
                     # CS plot settings
                       cbar_label=None,  vmin=None,     vmax=None,
                       xCSdpi=120,       yCSdpi=120,    zCSdpi=120,
                       switchAxis=False, suptitle=None, overlayImg=None, 
+                      exact=False,      lodMethod='mean', sharedScale=False,
                       xCS_ymin=None, xCS_ymax=None,
                       xCS_zmin=None, xCS_zmax=None, 
                       yCS_xmin=None, yCS_xmax=None,
@@ -1343,7 +3550,7 @@ class f3Plotter(talliesReader):
                       zCS_ymin=None, zCS_ymax=None, 
                     # Line plot settings
                       talval_label=None, logscale=True,
-                      exportLS=False,
+                      exportLS=False,   lineFamily=False, errorBands=False,
                       xLine_xmin = None, xLine_xmax = None, 
                       xLine_ymin = None, xLine_ymax = None,
                       yLine_xmin = None, yLine_xmax = None, 
@@ -1354,7 +3561,7 @@ class f3Plotter(talliesReader):
         """ Main function for plotting f3 mesh tallies: 
         Produces heat load distribution plots in 1D line scans and/or 2D cross sections.
         By default, no plots are produced unless the user specifies at least one of the following plot options as "True":
-        xLine, yLine, zLine, xCS, yCS, zCS
+        xLine, yLine, zLine, xCS, yCS, zCS, projection
         
         ARGUMENTS:
         f1Tally: A list that contains f1 tallies that are to be plotted
@@ -1362,6 +3569,7 @@ class f3Plotter(talliesReader):
         verbose: Prints tally details and x, y, and z axis size
         fm     : Performs a similar function as FM cards; multiplies the tally value (talval) by a scalar value
         saveTo : Allows the user to save plots somewhere other than the mctalPath directory.
+        workers: Number of processes that draw and save plots in parallel (see renderPool; not used when show=True).
         x,y,z  : Allows to choose a specific axis bin (otherwise iterates over all axis bins).
         xLine  : Produces 1D line distributions of the x-axis at some y and z points.
         yLine  : Produces 1D line distributions of the y-axis at some x and z points.
@@ -1369,6 +3577,11 @@ class f3Plotter(talliesReader):
         xCS    : Produces 2D mesh distributions on the yz-plane at some x-axis cross-section
         yCS    : Produces 2D mesh distributions on the xz-plane at some y-axis cross-section
         zCS    : Produces 2D mesh distributions on the xy-plane at some z-axis cross-section
+        projection: Produces maximum, mean and summed projections of the mesh along x, y and z (9 summary images per tally),
+                    computed in a single pass over the mesh. A list of methods limits the projections, e.g. projection=["max"].
+        hotspots: Only produces the CS plots and line scans through this number of largest mesh values (see findHotspots),
+                  instead of those at all bins (x, y and z are then ignored).
+        maxError: Hotspots whose relative error is above maxError (e.g. 0.1) are skipped.
         vmin   : Choose a minimum value for the colour bar in 2D plots.
         vmax   : Choose a maximum value for the colour bar in 2D plots.
         switchAxis  : When True, the x and y axis switch places (gets inverted)in CS plots only.
@@ -1378,15 +3591,34 @@ class f3Plotter(talliesReader):
         cbar_label  : For 2D plots, adds a colour bar label
         fontsize    : Sets the font size for the axis labels, and maintains ratios with other fontsizes.
         logscale    : Adjusts the axis scale for line scans only. Logscale is always switched on for CS plots.
+        exportLS    : Exports the line scan data: True (or "text") writes one text file per line scan next to its plot.
+                      "bulk" writes all line scans along each requested axis into one .npz file per axis (see writeLineScans).
+        lineFamily  : When True, xLine, yLine and zLine plot families of line scans instead of one figure per line scan:
+                      all x and y line scans at each z, and all z line scans at each y, coloured by the remaining axis.
+                      A list of bin edge indices of the colouring axis only plots those line scans in every family.
+                      Text exports (exportLS=True) are written per line scan, so they are skipped in this mode; use exportLS="bulk".
+        errorBands  : Adds the relative errors of line-scan families as bands around the lines.
+        exact       : When True, CS plots draw every mesh bin with pcolormesh. By default, level-of-detail (LOD) rendering is used:
+                      slices with more bins than the figure has pixels are block-reduced to the output pixel grid,
+                      and uniform meshes are drawn with imshow.
+        lodMethod   : How bins are merged by LOD rendering: "mean" (default), "max" (keeps peaks visible) or "min".
+        sharedScale : When True, all CS plots of an energy/time bin share one colour scale, from its smallest positive to its largest value
+                      (read from the statistics index of the mesh, see sliceStatistics). vmin and vmax still take precedence.
 
         Pixel density arguments are set by default to xCSdpi = yCSdpi = zCSdpi = 120 dots/inch. 
         This produces 1920x1080 figures because figsize=16x9[inch^2]
         Reducing the dpi could help reduce runtime.
         """
 
-        # 0. Check if a f3 tally exists
+        # 0. Check if there are any f3 tallies
         if self.f3Tallies == []:
             raise FileNotFoundError("This mctal file has no tallies of type f3 to be plotted")
+        if exportLS not in (False, True, "text", "bulk"):
+            raise Warning('\nexportLS must be True (or "text") for one text file per line scan, or "bulk" for one file per axis')
+        textLS = exportLS in (True, "text") and not lineFamily
+        lineLimits = {"x": ((xLine_xmin, xLine_xmax), (xLine_ymin, xLine_ymax)),
+                      "y": ((yLine_xmin, yLine_xmax), (yLine_ymin, yLine_ymax)),
+                      "z": ((zLine_xmin, zLine_xmax), (zLine_ymin, zLine_ymax))}
 
         # 1. Check if user has entered specific f3 tallies.
         if f3Tally == None:
@@ -1401,218 +3633,182 @@ class f3Plotter(talliesReader):
         else:
             pass
 
-        # 2. Iterate over all f3Tallies and only run plotters for user specified tallies.
-        for self.tal3 in self.f3Tallies:
-            if self.tal3 in f3Tally:
-                for tal in self.allTals:
-                    if tal.tallyNumber == self.tal3:
-
-                        tal3 = self.tal3
+        # 2. Iterate over all f3Tallies and only run plotters for user-specified tallies (f3Tally=[]).
+        for tal3 in self.f3Tallies:
+            if tal3 in f3Tally:
 
-                        # 3.1. Obtain the (i,j,k) coordinates using mc-tools' getAxis function.
-                        xAxis = tal.getAxis("i")
-                        yAxis = tal.getAxis("j")
-                        zAxis = tal.getAxis("k")
+                # 3. Obtain the (i,j,k) coordinates and the N-D tally values and errors (see loadMeshTally).
+                meshes = self.loadMeshTally(tal3)
+                xAxis, yAxis, zAxis, heat, talerr = meshes.mesh()
+
+                xi = xAxis[0]
+                xf = xAxis[-1]
+                dx = (xf-xi)/(len(xAxis)-1)
+
+                yi = yAxis[0]
+                yf = yAxis[-1]
+                dy = (yf-yi)/(len(yAxis)-1)
+
+                zi = zAxis[0]
+                zf = zAxis[-1]
+                dz = (zf-zi)/(len(zAxis)-1)
+
+                # 4. Print tally size and heat details
+                if verbose:
+                    print("\n=================== Tally "+str(tal3)+" ====================\n")
+                    print("\nAxis \t initial point \t final point \t step \t bins")
+                    print("______________________________________________________")
+                    print("x \t %-15.2f %-15.2f %-7i %-8i" % (xi, xf, dx, len(xAxis)) )
+                    print("y \t %-15.2f %-15.2f %-7i %-8i" % (yi, yf, dy, len(yAxis)) )
+                    print("z \t %-15.2f %-15.2f %-7i %-8i" % (zi, zf, dz, len(zAxis)) )
+                    print('\nTally '+str(tal3)+' has length '+f"{meshes.values.size:,}"+' and shape '+str(heat.shape), "\n")
+                    for a in meshes.extraAxes():
+                        print('Tally '+str(tal3)+' has '+str(meshes.shape[a])+' '+a+' bins, which are plotted separately')
+                    print("\n")
+
+                # 5. If user specifies x,y, or z --> check that the given values correspond to existing axis values.
+                if not x == None:
+                    if x not in xAxis:
+                        raise Warning("\nThe given x value must be equal to one of the existing x-axis bins.\nCheck x-axis bins using get_f3x()")
+                if not y == None:
+                    if y not in yAxis:
+                        raise Warning("\nThe given y value must be equal to one of the existing y-axis bins.\nCheck y-axis bins using get_f3y()")
+                if not z == None:
+                    if z not in zAxis:
+                        raise Warning("\nThe given z value must be equal to one of the existing z-axis bins.\nCheck z-axis bins using get_f3z()")
+
+                # 6. List the plots at the user-specified x, y, and z bins (all bins by default),
+                #    or only the plots through the hotspots of the mesh.
+                if hotspots:
+                    hot = [index for index, _, _ in findHotspots(heat, talerr, hotspots, maxError)]
+                    units = hotspotWorkUnits(hot, xCS=xCS, yCS=yCS, zCS=zCS,
+                                             xLine=xLine, yLine=yLine, zLine=zLine, lineFamily=bool(lineFamily))
+                else:
+                    units = meshWorkUnits(meshIndices(xAxis, x), meshIndices(yAxis, y), meshIndices(zAxis, z),
+                                          xCS=xCS, yCS=yCS, zCS=zCS,
+                                          xLine=xLine, yLine=yLine, zLine=zLine, lineFamily=bool(lineFamily))
+
+                    # 6.1. Order the plots of each kind by importance (largest sum of values first, see sliceStatistics.rank),
+                    #      so that interrupted or budgeted runs have produced the plots that matter most
+                    units = meshes.stats.rank(units)
+
+                # 7. Export all line scans along each requested axis in bulk (one file per axis instead of one per line scan).
+                if exportLS == "bulk" and not show:
+                    for axis, line in zip("xyz", (xLine, yLine, zLine)):
+                        if line:
+                            if saveTo:
+                                lines_path = saveTo
+                            else:
+                                lines_path = self.talliesDir+'/F3/f'+str(tal3)+'_plots/'+axis+'LineScan/'
+                            makedirs(lines_path, exist_ok=True)
+                            for bins in meshes.selections():
+                                writeLineScans(lines_path+'f'+str(tal3)+binLabel(bins)+'_'+axis+'Lines.npz', axis, *meshes.mesh(**bins))
+
+                # 8. Produce summary projections along x, y and z (a few images instead of one per mesh bin)
+                if projection:
+                    methods = ("max", "mean", "sum") if projection == True else projection
+                    if self.progress:
+                        self.progress.expect(tal3, "projection", len(meshes.selections()))
+                    for bins in meshes.selections():
+                        self.f3_projections(tal3, meshes.mesh(**bins), show=show, bins=bins, methods=methods,
+                                            saveTo=saveTo, fm=fm, vmin=vmin, vmax=vmax,
+                                            exact=exact, lodMethod=lodMethod,
+                                            switchAxis=switchAxis, cbar_label=cbar_label,
+                                            suptitle=suptitle, fontsize=fontsize, overlayImg=overlayImg)
+                        if self.progress:
+                            self.progress.done(tal3, "projection")
+
+                # 9. Produce plots as per user request
+                def f3Unit(bins, unit):
+                    mesh = meshes.mesh(**bins)
+                    plot, indices = unit
+
+                    # CS planes are checked (and scaled with sharedScale) with the statistics index of the mesh instead of the mesh itself
+                    low, high = vmin, vmax
+                    if sharedScale:
+                        limits = [None if limit == None else limit*fm for limit in meshes.stats.limits(bins)]
+                        low  = vmin if vmin != None else limits[0]
+                        high = vmax if vmax != None else limits[1]
+                    planeRange = meshes.stats.planeRange(plot[0], indices[0], bins) if plot.endswith("CS") else None
+                    lineRange  = meshes.stats.lineRange(plot[0], indices, bins) if plot.endswith("Line") else None
+                    if plot == "xCS":
+                        self.f3_xCS(tal3, *indices, mesh, show=show, bins=bins, planeRange=planeRange, saveTo=saveTo,
+                                    xCSdpi=xCSdpi,
+                                    vmin=low, vmax=high, fm=fm,
+                                    exact=exact, lodMethod=lodMethod,
+                                    xCS_ymin=xCS_ymin,
+                                    xCS_ymax=xCS_ymax,
+                                    xCS_zmin=xCS_zmin, 
+                                    xCS_zmax=xCS_zmax,
+                                    switchAxis=switchAxis, 
+                                    cbar_label=cbar_label,
+                                    suptitle=suptitle, 
+                                    fontsize=fontsize,
+                                    overlayImg=overlayImg)
+                    elif plot == "yCS":
+                        self.f3_yCS(tal3, *indices, mesh, show=show, bins=bins, planeRange=planeRange, saveTo=saveTo,
+                                    yCSdpi=yCSdpi, 
+                                    vmin=low, vmax=high, fm=fm,
+                                    exact=exact, lodMethod=lodMethod,
+                                    yCS_xmin=yCS_xmin,
+                                    yCS_xmax=yCS_xmax,
+                                    yCS_zmin=yCS_zmin, 
+                                    yCS_zmax=yCS_zmax,
+                                    switchAxis=switchAxis, 
+                                    cbar_label=cbar_label,
+                                    suptitle=suptitle, 
+                                    fontsize=fontsize,
+                                    overlayImg=overlayImg)
+                    elif plot == "zCS":
+                        self.f3_zCS(tal3, *indices, mesh, show=show, bins=bins, planeRange=planeRange, saveTo=saveTo,
+                                    zCSdpi=zCSdpi,
+                                    vmin=low, vmax=high, fm=fm,
+                                    exact=exact, lodMethod=lodMethod,
+                                    zCS_xmin=zCS_xmin,
+                                    zCS_xmax=zCS_xmax,
+                                    zCS_ymin=zCS_ymin, 
+                                    zCS_ymax=zCS_ymax,
+                                    switchAxis=switchAxis, 
+                                    cbar_label=cbar_label,
+                                    suptitle=suptitle, 
+                                    fontsize=fontsize,
+                                    overlayImg=overlayImg)
+                    elif plot == "xLine":
+                        self.f3_xLine(tal3, *indices, mesh, show=show, bins=bins, lineRange=lineRange, saveTo=saveTo,
+                                      talval_label=talval_label,
+                                      exportLS=textLS,
+                                      fontsize=fontsize, logscale=logscale,
+                                      xLine_xmin=xLine_xmin, xLine_xmax=xLine_xmax,
+                                      xLine_ymin=xLine_ymin, xLine_ymax=xLine_ymax)
+                    elif plot == "yLine":
+                        self.f3_yLine(tal3, *indices, mesh, show=show, bins=bins, lineRange=lineRange, saveTo=saveTo,
+                                      talval_label=talval_label, 
+                                      exportLS=textLS,
+                                      fontsize=fontsize, logscale=logscale,
+                                      yLine_xmin=yLine_xmin, yLine_xmax=yLine_xmax,
+                                      yLine_ymin=yLine_ymin, yLine_ymax=yLine_ymax)
+                    elif plot == "zLine":
+                        self.f3_zLine(tal3, *indices, mesh, show=show, bins=bins, lineRange=lineRange, saveTo=saveTo,
+                                      talval_label=talval_label,
+                                      exportLS=textLS,
+                                      fontsize=fontsize, logscale=logscale,
+                                      zLine_xmin=zLine_xmin, zLine_xmax=zLine_xmax,
+                                      zLine_ymin=zLine_ymin, zLine_ymax=zLine_ymax)
+                    elif plot in ("xFamily", "yFamily", "zFamily"):
+                        axis = plot[0]
+                        self.f3_lineFamily(tal3, axis, *indices, mesh, show=show, bins=bins, saveTo=saveTo,
+                                           lines=None if lineFamily == True else lineFamily,
+                                           errorBands=errorBands,
+                                           talval_label=talval_label,
+                                           fontsize=fontsize, logscale=logscale,
+                                           xlim=lineLimits[axis][0], ylim=lineLimits[axis][1])
+
+                # 9.1. Plots are produced for every energy/time bin. With workers > 1, saved plots are drawn in parallel by worker processes.
+                self.runUnits(tal3, f3Unit, meshes.selections(), units, workers=workers if show == False else 1)
+
+                # 10. Log the skipped plots of the tally as summaries (see diagnosticCounter)
+                self.diagnostics.summarize(tal3)
 
-                        xi = xAxis[0]
-                        xf = xAxis[-1]
-                        dx = (xf-xi)/(len(xAxis)-1)
-
-                        yi = yAxis[0]
-                        yf = yAxis[-1]
-                        dy = (yf-yi)/(len(yAxis)-1)
-
-                        zi = zAxis[0]
-                        zf = zAxis[-1]
-                        dz = (zf-zi)/(len(zAxis)-1)
-
-                        # 3.2. create meshgrids for x, y, and z cross sections (CS)
-                        zCS_x , zCS_y = np.meshgrid(xAxis,yAxis)  # To pronounce "zCS_x": x axis at fixed z CS
-                        yCS_x , yCS_z = np.meshgrid(xAxis,zAxis)
-                        xCS_y , xCS_z = np.meshgrid(yAxis,zAxis)
-
-                        # 4.1. Extract heat from f3 tally file
-                        file = self.talliesDir+'/F%s/' %str(tal3)[-1] +'f'+str(tal3)
-                        with open(file) as f:
-                            heat = []
-                            talerr = []
-                            for line in f:
-                                parts = [float(i) for i in line.split()]
-                                heat.append(parts[2])
-                                talerr.append(parts[3])
-                        
-                        # 4.2. Reshape the heat array to match the x,y,z shape.
-                        heat = np.array(heat)
-                        heat2 = heat.reshape(len(xAxis)-1, len(yAxis)-1, len(zAxis)-1)
-                        talerr = np.array(talerr)
-                        talerr2 = talerr.reshape(len(xAxis)-1, len(yAxis)-1, len(zAxis)-1)
-                        
-                        # 5. Print tally size and heat details
-                        if verbose:
-                            print("\n=================== Tally "+str(tal3)+" ====================\n")
-                            print("\nAxis \t initial point \t final point \t step \t bins")
-                            print("______________________________________________________")
-                            print("x \t %-15.2f %-15.2f %-7i %-8i" % (xi, xf, dx, len(xAxis)) )
-                            print("y \t %-15.2f %-15.2f %-7i %-8i" % (yi, yf, dy, len(yAxis)) )
-                            print("z \t %-15.2f %-15.2f %-7i %-8i" % (zi, zf, dz, len(zAxis)) )
-                            print('\nTally '+str(tal3)+' has length '+f"{len(heat):,}"+' and shape '+str(heat2.shape), "\n\n")
-                        
-                        # 6. Obtain the 2D planer heat load distribution at points x, y, and z.
-                        for self.xx in range(len(xAxis)):
-                            for self.yy in range(len(yAxis)):
-                                for self.zz in range(len(zAxis)):
-
-                                    # 6.1. 2D cross-sectional heat load distribution
-                                    heat_yz = heat2[ (self.xx-1) ,       :      ,       :      ]
-                                    heat_xz = heat2[      :      ,  (self.yy-1) ,       :      ]
-                                    heat_xy = heat2[      :      ,       :      ,  (self.zz-1) ]
-                                    heat_yz = heat_yz.transpose()
-                                    heat_xz = heat_xz.transpose()
-                                    heat_xy = heat_xy.transpose()
-
-                                    talerr_yz = talerr2[ (self.xx-1) ,       :      ,       :      ]
-                                    talerr_xz = talerr2[      :      ,  (self.yy-1) ,       :      ]
-                                    talerr_xy = talerr2[      :      ,       :      ,  (self.zz-1) ]
-                                    talerr_yz = talerr_yz.transpose()
-                                    talerr_xz = talerr_xz.transpose()
-                                    talerr_xy = talerr_xy.transpose()
-
-                                    # 6.2. 1D linear heat load distributions
-                                    self.heat_xLine = heat_xz[self.zz-1,     :   ]
-                                    self.heat_yLine = heat_xy[    :    , self.xx-1]
-                                    self.heat_zLine = heat_yz[    :    , self.yy-1]
-
-                                    self.talerr_xLine = talerr_xz[self.zz-1,     :   ]
-                                    self.talerr_yLine = talerr_xy[    :    ,self.xx-1]
-                                    self.talerr_zLine = talerr_yz[    :    ,self.yy-1]
-
-                                    # 6.3. PAss variable to class scope
-                                    self.xAxis = xAxis
-                                    self.yAxis = yAxis
-                                    self.zAxis = zAxis
-                                    self.xCS_y = xCS_y
-                                    self.xCS_z = xCS_z
-                                    self.yCS_x = yCS_x
-                                    self.yCS_z = yCS_z
-                                    self.zCS_x = zCS_x
-                                    self.zCS_y = zCS_y
-                                    self.heat_yz = heat_yz
-                                    self.heat_xz = heat_xz
-                                    self.heat_xy = heat_xy
-                                    self.talerr_yz = talerr_yz
-                                    self.talerr_xz = talerr_xz
-                                    self.talerr_xy = talerr_xy
-
-                                    # 7. Produce plots as per user request
-                                    def f3ArgsChecker(self):
-                                        if xCS:
-                                            self.f3_xCS(show=show, saveTo=saveTo,
-                                                        xCSdpi=xCSdpi,
-                                                        vmin=vmin, vmax=vmax, fm=fm,
-                                                        xCS_ymin=xCS_ymin,
-                                                        xCS_ymax=xCS_ymax,
-                                                        xCS_zmin=xCS_zmin, 
-                                                        xCS_zmax=xCS_zmax,
-                                                        switchAxis=switchAxis, 
-                                                        cbar_label=cbar_label,
-                                                        suptitle=suptitle, 
-                                                        fontsize=fontsize,
-                                                        overlayImg=overlayImg)
-                                        if yCS:
-                                            self.f3_yCS(show=show, saveTo=saveTo,
-                                                        yCSdpi=yCSdpi, 
-                                                        vmin=vmin, vmax=vmax, fm=fm,
-                                                        yCS_xmin=yCS_xmin,
-                                                        yCS_xmax=yCS_xmax,
-                                                        yCS_zmin=yCS_zmin, 
-                                                        yCS_zmax=yCS_zmax,
-                                                        switchAxis=switchAxis, 
-                                                        cbar_label=cbar_label,
-                                                        suptitle=suptitle, 
-                                                        fontsize=fontsize,
-                                                        overlayImg=overlayImg)
-                                        if zCS:
-                                            self.f3_zCS(show=show, saveTo=saveTo,
-                                                        zCSdpi=zCSdpi,
-                                                        vmin=vmin, vmax=vmax, fm=fm,
-                                                        zCS_xmin=zCS_xmin,
-                                                        zCS_xmax=zCS_xmax,
-                                                        zCS_ymin=zCS_ymin, 
-                                                        zCS_ymax=zCS_ymax,
-                                                        switchAxis=switchAxis, 
-                                                        cbar_label=cbar_label,
-                                                        suptitle=suptitle, 
-                                                        fontsize=fontsize,
-                                                        overlayImg=overlayImg)
-                                        if xLine:
-                                            self.f3_xLine(show=show, saveTo=saveTo,
-                                                          talval_label=talval_label,
-                                                          exportLS=exportLS,
-                                                          fontsize=fontsize, logscale=logscale,
-                                                          xLine_xmin=xLine_xmin, xLine_xmax=xLine_xmax,
-                                                          xLine_ymin=xLine_ymin, xLine_ymax=xLine_ymax)
-                                        if yLine:
-                                            self.f3_yLine(show=show, saveTo=saveTo,
-                                                          talval_label=talval_label, 
-                                                          exportLS=exportLS,
-                                                          fontsize=fontsize, logscale=logscale,
-                                                          yLine_xmin=yLine_xmin, yLine_xmax=yLine_xmax,
-                                                          yLine_ymin=yLine_ymin, yLine_ymax=yLine_ymax)
-                                        if zLine:
-                                            self.f3_zLine(show=show, saveTo=saveTo,
-                                                          talval_label=talval_label,
-                                                          exportLS=exportLS,
-                                                          fontsize=fontsize, logscale=logscale,
-                                                          zLine_xmin=zLine_xmin, zLine_xmax=zLine_xmax,
-                                                          zLine_ymin=zLine_ymin, zLine_ymax=zLine_ymax)
-
-                                    # 7.1. If user specifies x,y, or z --> check that the given values correspond to existing axis values.
-                                    if not x == None:
-                                        if x not in xAxis:
-                                            raise Warning("\nThe given x value must be equal to one of the existing x-axis bins.\nCheck x-axis bins using get_f3x()")
-                                    if not y == None:
-                                        if y not in yAxis:
-                                            raise Warning("\nThe given y value must be equal to one of the existing y-axis bins.\nCheck y-axis bins using get_f3y()")
-                                    if not z == None:
-                                        if z not in zAxis:
-                                            raise Warning("\nThe given z value must be equal to one of the existing z-axis bins.\nCheck z-axis bins using get_f3z()")
-
-                                    # 7.2. We ignore the first point (Fencepost: We get 1 heat value between 2 bins)
-                                    if xAxis[self.xx] != xAxis[0]:
-                                        if yAxis[self.yy] != yAxis[0]:
-                                            if zAxis[self.zz] != zAxis[0]:
-
-                                                # 7.3. If user inputs x,y, and z --> only produce plots at these x,y, and z
-                                                if not x == None and not y == None and not z == None:
-                                                    if x == xAxis[self.xx] and y == yAxis[self.yy] and z == zAxis[self.zz]:
-                                                        f3ArgsChecker(self)
-                                                
-                                                elif not x == None and not y == None:
-                                                    if x == xAxis[self.xx] and y == yAxis[self.yy]:
-                                                        f3ArgsChecker(self)
-
-                                                elif not x == None and not z == None:
-                                                    if x == xAxis[self.xx] and z == zAxis[self.zz]:
-                                                        f3ArgsChecker(self)
-
-                                                elif not z == None and not y == None:
-                                                    if z == zAxis[self.zz] and y == yAxis[self.yy]:
-                                                        f3ArgsChecker(self)
-
-                                                elif not x == None:
-                                                    if x == xAxis[self.xx]:
-                                                        f3ArgsChecker(self)
-                                                
-                                                elif not y == None:
-                                                    if y == yAxis[self.yy]:
-                                                        f3ArgsChecker(self)
-
-                                                elif not z == None:
-                                                    if z == zAxis[self.zz]:
-                                                        f3ArgsChecker(self)
-
-                                                else:
-                                                    f3ArgsChecker(self)
         if verbose:
             print('\n=====================\n    f3 completed\n=====================')
 
@@ -1625,69 +3821,52 @@ class f4Plotter(talliesReader):
     F4 tally could also contain bins for time (t) and cosine (c), but these bins are currently not supported.
     """ 
 
-    def f4E_plots(self, show=False, fontsize=12,
+    def f4E_plots(self, tal4, n, erg, flxE, show=False, fontsize=12,
                     E_xmin=None, E_xmax=None, 
                     E_ymin=None, E_ymax=None):
-        """ Plots the neutron flux [n/cm2-s] vs the neutron's energy [MeV]
+        """ Plots the neutron flux [n/cm2-s] of cell n of tally tal4 vs the neutron's energy [MeV]
 
         To set the x-axis min and max energy values, use E_xmin and E_xmax
         To set the y-axis min and max flux values, use E_ymin and E_ymax 
         """ 
-        fig, axE = plt.subplots(figsize=(16,9))
-        axE.plot(self.erg,self.flxE, 'ko', markersize=3)
-        plt.suptitle("Flux averaged over cell %i" %(self.n), fontsize=fontsize*1.4)
-        axE.set_title("per energy [MeV]", fontsize=fontsize*1.2)
-        axE.set_xlabel("Neutron energy [MeV]", fontsize=fontsize)
-        axE.set_ylabel("Neutron flux [n/cm2-s]", fontsize=fontsize)
-        axE.set_xlim(xmin = E_xmin, xmax = E_xmax)
-        axE.set_ylim(ymin = E_ymin, ymax = E_ymax)
-        axE.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-        axE.xaxis.offsetText.set_fontsize(fontsize*0.85)
-        axE.yaxis.offsetText.set_fontsize(fontsize*0.85)
-        axE.grid()
+        fig = renderF4(erg, flxE, n, "E", fontsize=fontsize, 
+                       xlim=(E_xmin, E_xmax), ylim=(E_ymin, E_ymax), pyplot=show)
 
         if show == True:
             plt.show()
         else:
-            if not path.exists(self.talliesDir+'/F4/f4_plots'):
-                makedirs(self.talliesDir+'/F4/f4_plots') 
-            fig.savefig(self.talliesDir+'/F4/f4_plots/Cell'+str(self.n)+'_Energy.png',
-                        bbox_inches='tight', dpi=200)
-            plt.close()
+            if self.archive == None:
+                makedirs(self.talliesDir+'/F4/f4_plots', exist_ok=True)
+            saveFigure(fig, self.talliesDir+'/F4/f4_plots/'+self.f4Name(tal4, n)+'_Energy.png', dpi=200, writer=self.writer, archive=self.archive, written=self.wroteImage)
 
 
-    def f4W_plots(self, show=False, fontsize=12,
+    def f4W_plots(self, tal4, n, wave, flxW, show=False, fontsize=12,
                     W_xmin=None, W_xmax=None, 
                     W_ymin=None, W_ymax=None):
-        """ Plots the neutron flux [n/cm2-s] vs the neutron's wavelength [Angstrom = 1e-10]
+        """ Plots the neutron flux [n/cm2-s] of cell n of tally tal4 vs the neutron's wavelength [Angstrom = 1e-10]
         
         To set the x-axis min and max wavelength values, use W_xmin and W_xmax
         To set the y-axis min and max flux values, use W_ymin and W_ymax
         """
-        
-        fig, axW = plt.subplots(figsize=(16,9))
-        axW.plot(self.wave,self.flxW, 'ko', markersize=3)
-        plt.suptitle("Flux averaged over cell %i" %(self.n), fontsize=fontsize*1.5)
-        axW.set_title("per wavelength [Å]", fontsize=fontsize*1.33)
-        axW.set_xlabel("Neutron wavelength [Å]", fontsize=fontsize)
-        axW.set_ylabel("Neutron flux [n/cm2-s]", fontsize=fontsize)
-        axW.set_xlim(xmin = W_xmin, xmax = W_xmax)
-        axW.set_ylim(ymin = W_ymin, ymax = W_ymax)
-        axW.tick_params(axis='both', which='major', labelsize=fontsize*0.85)
-        axW.xaxis.offsetText.set_fontsize(fontsize*0.85)
-        axW.yaxis.offsetText.set_fontsize(fontsize*0.85)
-        axW.grid()
+        fig = renderF4(wave, flxW, n, "W", fontsize=fontsize, 
+                       xlim=(W_xmin, W_xmax), ylim=(W_ymin, W_ymax), pyplot=show)
 
         if show == True:
             plt.show()
         else:
-            if not path.exists(self.talliesDir+'/F4/f4_plots'):
-                makedirs(self.talliesDir+'/F4/f4_plots')     
-            fig.savefig(self.talliesDir+'/F4/f4_plots/Cell'+str(self.n)+'_Wavelength.png',
-                        bbox_inches='tight', dpi=200)  
-            plt.close()                          
+            if self.archive == None:
+                makedirs(self.talliesDir+'/F4/f4_plots', exist_ok=True)
+            saveFigure(fig, self.talliesDir+'/F4/f4_plots/'+self.f4Name(tal4, n)+'_Wavelength.png', dpi=200, writer=self.writer, archive=self.archive, written=self.wroteImage)
+
+
+    def f4Name(self, tal4, n):
+        """ Returns the plot name of cell n of tally tal4: Cell<n>, prefixed by f<tal4>_ when the mctal file has several f4 tallies."""
+        if len(self.f4Tallies) == 1:
+            return 'Cell'+str(n)
+        return 'f'+str(tal4)+'_Cell'+str(n)
                 
     
+    @imagePipeline
     def plot_f4(self, x_axis="both", show=False, fontsize=12,
            E_xmin=0, E_xmax=None, E_ymin=0, E_ymax=None, 
            W_xmin=0, W_xmax=None, W_ymin=0, W_ymax=None):
@@ -1698,95 +3877,38 @@ class f4Plotter(talliesReader):
         To plot the wavelength only, use x_axis="W"
         """
 
-        # Defines constants for energy to wavelength conversion.
-        # Constant                  Unit           Description
-        h = 6.62607015e-34          # [kg-m^2/s]    Plank's constant
-        m = 1.674927498e-27         # [kg]          Mass of neutron
-        j = 1.60217733e-13          # [kg-m^2/s^2]  Mev to J conversion operator
-        C = h*1e10/np.sqrt(2*m*j)   # [Å]           Combining constants into C
-
         # Check if f4 tally exists
         if self.f4Tallies == []:
             raise FileNotFoundError("This mctal file has no tallies of type f4 to be plotted")
 
-        # Creates energy and flux dictionaries containing lists of energy and flux bins
+        if x_axis not in ("both", "E", "W"):
+            raise Warning(
+                "\nPlease specify the x_axis as either energy (E) or wavelength (W)."+
+                "\nTo produce both E and W plots, use x_axis='both'")
+
         for tal4 in self.f4Tallies:
-            for tal in self.allTals:
-                if tal.tallyNumber == tal4:            
-
-                    file = self.talliesDir+'/F%s/' %str(tal4)[-1] +'f'+str(tal4)
-
-                    with open(file) as f:
-                        cell = 0
-                        ergDict = {}
-                        flxDict = {}
-                        E = "ebin{}".format(cell)
-                        F = "fbin{}".format(cell)
-                        ergDict[E] = []
-                        flxDict[F] = []
-                        
-                        for line in f:
-                            parts = [float(i) for i in line.split()]     
-                            
-                            if parts[0] == cell:
-                                ergDict[E].append(parts[1])
-                                flxDict[F].append(parts[2])
-                            else:
-                                cell+=1
-                                E = "ebin{}".format(cell)
-                                F = "fbin{}".format(cell)
-                                ergDict[E] = []
-                                flxDict[F] = []
-                                ergDict[E].append(parts[1])
-                                flxDict[F].append(parts[2])  
- 
-        # Iterates over cells
-        for self.n in range(cell+1):
-            n = self.n
-            erg  = ergDict["ebin{}".format(n)]
-            flxE = flxDict["fbin{}".format(n)]
-
-            # Calculates the difference between energy points
-            ergDict["dE{}".format(n)] = [ (erg[i+1] - erg[i] ) for i in range(len(erg)-1)]
-
-            # Removes the first bins to avoid "divide by zero" error
-            if erg[0] == 0:    # Justification: By Default, MCNP does not support a lower boundary neutron energy cutoff. 
-                erg.remove(0)  # Meaning, even when the user defines a min_E_boundary, MCNP will still tally between E=0 and min_E_boundary.
-                flxE.remove(0) # It is assumed that the user is not interested in the "remaining" tallies under the min_E_bin
-
-            # Calculates the wavelength
-            ergDict["wbin{}".format(n)] = [C/np.sqrt(i) for i in erg ]
-            wave = ergDict["wbin{}".format(n)]
-
-            # Calculates the difference between wavelength points
-            ergDict["dW{}".format(n)] = [ (wave[i+1] - wave[i] ) for i in range(len(wave)-1) ]
-            ergDict["dW{}".format(n)].append(ergDict["dW{}".format(n)][-1])
-            
-            dE = ergDict["dE{}".format(n)] 
-            dW = ergDict["dW{}".format(n)]
-
-            # Normalises the neutron flux to wavelength
-            flxDict["fWbin{}".format(n)] = [ flxE[i]*(-dE[i]/dW[i]) for i in range(len(erg)) ]
-            flxW = flxDict["fWbin{}".format(n)]
-
-            # Sets variables to class scope
-            self.erg  = erg
-            self.wave = wave
-            self.flxE = flxE
-            self.flxW = flxW
-
-            # Produces plots given user inputs
-            if x_axis == "both":
-                self.f4E_plots(show, fontsize, E_xmin, E_xmax, E_ymin, E_ymax)
-                self.f4W_plots(show, fontsize, W_xmin, W_xmax, W_ymin, W_ymax)
-            elif x_axis == "E":
-                self.f4E_plots(show, fontsize, E_xmin, E_xmax, E_ymin, E_ymax)
-            elif x_axis == "W":
-                self.f4W_plots(show, fontsize, W_xmin, W_xmax, W_ymin, W_ymax)
-            else:
-                raise Warning(
-                    "\nPlease specify the x_axis as either energy (E) or wavelength (W)."+
-                    "\nTo produce both E and W plots, use x_axis='both'")
+            # Reads the [cell, erg, val, err] columns of the tally file
+            data = self.loadTally(tal4)
+
+            # Iterates over cells
+            cells = np.unique(data[:,0]).astype(int)
+            if self.progress:
+                self.progress.expect(tal4, "f4", len(cells)*(2 if x_axis == "both" else 1))
+            for n in cells:
+                rows = data[data[:,0] == n]
+
+                # Removes the E=0 bin and normalises the neutron flux to wavelength
+                erg, flxE, wave, flxW = f4Wavelength(rows[:,1], rows[:,2])
+
+                # Produces plots given user inputs
+                if x_axis in ("both", "E"):
+                    self.f4E_plots(tal4, n, erg, flxE, show, fontsize, E_xmin, E_xmax, E_ymin, E_ymax)
+                    if self.progress:
+                        self.progress.done(tal4, "f4")
+                if x_axis in ("both", "W"):
+                    self.f4W_plots(tal4, n, wave, flxW, show, fontsize, W_xmin, W_xmax, W_ymin, W_ymax)
+                    if self.progress:
+                        self.progress.done(tal4, "f4")
 
         #print('\n===================\n   f4 completed\n===================')
 
@@ -1795,6 +3917,7 @@ class f6Plotter(talliesReader):
     """ This class plots a bar graph of the cells' averaged energy deposition (for all f6 tallies).
         Plots are saved in ./tallies/F6/plots/
         """
+    @imagePipeline
     def plot_f6(self, f6Tally=None, show=False, fontsize=12, 
         nototal=False, ymin=None, ymax=None, cells=None):
         """Plots all F6 tallies as a bar graph.
@@ -1818,20 +3941,20 @@ class f6Plotter(talliesReader):
         else:
             pass
 
+        if self.progress:
+            for tal6 in f6Tally:
+                self.progress.expect(tal6, "f6", 1)
         for tal6 in self.f6Tallies:
             if tal6 in f6Tally:
                 for tal in self.allTals:
                     if tal.tallyNumber == tal6:
-                        file = self.talliesDir+'/F%s/' %str(tal6)[-1] +'f'+str(tal6)
                         cell = []
                         erg  = []
                         err  = []
-                        with open(file) as f:
-                            for line in f:
-                                parts = [float(i) for i in line.split()]
-                                cell.append(parts[0])
-                                erg.append(parts[2])
-                                err.append(parts[3]*parts[2])
+                        for parts in self.loadTally(tal6):
+                            cell.append(parts[0])
+                            erg.append(parts[2])
+                            err.append(parts[3]*parts[2])
 
                         if len(cell) >= 1:
                             cell = [int(tal.cells[i]) for i in range(len(cell))]
@@ -1879,132 +4002,1417 @@ class f6Plotter(talliesReader):
                                 y = erg
 
                         # plot the bar graph
-                        fig, ax = plt.subplots(figsize=(10, 5))
-                        ax.bar(x,y, yerr=err, align='center', color='black', alpha=0.6, ecolor='black', capsize=80/len(cell), width=2/len(cell))
-                        ax.set_title("Energy deposition averaged over cell", fontsize=fontsize*1.4)
-                        ax.set_xlabel("Cells", fontsize=fontsize*1.2)
-                        ax.set_ylabel("Average energy deposited [MeV/g]", fontsize=fontsize*1.2)
-                        ax.set_xticks(range(len(x)))
-                        ax.set_xticklabels(x, fontsize=fontsize)
-                        ax.tick_params(axis='y', which='major', labelsize=fontsize)
-                        ax.set_ylim([ymin, ymax])
-                        ax.yaxis.grid(True)
-                        plt.suptitle(f"Tally f{str(tal6)}", fontsize=fontsize*1.5, horizontalalignment='center')
+                        fig = renderF6(x, y, err, tal6, fontsize=fontsize, ymin=ymin, ymax=ymax, 
+                                       nBars=len(cell), pyplot=show)
 
                         if show == True:
                             plt.show()
                         else:
-                            if not path.exists(self.talliesDir+'/F6/f6_plots'):
-                                makedirs(self.talliesDir+'/F6/f6_plots')     
-                            fig.savefig(self.talliesDir+'/F6/f6_plots/tally'+str(tal6)+'.png', 
-                                        bbox_inches='tight', dpi=200)
-                            plt.close()
+                            if self.archive == None:
+                                makedirs(self.talliesDir+'/F6/f6_plots', exist_ok=True)
+                            saveFigure(fig, self.talliesDir+'/F6/f6_plots/tally'+str(tal6)+'.png', dpi=200, writer=self.writer, archive=self.archive, written=self.wroteImage)
+                        if self.progress:
+                            self.progress.done(tal6, "f6")
+
+
+class meshExporter(talliesReader):
+    """ This class exports f1 and f3 mesh tallies for interactive browsing and external viewers.
+    Exports are saved next to the tally files, e.g. in ./tallies/F1/f1_tiles/
+    """
+
+    def export_lines(self, meshTally=None, axes="xyz", saveTo=None, verbose=False):
+        """ Writes all line scans of f1/f3 mesh tallies in bulk: one .npz file per tally and axis (see writeLineScans),
+        instead of one text file per line scan. No plots are produced.
+
+        Files are saved as ./tallies/F1/f1_plots/xLineScan/f1_xLines.npz, next to the line scan plots of plot_f1/plot_f3.
+        Tallies with energy/time bins get one file per bin, e.g. f1_e2_xLines.npz (see meshTally.selections).
+
+        ARGUMENTS:
+        meshTally: A list that contains the f1/f3 tallies to be exported (all f1 and f3 tallies by default)
+        axes     : The line scan axes to be exported, e.g. "xyz" (default) or "z"
+        saveTo   : Allows the user to save the files somewhere other than the mctalPath directory
+        verbose  : Prints the path of every file written
+        """
+        if not set(axes) <= set("xyz"):
+            raise Warning("\naxes must only contain x, y and z")
 
+        for tally in self.checkMeshTallies(meshTally):
+            meshes = self.loadMeshTally(tally)
+            for axis in axes:
+                if saveTo:
+                    lines_path = saveTo
+                else:
+                    lines_path = self.talliesDir+'/F%s/' %str(tally)[-1] +'f'+str(tally)+'_plots/'+axis+'LineScan/'
+                makedirs(lines_path, exist_ok=True)
+                for bins in meshes.selections():
+                    lines_file = lines_path+'f'+str(tally)+binLabel(bins)+'_'+axis+'Lines.npz'
+                    writeLineScans(lines_file, axis, *meshes.mesh(**bins))
+                    if verbose:
+                        print("Tally f%s: %s line scans written to %s" % (str(tally), axis, lines_file))
+
+    def export_tiles(self, meshTally=None, chunks=(64, 64, 64), verbose=False):
+        """ Writes f1/f3 mesh tallies into chunked, compressed, multi-resolution tile stores (one per tally).
+
+        Level 0 holds the full-resolution mesh. Every further level halves the number of bins along each axis
+        (values are averaged and relative errors propagated) until the whole mesh fits in a single chunk.
+        Each chunk is a compressed .npz file holding the "values" and "errors" of up to chunks=(cx,cy,cz) bins.
+        Chunks containing only zeros are not written. index.json describes the layout; use the tileStore class to read slices back.
+        For tallies with energy/time bins, the last bin (the total bin, if MCNP wrote one) is exported.
+
+        ARGUMENTS:
+        meshTally: A list that contains the f1/f3 tallies to be exported (all f1 and f3 tallies by default)
+        chunks   : Chunk shape in number of (x, y, z) bins
+        verbose  : Prints the number of levels and chunks written for every tally
+        """
+
+        # 1. Check if user has entered specific mesh tallies.
+        for tally in self.checkMeshTallies(meshTally):
+            xAxis, yAxis, zAxis, talval, talerr = self.loadMesh(tally)
+            talval, talerr = np.asarray(talval, dtype=float), np.asarray(talerr, dtype=float)
+            tilesDir = self.talliesDir+'/F%s/' %str(tally)[-1] +'f'+str(tally)+'_tiles'
+            if path.exists(tilesDir):
+                rmtree(tilesDir)
+
+            # 2. Level 0 is the mesh itself. Coarser levels are built from the sums of values and squared absolute errors,
+            #    so that every level is an exact reduction of the full-resolution mesh.
+            edges  = [np.asarray(xAxis, dtype=float), np.asarray(yAxis, dtype=float), np.asarray(zAxis, dtype=float)]
+            sums   = talval
+            err2   = (talval*talerr)**2
+            counts = [np.ones(n) for n in talval.shape]
+            values = talval
+            errors = talerr
+            levels = []
+
+            while True:
+                # 3. Write the non-empty chunks of this level.
+                levelDir = tilesDir + '/L%i' % len(levels)
+                makedirs(levelDir)
+                present = []
+                for ci, cj, ck in product(*[range(int(np.ceil(n/c))) for n, c in zip(values.shape, chunks)]):
+                    block = (slice(ci*chunks[0], (ci+1)*chunks[0]),
+                             slice(cj*chunks[1], (cj+1)*chunks[1]),
+                             slice(ck*chunks[2], (ck+1)*chunks[2]))
+                    if values[block].any() or errors[block].any():
+                        name = "%i.%i.%i" % (ci, cj, ck)
+                        np.savez_compressed(levelDir + '/' + name + '.npz', values=values[block], errors=errors[block])
+                        present.append(name)
+
+                levels.append({"shape"  : list(values.shape),
+                               "edges"  : [e.tolist() for e in edges],
+                               "present": present})
+
+                if all(n <= c for n, c in zip(values.shape, chunks)):
+                    break
+
+                # 4. Halve every axis for the next level.
+                for axis in range(3):
+                    factor = 2 if sums.shape[axis] > 1 else 1
+                    sums, newEdges = reduceAxis(sums, edges[axis], factor, axis=axis, method="sum")
+                    err2, _        = reduceAxis(err2, edges[axis], factor, axis=axis, method="sum")
+                    counts[axis], _ = reduceAxis(counts[axis], edges[axis], factor, method="sum")
+                    edges[axis] = newEdges
+                values = sums / (counts[0][:, None, None] * counts[1][None, :, None] * counts[2][None, None, :])
+                errors = np.divide(np.sqrt(err2), np.abs(sums), out=np.zeros_like(sums), where=(sums != 0))
+
+            # 5. The index is written last, so an interrupted export is never mistaken for a complete one.
+            with open(tilesDir + '/index.json', 'w') as f:
+                json.dump({"tally": tally, "chunks": list(chunks), "levels": levels}, f)
+
+            if verbose:
+                print("Tally f%s: %i levels, %i chunks written to %s" % (str(tally), len(levels),
+                      sum(len(level["present"]) for level in levels), tilesDir))
+
+
+    def export_vtk(self, meshTally=None, compress=True, saveTo=None, verbose=False):
+        """ Writes f1/f3 mesh tallies into binary VTK rectilinear grid files (e.g. ./tallies/F1/f1.vtr) for ParaView (see writeVTK).
+        Every file holds the (i,j,k) bin edges and the "values" and "errors" (relative errors) cell fields of one tally.
+        Tallies with energy/time bins get one file per bin, e.g. f1_e2.vtr (see meshTally.selections).
+
+        ARGUMENTS:
+        meshTally: A list that contains the f1/f3 tallies to be exported (all f1 and f3 tallies by default)
+        compress : Compresses the data with zlib (read natively by ParaView)
+        saveTo   : Allows the user to save the files somewhere other than the mctalPath directory
+        verbose  : Prints the path of every file written
+        """
+        for tally in self.checkMeshTallies(meshTally):
+            meshes = self.loadMeshTally(tally, mmap=True)
+            if saveTo:
+                vtk_path = saveTo
+            else:
+                vtk_path = self.talliesDir+'/F%s/' %str(tally)[-1]
+            makedirs(vtk_path, exist_ok=True)
+            for bins in meshes.selections():
+                vtk_file = vtk_path+'f'+str(tally)+binLabel(bins)+'.vtr'
+                writeVTK(vtk_file, *meshes.mesh(**bins), compress=compress)
+                if verbose:
+                    print("Tally f%s: mesh written to %s" % (str(tally), vtk_file))
+
+
+class tileStore:
+    """ This class reads slices of a mesh tally from a tile store written by meshExporter.export_tiles.
+    Only the chunks crossed by a requested slice are read from disk, and the most recently used chunks are kept in memory.
+    """
+
+    def __init__(self, tilesDir, cachedChunks=256):
+        if not path.isfile(tilesDir + '/index.json'):
+            raise FileNotFoundError("No tile store found in " + tilesDir)
+        with open(tilesDir + '/index.json') as f:
+            index = json.load(f)
+
+        self.tilesDir     = tilesDir
+        self.tally        = index["tally"]
+        self.chunks       = index["chunks"]
+        self.levels       = index["levels"]
+        self.present      = [set(level["present"]) for level in self.levels]
+        self.cachedChunks = cachedChunks
+        self.chunkCache   = OrderedDict()
+
+    def getChunk(self, level, ci, cj, ck):
+        """ Returns the (values, errors) arrays of one chunk. Chunks that were not written (all zeros) are returned as zeros."""
+        key = (level, ci, cj, ck)
+        if key in self.chunkCache:
+            self.chunkCache.move_to_end(key)
+            return self.chunkCache[key]
+
+        name = "%i.%i.%i" % (ci, cj, ck)
+        if name in self.present[level]:
+            with np.load(self.tilesDir + '/L%i/' % level + name + '.npz') as data:
+                chunk = (data["values"], data["errors"])
+        else:
+            shape = [min(c, n - i*c) for i, c, n in zip((ci, cj, ck), self.chunks, self.levels[level]["shape"])]
+            chunk = (np.zeros(shape), np.zeros(shape))
+
+        self.chunkCache[key] = chunk
+        if len(self.chunkCache) > self.cachedChunks:
+            self.chunkCache.popitem(last=False)
+        return chunk
+
+    def findBin(self, axis, position, level=0):
+        """ Returns the bin index at this level that contains position [cm] along axis ("x", "y" or "z")."""
+        edges = self.levels[level]["edges"]["xyz".index(axis)]
+        return int(np.clip(np.searchsorted(edges, position, side='right') - 1, 0, len(edges) - 2))
+
+    def getSlice(self, axis, index, level=0, region=None):
+        """ Returns the plane normal to axis ("x", "y" or "z") at bin "index" of the given level as (aAxis, bAxis, values, errors).
+
+        The two remaining axes are returned in x, y, z order: for axis="x", values has shape (ny, nz), aAxis holds the
+        y bin edges and bAxis the z bin edges. To zoom in, region=((a0, a1), (b0, b1)) limits the slice to these bin ranges.
+        Higher levels are coarser: level L has roughly 2^L times fewer bins along every axis.
+        """
+        if axis not in ("x", "y", "z"):
+            raise Warning("\naxis must be one of x, y or z")
+        normal = "xyz".index(axis)
+        others = [d for d in range(3) if d != normal]
+        shape  = self.levels[level]["shape"]
+        edges  = self.levels[level]["edges"]
+        if not 0 <= index < shape[normal]:
+            raise Warning("\nindex must be between 0 and %i at level %i" % (shape[normal]-1, level))
+
+        if region == None:
+            region = ((0, shape[others[0]]), (0, shape[others[1]]))
+        bounds = [None, None, None]
+        bounds[normal]    = (index, index+1)
+        bounds[others[0]] = tuple(region[0])
+        bounds[others[1]] = tuple(region[1])
+
+        values = np.zeros((bounds[others[0]][1] - bounds[others[0]][0], bounds[others[1]][1] - bounds[others[1]][0]))
+        errors = np.zeros_like(values)
+
+        # Only visit the chunks that intersect the requested plane and region
+        chunkRanges = [range(lo // c, (hi - 1) // c + 1) for (lo, hi), c in zip(bounds, self.chunks)]
+        for ci, cj, ck in product(*chunkRanges):
+            chunkVals, chunkErrs = self.getChunk(level, ci, cj, ck)
+            origin = (ci*self.chunks[0], cj*self.chunks[1], ck*self.chunks[2])
+            lo  = [max(bounds[d][0], origin[d]) for d in range(3)]
+            hi  = [min(bounds[d][1], origin[d] + chunkVals.shape[d]) for d in range(3)]
+            src = tuple(slice(lo[d] - origin[d], hi[d] - origin[d]) for d in range(3))
+            dst = tuple(slice(lo[d] - bounds[d][0], hi[d] - bounds[d][0]) for d in others)
+            values[dst] = chunkVals[src].squeeze(axis=normal)
+            errors[dst] = chunkErrs[src].squeeze(axis=normal)
+
+        aAxis = np.asarray(edges[others[0]][bounds[others[0]][0]:bounds[others[0]][1]+1])
+        bAxis = np.asarray(edges[others[1]][bounds[others[1]][0]:bounds[others[1]][1]+1])
+        return aAxis, bAxis, values, errors
+
+
+class sliceServer(talliesReader):
+    """ This class serves plots of the tallies on demand over HTTP, instead of pre-rendering every plot to disk.
+    Please see the docstring of method "serve" for the available URLs.
+    """
+
+    # Query options accepted by the server and their types
+    serverOptions = {"fm": float, "vmin": float, "vmax": float, "dpi": int, "fontsize": float,
+                     "switchAxis": bool, "exact": bool, "lodMethod": str, "logscale": bool, "nototal": bool,
+                     "amin": float, "amax": float, "bmin": float, "bmax": float,
+                     "xmin": float, "xmax": float, "ymin": float, "ymax": float, "e": int, "t": int}
+
+    def serve(self, host="127.0.0.1", port=8050, cacheMB=256, verbose=False):
+        """ Starts a local HTTP server that renders plots when they are requested.
+
+        Mesh tallies are read from the memory-mapped tally cache (see loadMesh), and rendered images are kept
+        in a size-bounded LRU cache (cacheMB megabytes), keyed by tally, plot, index and plot options.
+
+        URLS:
+        /                                 : JSON list of the tallies and mesh shapes
+        /f1/<tally>/xCS/<x>.png           : 2D cross sections of f1/f3 meshes (also yCS and zCS), indexed like the saved CS plots
+        /f1/<tally>/xLine/<y>_<z>.png     : 1D line scans of f1/f3 meshes (also yLine/<x>_<z> and zLine/<x>_<y>)
+        /f4/<tally>/<cell>/E.png          : F4 flux spectrum of a cell (cell index, from 0) versus energy (E) or wavelength (W)
+        /f6/<tally>.png                   : F6 bar graph
+        /stats                            : Render cache statistics
+
+        Plot options are passed as query parameters, e.g. /f3/13/zCS/5.png?vmin=1e-3&switchAxis=1
+        f1/f3    : e, t select the energy and time bins (0-based, the last bins by default, see loadMesh), e.g. /f1/1/xCS/5.png?e=2
+        CS plots : fm, vmin, vmax, dpi, fontsize, switchAxis, exact, lodMethod, amin, amax, bmin, bmax (see meshCSFigure)
+        Lines    : fm, fontsize, logscale, xmin, xmax, ymin, ymax
+        F4       : fontsize, xmin, xmax, ymin, ymax
+        F6       : fontsize, nototal, ymin, ymax
+        """
+        self.renderCache = renderCache(maxBytes=cacheMB*2**20)
+        self.meshes = {}
+        self.meshLock = threading.Lock()
+        server = self
+
+        class requestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                url = urlparse(self.path)
+                try:
+                    options = server.parseOptions(parse_qs(url.query))
+                    route = tuple(url.path.strip('/').split('/'))
+                    if route == ('',):
+                        body, contentType = json.dumps(server.serverIndex()).encode(), 'application/json'
+                    elif route == ('stats',):
+                        cache = server.renderCache
+                        stats = {"images": len(cache.images), "bytes": cache.nBytes, "hits": cache.hits, "misses": cache.misses}
+                        body, contentType = json.dumps(stats).encode(), 'application/json'
+                    else:
+                        key = route + tuple(sorted(options.items()))
+                        body = server.renderCache.get(key)
+                        if body == None:
+                            body = server.renderRoute(route, options)
+                            server.renderCache.put(key, body)
+                        contentType = 'image/png'
+                except LookupError:
+                    self.send_error(404, "Unknown plot: " + url.path)
+                    return
+                except (Warning, ValueError, TypeError) as error:
+                    self.send_error(400, str(error).strip())
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', contentType)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                if verbose:
+                    BaseHTTPRequestHandler.log_message(self, format, *args)
+
+        httpd = ThreadingHTTPServer((host, port), requestHandler)
+        print("Serving tallies of %s on http://%s:%i/ (Ctrl+C to stop)" % (self.mctalFile, host, port))
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
+
+    def parseOptions(self, query):
+        options = {}
+        for name, values in query.items():
+            if name not in self.serverOptions:
+                raise Warning("Unknown plot option: " + name)
+            if self.serverOptions[name] == bool:
+                options[name] = values[-1].lower() in ("1", "true", "yes")
+            else:
+                options[name] = self.serverOptions[name](values[-1])
+        return options
+
+    def serverIndex(self):
+        index = {"mctal": self.mctalFile, "meshes": {}}
+        for talType in ("f1", "f3", "f4", "f6"):
+            index[talType] = getattr(self, talType+"Tallies")
+        for tal in self.allTals:
+            if tal.tallyNumber in self.f1Tallies + self.f3Tallies:
+                index["meshes"][tal.tallyNumber] = [len(tal.getAxis(a))-1 for a in "ijk"]
+        return index
+
+    def getMesh(self, tally):
+        # Each mesh (with all its energy/time bins) is memory-mapped once and shared by all request threads
+        with self.meshLock:
+            if tally not in self.meshes:
+                self.meshes[tally] = self.loadMeshTally(tally, mmap=True)
+            return self.meshes[tally]
+
+    def renderRoute(self, route, options):
+        """ Renders the plot addressed by a server URL path and returns the PNG image."""
+        talType, tally = route[0], int(route[1].replace('.png', ''))
+        if tally not in getattr(self, talType+"Tallies", []):
+            raise LookupError(route)
+        dpi = options.pop("dpi", 120)
+        limits = {"xlim": (options.pop("xmin", None), options.pop("xmax", None)),
+                  "ylim": (options.pop("ymin", None), options.pop("ymax", None))}
+        bins = {a: options.pop(a) for a in "et" if a in options}
+        if bins and talType not in ("f1", "f3"):
+            raise Warning("Energy and time bins (e, t) can only be selected for f1 and f3 tallies")
+
+        if talType in ("f1", "f3") and len(route) == 4:
+            meshes = self.getMesh(tally)
+            if not all(0 <= b < meshes.shape[a] for a, b in bins.items()):
+                raise LookupError(route)
+            xAxis, yAxis, zAxis, talval, talerr = meshes.mesh(**bins)
+            edges = {"x": xAxis, "y": yAxis, "z": zAxis}
+            plot, name = route[2], route[3].replace('.png', '')
+            if plot in ("xCS", "yCS", "zCS"):
+                # Planes are indexed by their bin edge (1..len(axis)-1) like the saved CS plots, so index 0 does not exist
+                if not 1 <= int(name) < len(edges[plot[0]]):
+                    raise LookupError(route)
+                plane = meshPlane(talval, "xyz".index(plot[0]), int(name)-1)
+                if plane.min() == plane.max():
+                    raise Warning("Value range is 0. No %s plot can be made at %s=%s" % (plot, plot[0], name))
+                fig = meshCSFigure(talType, plot[0], int(name), xAxis, yAxis, zAxis, talval, dpi=dpi, **options)
+                return figureBytes(fig, dpi=dpi)
+            elif plot in ("xLine", "yLine", "zLine"):
+                indices = [int(i) for i in name.split('_')]
+                others = [a for a in "xyz" if a != plot[0]]
+                if len(indices) != 2 or not all(1 <= i < len(edges[a]) for i, a in zip(indices, others)):
+                    raise LookupError(route)
+                fig = meshLineFigure(talType, plot[0], indices, xAxis, yAxis, zAxis, talval, **limits, **options)
+                return figureBytes(fig)
+
+        elif talType == "f4" and len(route) == 4:
+            data = self.loadTally(tally)
+            cell = int(route[2])
+            rows = data[data[:, 0] == cell]
+            if len(rows) == 0:
+                raise LookupError(route)
+            erg, flxE, wave, flxW = f4Wavelength(rows[:, 1], rows[:, 2])
+            x_axis = route[3].replace('.png', '')
+            if x_axis == "E":
+                return figureBytes(renderF4(erg, flxE, cell, "E", **limits, **options), dpi=200)
+            elif x_axis == "W":
+                return figureBytes(renderF4(wave, flxW, cell, "W", **limits, **options), dpi=200)
+
+        elif talType == "f6" and len(route) == 2:
+            data = self.loadTally(tally)
+            tal = [tal for tal in self.allTals if tal.tallyNumber == tally][0]
+            labels = [str(int(tal.cells[i])) for i in range(len(data))]
+            labels[-1] = "Total"
+            erg, err = data[:, 2], data[:, 3]*data[:, 2]
+            if options.pop("nototal", False):
+                labels, erg, err = labels[:-1], erg[:-1], err[:-1]
+            fig = renderF6(labels, erg, err, tally, ymin=limits["ylim"][0], ymax=limits["ylim"][1],
+                           nBars=len(data), **options)
+            return figureBytes(fig, dpi=200)
+
+        raise LookupError(route)
+
+
+class hotspotFinder(talliesReader):
+    """ This class reports the hotspots of f1, f3, f4 and f6 tallies: their largest values with an acceptable relative error.
+    Reports are printed and saved next to the tally files, e.g. in ./tallies/F3/f3_hotspots.txt
+    """
+
+    def find_hotspots(self, tallies=None, k=10, maxError=None, verbose=True):
+        """ Finds the k largest values of every tally (see findHotspots) and returns them as {tally: [hotspot, ...]}.
+
+        Every hotspot is a dictionary with the "value" and relative "error", and:
+        - for f1/f3 mesh tallies, the bin edge "index" (i, j, k) as in the names of the CS and line scan plots,
+          and the bin edges "x", "y" and "z" [cm] (for tallies with energy/time bins, the last bin is searched, see meshTally.view)
+        - for f4 tallies, the "cell" (counted as in the names of the f4 plots) and "energy" [MeV] bin
+        - for f6 tallies, the "cell" number (the total is not a hotspot)
+
+        ARGUMENTS:
+        tallies : A list that contains the f1, f3, f4 and f6 tallies to be searched (all of them by default)
+        k       : Number of hotspots per tally
+        maxError: Skips values whose relative error is above maxError (e.g. 0.1), which are not statistically reliable
+        verbose : Prints the reports
+        """
+        supported = self.f1Tallies + self.f3Tallies + self.f4Tallies + self.f6Tallies
+        if tallies == None:
+            tallies = supported
+        elif not type(tallies) == list:
+            raise TypeError("tallies must be a list")
+        else:
+            for T in tallies:
+                if T not in supported:
+                    raise Warning("tallies has a tally number that does not exist in f1Tallies, f3Tallies, f4Tallies or f6Tallies")
+
+        report = {}
+        for tally in tallies:
+            tallyType = str(tally)[-1]
+            hotspots = []
+
+            # 1. Mesh tallies: search the whole mesh, then take the coordinates from the bin edges
+            if tallyType in "13":
+                xAxis, yAxis, zAxis, talval, talerr = self.exactMesh(tally)
+                for (ii, jj, kk), value, error in findHotspots(talval, talerr, k, maxError):
+                    hotspots.append({"index": (int(ii)+1, int(jj)+1, int(kk)+1),
+                                     "x": (float(xAxis[ii]), float(xAxis[ii+1])),
+                                     "y": (float(yAxis[jj]), float(yAxis[jj+1])),
+                                     "z": (float(zAxis[kk]), float(zAxis[kk+1])),
+                                     "value": float(value), "error": float(error)})
+                lines = ["%-6s%-24s%-24s%-24s%-15s%s" % ("Rank", "x [cm]", "y [cm]", "z [cm]", "Value", "Rel. error")]
+                for rank, h in enumerate(hotspots):
+                    lines.append("%-6i%-24s%-24s%-24s%-15e%e" % (rank+1, "[%g, %g]" % h["x"], "[%g, %g]" % h["y"], "[%g, %g]" % h["z"],
+                                                                 h["value"], h["error"]))
+
+            # 2. Cell tallies: search the [cell, erg, val, err] rows of the tally file
+            else:
+                data = self.loadTally(tally)
+                if tallyType == "6":
+                    cells = [tal.cells for tal in self.allTals if tal.tallyNumber == tally][0]
+                    data = data[:-1] if len(data) > 1 else data
+                for (row,), value, error in findHotspots(data[:, 2], data[:, 3], k, maxError):
+                    if tallyType == "6":
+                        hotspots.append({"cell": int(cells[int(data[row, 0])]), "value": float(value), "error": float(error)})
+                    else:
+                        hotspots.append({"cell": int(data[row, 0]), "energy": float(data[row, 1]),
+                                         "value": float(value), "error": float(error)})
+                if tallyType == "6":
+                    lines = ["%-6s%-10s%-15s%s" % ("Rank", "Cell", "Value", "Rel. error")]
+                    lines += ["%-6i%-10i%-15e%e" % (rank+1, h["cell"], h["value"], h["error"]) for rank, h in enumerate(hotspots)]
+                else:
+                    lines = ["%-6s%-10s%-15s%-15s%s" % ("Rank", "Cell", "Energy [MeV]", "Value", "Rel. error")]
+                    lines += ["%-6i%-10i%-15e%-15e%e" % (rank+1, h["cell"], h["energy"], h["value"], h["error"]) for rank, h in enumerate(hotspots)]
+
+            # 3. Save (and print) the report
+            header = "Hotspots of tally f%s (top %i%s)" % (str(tally), k, "" if maxError == None else ", relative error <= %g" % maxError)
+            with open(self.talliesDir+'/F%s/' %tallyType +'f'+str(tally)+'_hotspots.txt', 'w') as f:
+                f.write(header + "\n" + "\n".join(lines) + "\n")
+            if verbose:
+                print("\n" + header + "\n" + "\n".join(lines))
+            report[tally] = hotspots
+
+        return report
+
+
+class roiIntegrator(talliesReader):
+    """ This class integrates f1 and f3 mesh tallies over regions of interest (ROI): boxes and unions of boxes in cm,
+    e.g. the heat load on a component from an f3 mesh, or the average flux in a detector volume from an f1 mesh.
+    Reports are printed and saved next to the tally files, e.g. in ./tallies/F3/f3_roi.txt
+
+    ROI files are JSON or YAML lists of regions (or a dictionary with the list as "rois"), for example:
+        [{"name": "target", "boxes": [[-5, 5, 0, 2, -1, 1]]},
+         {"name": "walls",  "boxes": [[-10, -9, 0, 5, -3, 3], [9, 10, 0, 5, -3, 3]]}]
+    """
 
-class talliesPlotter(f1Plotter, f3Plotter, f4Plotter, f6Plotter):
+    def integrate_roi(self, rois, meshTally=None, verbose=True):
+        """ Computes the volume, integral, mean, maximum and propagated relative error of every region of interest over f1/f3 mesh tallies
+        (see meshROIs), and returns them as {tally: [statistics, ...]}, one dictionary per region and energy/time bin ("bins", see meshTally.selections).
+        All regions of a tally are computed in a single pass over its mesh, so hundreds of regions cost about as much as one.
+
+        ARGUMENTS:
+        rois     : A list of regions of interest, each a dictionary with a "name" and "boxes": a list of [xmin, xmax, ymin, ymax, zmin, zmax] boxes [cm]
+                   whose union is the region (see readROIs), or the path of a JSON/YAML ROI file
+        meshTally: A list that contains the f1/f3 tallies to be integrated (all f1 and f3 tallies by default)
+        verbose  : Prints the reports
+        """
+        if type(rois) == str:
+            rois = loadJobSpec(rois)
+        regions = readROIs(rois)
+
+        report = {}
+        for tally in self.checkMeshTallies(meshTally):
+            meshes = self.loadMeshTally(tally, mmap=True)
+            rows = []
+            for bins in meshes.selections():
+                for statistics in meshROIs(*meshes.mesh(**bins), regions):
+                    if statistics["volume"] == 0:
+                        log.warning("Tally f%s: region of interest %s does not overlap the mesh", tally, statistics["name"],
+                                    extra={"tally": tally, "code": "roi"})
+                    rows.append(dict(statistics, bins=bins))
+
+            # Save (and print) the report
+            lines = ["%-20s%-12s%-15s%-15s%-15s%-15s%s" % ("ROI", "Bins", "Volume [cm3]", "Integral", "Mean", "Max", "Rel. error")]
+            for row in rows:
+                lines.append("%-20s%-12s%-15e%-15e%-15e%-15e%e" % (row["name"], binLabel(row["bins"])[1:] or "-", row["volume"],
+                                                                   row["integral"], row["mean"], row["max"], row["error"]))
+            header = "Regions of interest of tally f%s (integral = sum of value*volume, mean = integral/volume)" % str(tally)
+            with open(self.talliesDir+'/F%s/' %str(tally)[-1] +'f'+str(tally)+'_roi.txt', 'w') as f:
+                f.write(header + "\n" + "\n".join(lines) + "\n")
+            if verbose:
+                print("\n" + header + "\n" + "\n".join(lines))
+            report[tally] = rows
+
+        return report
+
+
+class histogramPlotter(talliesReader):
+    """ This class produces cumulative volume histograms of f1 and f3 mesh tallies, similar to dose-volume histograms:
+    the volume of the mesh whose value is at least every threshold, e.g. how much material exceeds the design limit of a heat load.
+    Histograms are saved next to the tally files, e.g. as ./tallies/F3/f3_histogram.txt and ./tallies/F3/f3_plots/histogram/f3_histogram.png
+    """
+
+    @imagePipeline
+    def plot_histogram(self, meshTally=None, show=False, verbose=False, fontsize=12, saveTo=None,
+                       bins=100, vmin=None, vmax=None, weighted=True, limits=None, fm=1):
+        """ Computes and plots the cumulative volume histogram of every f1/f3 mesh tally and energy/time bin (see meshHistogram),
+        and returns them as {tally: [{"bins", "thresholds", "above", "total"}, ...]}.
+
+        ARGUMENTS:
+        meshTally: A list that contains the f1/f3 tallies (all f1 and f3 tallies by default)
+        show     : When True, shows the plots without saving them. The text files are always saved.
+        verbose  : Prints the volume above every design limit
+        saveTo   : Allows the user to save plots somewhere other than the mctalPath directory.
+        bins     : Number of log-spaced histogram bins (the design limits are added as bin edges)
+        vmin     : Lowest threshold (by default, the smallest positive value of the mesh, from its statistics index, see sliceStatistics)
+        vmax     : Highest threshold (by default, the largest value of the mesh)
+        weighted : When True, mesh bins are weighted by their volume [cm³] from the axis edges; when False, they are counted.
+        limits   : A list of positive design limits (in tally units, after fm), marked on the plots with the volume above them
+        fm       : Multiplies the tally values by a scalar value, like in plot_f1/plot_f3
+        """
+        unit = "Volume above threshold [cm³]" if weighted else "Mesh bins above threshold"
+        if not all(limit > 0 for limit in limits or []):
+            raise Warning("Design limits must be positive, since histogram thresholds are log-spaced")
+        histograms = {}
+        for tally in self.checkMeshTallies(meshTally):
+            meshes = self.loadMeshTally(tally, mmap=True)
+            style  = meshStyles["f"+str(tally)[-1]]
+            rows, lines = [], []
+            for selection in meshes.selections():
+                xAxis, yAxis, zAxis, talval, talerr = meshes.mesh(**selection)
+
+                # 1. Log-spaced thresholds between the smallest positive and the largest value, read from the statistics index
+                low, high = meshes.stats.limits(selection)
+                low  = vmin/fm if vmin != None else low
+                high = vmax/fm if vmax != None else high
+                if low == None or not high > low:
+                    log.warning("Tally f%s%s: no range of positive values for a volume histogram", tally, binLabel(selection),
+                                extra={"tally": tally, "code": "histogram"})
+                    continue
+                edges = np.logspace(np.log10(low), np.log10(high), bins+1)
+                edges[0], edges[-1] = low, high
+
+                # 1.1. Design limits are added as edges, so the volume above them is exact, also outside of the thresholds range.
+                #      The last edge is moved just above the largest one, so that every limit (and high) is a threshold.
+                edges = np.union1d(edges, [limit/fm for limit in limits or []])
+                edges = np.append(edges, np.nextafter(edges[-1], np.inf))
+
+                # 2. Histogram in one pass over the mesh, then cumulative volumes from the top (including the values above vmax)
+                counts, _, beyond = meshHistogram(xAxis, yAxis, zAxis, talval, edges, weighted=weighted)
+                above = np.cumsum(counts[::-1])[::-1] + beyond
+                total = np.prod([np.ptp(np.asarray(a, dtype=float)) for a in (xAxis, yAxis, zAxis)]) if weighted else talval.size
+                thresholds = edges[:-1]*fm
+                rows.append({"bins": selection, "thresholds": thresholds, "above": above, "total": total})
+                lines += ["# %s" % (binLabel(selection)[1:] or "total"), "%-15s%-15s%s" % ("Threshold", "Above", "Fraction")]
+                lines += ["%-15e%-15e%e" % (t, a, a/total if total else 0) for t, a in zip(thresholds, above)]
+                volumes = [(limit, above[np.searchsorted(edges, limit/fm)]) for limit in limits or []]
+                for limit, volume in volumes if verbose else []:
+                    print("Tally f%s%s: %g %s above %g" % (tally, binLabel(selection), volume, "cm³" if weighted else "bins", limit))
+
+                # 3. Show or save the plot
+                title = "Cumulative volume histogram of tally f%s%s" % (tally, binLabel(selection))
+                def histogram_plot(pyplot=False):
+                    return renderVolumeHistogram(thresholds, above, total, title, style["talval_label"] or "Tally value",
+                                                 yLabel=unit, limits=volumes, fontsize=fontsize, pyplot=pyplot)
+                if show == True:
+                    histogram_plot(pyplot=True)
+                    plt.show()
+                else:
+                    plot_path = saveTo if saveTo else self.talliesDir+'/F%s/f' %str(tally)[-1] +str(tally)+'_plots/histogram'
+                    self.saveRender(plot_path+'/f'+str(tally)+binLabel(selection)+'_histogram.png', histogram_plot, dpi=120,
+                                    inputs=(thresholds, above, total, title, unit, volumes, fontsize))
+
+            # 4. Save the cumulative curves of all energy/time bins
+            with open(self.talliesDir+'/F%s/' %str(tally)[-1] +'f'+str(tally)+'_histogram.txt', 'w') as f:
+                f.write("Cumulative volume histogram of tally f%s (%s)\n" % (str(tally), unit) + "\n".join(lines) + "\n")
+            histograms[tally] = rows
+
+        return histograms
+
+
+class convergenceMonitor(talliesReader):
+    """ This class checks the convergence of tallies from the tally fluctuation charts (TFC) of the mctal file.
+    The mctal file is read again on every check, so that the dumps of a running MCNP problem can be followed
+    and the problem stopped as soon as its tallies have converged (see watch_convergence). parseMCTAL is not needed.
+    Reports and dashboards are saved in ./tallies/convergence.txt and ./tallies/convergence.png
+    """
+
+    def check_convergence(self, tallies=None, verbose=True):
+        """ Runs the MCNP statistical checks on the tally fluctuation charts of the mctal file (see checkConvergence)
+        and returns {tally: {"nps", "mean", "error", "fom", "checks": {check number: passed}, "converged"}}.
+
+        ARGUMENTS:
+        tallies: A list that contains the tallies to be checked (all tallies with a TFC by default)
+        verbose: Prints the report
+        """
+        # 1. Reads the charts of the current dump
+        if self.talliesDir == "":
+            self.openTalliesDir()
+        self.tfc = readTFC(self.mctalFile)
+        if not self.tfc:
+            raise FileNotFoundError("This mctal file has no tally fluctuation charts to be checked")
+        if tallies == None:
+            tallies = list(self.tfc)
+        elif not type(tallies) == list:
+            raise TypeError("tallies must be a list")
+        else:
+            for T in tallies:
+                if T not in self.tfc:
+                    raise Warning("tallies has a tally number that has no tally fluctuation chart in this mctal file")
+
+        # 2. Runs the checks on all tallies at once
+        final, checks = checkConvergence(self.tfc, tallies)
+        report = OrderedDict()
+        for row, tally in enumerate(tallies):
+            report[tally] = {"nps": int(final[row, 0]), "mean": float(final[row, 1]), "error": float(final[row, 2]), "fom": float(final[row, 3]),
+                             "checks": OrderedDict(zip(convergenceChecks, map(bool, checks[row]))), "converged": bool(checks[row].all())}
+
+        # 3. Save (and print) the report
+        header = "Convergence of %i tallies at NPS %i: %i converged" % (len(tallies), final[:, 0].max(), checks.all(axis=1).sum())
+        lines = ["Checks: " + "; ".join("%i. %s" % item for item in convergenceChecks.items()),
+                 "%-8s%-14s%-15s%-12s%-15s%-20s%s" % ("Tally", "NPS", "Mean", "Rel. error", "FOM", "Checks passed", "Converged")]
+        for tally, r in report.items():
+            passed = " ".join(str(n) if ok else "-" for n, ok in r["checks"].items())
+            lines.append("%-8s%-14i%-15e%-12.4f%-15e%-20s%s" % ("f"+str(tally), r["nps"], r["mean"], r["error"], r["fom"], passed,
+                                                                 "yes" if r["converged"] else "no"))
+        with open(self.talliesDir+'/convergence.txt', 'w') as f:
+            f.write(header + "\n" + "\n".join(lines) + "\n")
+        if verbose:
+            print("\n" + header + "\n" + "\n".join(lines))
+        return report
+
+    def plot_convergence(self, tallies=None, show=False, fontsize=12, dpi=120):
+        """ Plots the convergence dashboard of tallies (see renderConvergence) from the charts of the last check_convergence.
+
+        ARGUMENTS:
+        tallies : A list that contains the tallies to be plotted (all tallies with a TFC by default)
+        show    : Shows the dashboard instead of saving it to ./tallies/convergence.png
+        fontsize: Font size of the dashboard
+        dpi     : Resolution of the saved dashboard
+        """
+        if not self.tfc:
+            self.check_convergence(tallies, verbose=False)
+        if tallies == None:
+            tallies = list(self.tfc)
+        final, checks = checkConvergence(self.tfc, tallies)
+        if show == True:
+            renderConvergence(tallies, self.tfc, checks, fontsize=fontsize, pyplot=True)
+            plt.show()
+        else:
+            saveFigure(renderConvergence(tallies, self.tfc, checks, fontsize=fontsize), self.talliesDir+'/convergence.png', dpi=dpi)
+
+    def watch_convergence(self, tallies=None, interval=60, timeout=None, verbose=True):
+        """ Checks every new dump of the mctal file (and plots its dashboard) until all tallies have converged.
+        Returns True once they have, or False if they have not after timeout seconds.
+
+        ARGUMENTS:
+        tallies : A list that contains the tallies to be checked (all tallies with a TFC by default)
+        interval: Seconds between two looks at the mctal file
+        timeout : Seconds after which to stop watching (never by default)
+        verbose : Prints the report of every dump
+        """
+        if self.mctalFile == "":
+            self.mctalFile = "./mctal"
+        start = time.time()
+        checked = None
+        while True:
+            stamp = fileStamp(self.mctalFile)
+            if stamp != None and stamp != checked:
+                try:
+                    report = self.check_convergence(tallies, verbose=verbose)
+                except (ValueError, FileNotFoundError):
+                    # The dump is still being written: check it on the next look
+                    report = None
+                else:
+                    checked = stamp
+                    self.plot_convergence(tallies)
+                    if all(r["converged"] for r in report.values()):
+                        return True
+            if timeout != None and time.time() - start >= timeout:
+                return False
+            time.sleep(interval)
+
+
+class runPlanner(talliesReader):
+    """ This class estimates the work of plot calls before running them (a dry run): the number of images per tally and plot,
+    and their disk usage and rendering time, measured on one calibration render of every distinct plot
+    (synthetic values with the shape, bins and settings of the real plots). Only the tally headers and axes are read (see readHeaders).
+    """
+
+    def readHeaders(self):
+        """ Reads the tally headers and axes of the mctal file with mc-tools, without extracting the tallies (unlike parseMCTAL)."""
+        self.openTalliesDir()
+        self.allTals = mc_tools(self.mctalFile).Read()
+        self.listTallies()
+
+    def calibrate(self, key, render, dpi):
+        """ Renders and encodes render() once per key, and returns the (seconds, bytes) of the image."""
+        if key not in self.calibrations:
+            start = time.time()
+            size = len(figureBytes(render(), dpi=dpi))
+            self.calibrations[key] = (time.time() - start, size)
+        return self.calibrations[key]
+
+    def plan_plots(self, calls, maxImages=None, maxBytes=None, maxSeconds=None, verbose=True):
+        """ Estimates the images of plot calls, given as [(kind, tallies, arguments), ...] like in jobRunner.plan,
+        and returns {"rows": [(tally, plot, images, seconds, bytes), ...], "images", "seconds", "bytes", "exceeded": [limit, ...]}.
+        seconds are rendering and encoding seconds at one render process. Images that are still current are not rendered again (see saveRender),
+        which the plan cannot know, so it is an upper bound for runs over an existing tallies folder.
+
+        ARGUMENTS:
+        calls     : Plot calls of kinds "f1", "f3", "f4", "f6" and "histogram" (other kinds produce no images and are skipped)
+        maxImages : Number of images above which the plan is exceeded
+        maxBytes  : Disk usage [bytes] above which the plan is exceeded
+        maxSeconds: Rendering time [s] above which the plan is exceeded
+        verbose   : Prints the plan
+        """
+        self.calibrations = {}
+        rng = np.random.default_rng(0)
+        rows = []
+        for kind, tallies, arguments in calls:
+            for tally in (tallies if kind != "f4" else self.f4Tallies):
+                tal = [tal for tal in self.allTals if tal.tallyNumber == tally][0]
+                selections = int(np.prod([tal.getNbins(a) for a in "fdusmcet"])) if kind in ("f1", "f3", "histogram") else 1
+
+                # 1. Mesh tallies: count the plots like plot_f1/plot_f3 (see meshWorkUnits), and calibrate one of each kind of plot.
+                #    Once a tally has been extracted, its empty and constant planes are not counted, since plotters skip them (see loadStatistics).
+                if kind in ("f1", "f3"):
+                    talType = kind
+                    edges = {"x": np.asarray(tal.getAxis("i")), "y": np.asarray(tal.getAxis("j")), "z": np.asarray(tal.getAxis("k"))}
+                    bins = {a: len(meshIndices(edges[a], arguments.get(a))) for a in "xyz"}
+                    hotspots = arguments.get("hotspots")
+                    exact = arguments.get("exact", False)
+                    stats = self.loadStatistics(tally)
+                    plots = []
+                    for axis in "xyz":
+                        if arguments.get(axis+"CS"):
+                            count = min(hotspots, bins[axis]) if hotspots else bins[axis]
+                            if stats and not hotspots:
+                                planes = np.array(meshIndices(edges[axis], arguments.get(axis))) - 1
+                                ranges = (stats.arrays["plane_%s_min" % axis][..., planes], stats.arrays["plane_%s_max" % axis][..., planes])
+                                count = np.count_nonzero(ranges[0] != ranges[1]) / selections
+                            plots.append((axis+"CS", count, "plane", axis, arguments.get(axis+"CSdpi", 120)))
+                    for axis in "xyz":
+                        a, b = [d for d in "xyz" if d != axis]
+                        if arguments.get(axis+"Line") and arguments.get("lineFamily"):
+                            fixed = familyAxes[axis]
+                            plots.append((axis+"Family", min(hotspots, bins[fixed]) if hotspots else bins[fixed], "family", axis, None))
+                        elif arguments.get(axis+"Line"):
+                            count = min(hotspots, bins[a]*bins[b]) if hotspots else bins[a]*bins[b]
+                            if stats and not hotspots:
+                                lines = (np.array(meshIndices(edges[a], arguments.get(a)))[:, None] - 1, np.array(meshIndices(edges[b], arguments.get(b)))[None, :] - 1)
+                                ranges = (stats.arrays["line_%s_min" % axis][(Ellipsis,) + lines], stats.arrays["line_%s_max" % axis][(Ellipsis,) + lines])
+                                count = np.count_nonzero((ranges[0] != 0) | (ranges[1] != 0)) / selections
+                            plots.append((axis+"Line", count, "line", axis, None))
+                    projection = arguments.get("projection")
+                    if projection:
+                        methods = ("max", "mean", "sum") if projection == True else projection
+                        plots += [(method+" projection", 1, "plane", axis, arguments.get("dpi", 120)) for method in methods for axis in "xyz"]
+
+                    for plot, count, shape, axis, dpi in plots:
+                        a, b = [d for d in "xyz" if d != axis]
+                        if shape == "plane":
+                            # Without exact=True, slices are drawn at most at the pixel grid (see drawSlice), so larger calibration planes are cut
+                            full = (len(edges[b])-1, len(edges[a])-1)
+                            cut = tuple(min(n, 2048) for n in full)
+                            cutEdges = dict(edges)
+                            cutEdges[b], cutEdges[a] = edges[b][:cut[0]+1], edges[a][:cut[1]+1]
+                            render = partial(meshPlaneFigure, talType, axis, rng.lognormal(0, 2, cut),
+                                             cutEdges["x"], cutEdges["y"], cutEdges["z"], "Calibration", exact=exact, dpi=dpi)
+                            seconds, size = self.calibrate((talType, axis, cut, dpi, exact), render, dpi)
+                            if exact:
+                                seconds *= np.prod(full) / np.prod(cut)
+                        elif shape == "line":
+                            points = edges[axis][1:]
+                            render = partial(renderLine, points, rng.lognormal(0, 2, len(points)), axis+" [cm]", "Calibration")
+                            seconds, size = self.calibrate(("line", len(points)), render, None)
+                        else:
+                            points = edges[axis][1:]
+                            coloured = "xyz".replace(axis, "").replace(familyAxes[axis], "")
+                            lines = len(edges[coloured]) - 1
+                            render = partial(renderLineFamily, points, rng.lognormal(0, 2, (lines, len(points))), edges[coloured][1:],
+                                             axis+" [cm]", coloured+" [cm]", "Calibration")
+                            seconds, size = self.calibrate(("family", len(points), lines), render, None)
+                        images = int(round(count*selections))
+                        rows.append((tally, plot, images, images*seconds, images*size))
+
+                # 2. Cell tallies: one image per cell and x axis (f4), or one per tally (f6)
+                elif kind == "f4":
+                    energies = max(tal.getNbins("e"), 2)
+                    erg = np.logspace(-9, 1, energies)
+                    cells = tal.getNbins("f")
+                    for plot in [p for p in ("E", "W") if arguments.get("x_axis", "both") in ("both", p)]:
+                        render = partial(renderF4, erg, rng.lognormal(0, 2, energies), 1, x_axis=plot)
+                        seconds, size = self.calibrate(("f4", plot, energies), render, 200)
+                        rows.append((tally, "f4"+plot, cells, cells*seconds, cells*size))
+                elif kind == "histogram":
+                    thresholds = np.logspace(-3, 3, arguments.get("bins", 100))
+                    limits = [(limit, 1.0) for limit in arguments.get("limits") or []]
+                    render = partial(renderVolumeHistogram, thresholds, thresholds[::-1], 1e3, "Calibration", "Value", limits=limits)
+                    seconds, size = self.calibrate(("histogram", len(thresholds)), render, 120)
+                    rows.append((tally, "histogram", selections, selections*seconds, selections*size))
+                elif kind == "f6":
+                    cells = tal.getNbins("f")
+                    render = partial(renderF6, [str(n) for n in range(cells)], rng.lognormal(0, 2, cells), np.zeros(cells), tally)
+                    seconds, size = self.calibrate(("f6", cells), render, 200)
+                    rows.append((tally, "f6", 1, seconds, size))
+
+        # 3. Totals and limits (plots of several axes, e.g. the x, y and z projections, are added up)
+        merged = OrderedDict()
+        for tally, plot, images, seconds, size in rows:
+            merged[(tally, plot)] = [sum(pair) for pair in zip(merged.get((tally, plot), (0, 0, 0)), (images, seconds, size))]
+        rows = [(tally, plot, images, seconds, size) for (tally, plot), (images, seconds, size) in merged.items()]
+        plan = {"rows": rows, "images": sum(r[2] for r in rows), "seconds": sum(r[3] for r in rows), "bytes": sum(r[4] for r in rows)}
+        plan["exceeded"] = [name for name, limit in (("images", maxImages), ("bytes", maxBytes), ("seconds", maxSeconds))
+                            if limit != None and plan[name] > limit]
+        if verbose:
+            print("\n%-8s%-16s%-12s%-14s%s" % ("Tally", "Plot", "Images", "Size [MB]", "Time [s]"))
+            for tally, plot, images, seconds, size in rows:
+                print("%-8s%-16s%-12i%-14.1f%.1f" % ("f"+str(tally), plot, images, size/2**20, seconds))
+            print("%-24s%-12i%-14.1f%.1f" % ("Total", plan["images"], plan["bytes"]/2**20, plan["seconds"]))
+            for name in plan["exceeded"]:
+                print("The plan exceeds the limit of %s" % name)
+        return plan
+
+
+class talliesPlotter(f1Plotter, f3Plotter, f4Plotter, f6Plotter, meshExporter, sliceServer, hotspotFinder, roiIntegrator, histogramPlotter,
+                     convergenceMonitor, runPlanner):
     """Class that inherits Plotter classes"""
     pass
 
 
+# Plot kinds of job specs (see jobRunner): kind -> (talliesPlotter method, its tally list argument, tally lists it accepts)
+jobKinds = OrderedDict([("f1",        ("plot_f1",         "f1Tally",   ("f1Tallies",))),
+                        ("f3",        ("plot_f3",         "f3Tally",   ("f3Tallies",))),
+                        ("f4",        ("plot_f4",         None,        ())),
+                        ("f6",        ("plot_f6",         "f6Tally",   ("f6Tallies",))),
+                        ("hotspots",  ("find_hotspots",   "tallies",   ("f1Tallies", "f3Tallies", "f4Tallies", "f6Tallies"))),
+                        ("lines",     ("export_lines",    "meshTally", ("f1Tallies", "f3Tallies"))),
+                        ("tiles",     ("export_tiles",    "meshTally", ("f1Tallies", "f3Tallies"))),
+                        ("vtk",       ("export_vtk",      "meshTally", ("f1Tallies", "f3Tallies"))),
+                        ("roi",       ("integrate_roi",   "meshTally", ("f1Tallies", "f3Tallies"))),
+                        ("histogram", ("plot_histogram",  "meshTally", ("f1Tallies", "f3Tallies")))])
+
+# Arguments of f1/f3 plot steps that only choose which plots are produced. Steps that only differ in them are merged into one plot call.
+jobPlots = ("xLine", "yLine", "zLine", "xCS", "yCS", "zCS", "projection")
+
+
+def mergePlots(a, b):
+    """ Returns the union of two requested plot arguments (True/False, or a list of projection methods)."""
+    if a == True or b == True:
+        return True
+    if not a:
+        return b
+    if not b:
+        return a
+    return list(a) + [method for method in b if method not in a]
+
+
+def loadJobSpec(file):
+    """ Returns the job spec (see jobRunner) saved in a JSON file, or in a YAML file (.yaml or .yml, needs PyYAML)."""
+    with open(file) as f:
+        if file.lower().endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is needed to read YAML job specs (pip install pyyaml). Job specs can also be saved as JSON.")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+
+@imagePipeline
+def runPlotCalls(reader, calls, verbose=False):
+    """ Runs planned plot calls (see jobRunner.plan) on a parsed talliesPlotter, with one image output stage for all of them."""
+    for kind, tallies, arguments in calls:
+        method, tallyArgument, _ = jobKinds[kind]
+        if verbose:
+            print("%-9s %-20s %s" % (kind, "" if tallyArgument == None else "f" + ", f".join(map(str, tallies)),
+                                     ", ".join("%s=%s" % item for item in sorted(arguments.items()))))
+        if tallyArgument != None:
+            arguments = dict(arguments, **{tallyArgument: tallies})
+        getattr(reader, method)(**arguments)
+
+
+class jobRunner:
+    """ Runs a declarative job spec as a planned, deduplicated render graph, instead of a script of plot calls:
+    every mctal file is parsed once, every tally is loaded once (see talliesReader.meshCache),
+    identical and mergeable plot steps run as a single plot call, and the plots of each call are rendered concurrently.
+
+    A job spec is a dictionary (see loadJobSpec), e.g. in JSON:
+        {"mctal": ["run1/mctal", "run2/mctal"],
+         "workers": 4, "renderWorkers": 4, "writers": 2, "archive": "zip",
+         "plots": [{"kind": "f1", "tallies": [1], "xCS": true, "vmin": 1e-3, "xCS_ymin": -5},
+                   {"kind": "f1", "tallies": [1], "yLine": true, "vmin": 1e-3},
+                   {"kind": "f4", "x_axis": "E"},
+                   {"kind": "hotspots", "k": 10, "mctal": "run2/mctal"}]}
+
+    ARGUMENTS (keys of the job spec):
+        mctal        : A mctal file path, or a list of them (./mctal by default)
+        workers      : Number of processes that extract the tallies of each mctal file (see parseMCTAL)
+        renderWorkers: Number of processes that draw the plots of every f1/f3 plot call (the workers argument of plot_f1/plot_f3)
+        writers, compress, format, archive:
+                       Image output settings (see imageWriter and imageArchive), shared by all plot calls on a mctal file
+        progress     : Progress reporting of each mctal file ("auto", "bar" or "json", see progressReport)
+        precision    : Floating-point type of the cached mesh tallies ("float32" by default, or "float64", see saveMeshCache)
+        gzip         : If True, the tally files are written gzip-compressed (see extractTally)
+        plots        : A list of plot steps. Every step has a "kind" (see jobKinds), optional "tallies" (all tallies of the kind by default)
+                       and "mctal" (the inputs it applies to, all of them by default), and keyword arguments of the plot method of its kind.
+    """
+
+    def __init__(self, spec):
+        if not type(spec) == dict:
+            raise TypeError("The job spec must be a dictionary")
+        if not type(spec.get("plots")) == list:
+            raise Warning("The job spec must have a list of plot steps (\"plots\")")
+        for step in spec["plots"]:
+            if not type(step) == dict or step.get("kind") not in jobKinds:
+                raise Warning("Every plot step must be a dictionary with a \"kind\" out of %s" % ", ".join(jobKinds))
+        self.spec   = spec
+        self.steps  = spec["plots"]
+        self.inputs = self.inputPaths(spec.get("mctal") or "./mctal")
+
+    def inputPaths(self, mctal):
+        """ Returns a mctal path or list of paths as a list without duplicates."""
+        paths = [mctal] if type(mctal) == str else list(mctal)
+        return [p for n, p in enumerate(paths) if path.abspath(p) not in [path.abspath(q) for q in paths[:n]]]
+
+    def plan(self, reader, mctal):
+        """ Compiles the plot steps that apply to mctal into plot calls on reader (a parsed talliesPlotter), as [(kind, tallies, arguments), ...].
+
+        1. Every step is expanded into one node per tally. Nodes of the same kind, tally and arguments are merged,
+           and so are the requested plots (xCS, yLine, projection, ...) of f1/f3 steps that share all other arguments.
+        2. Nodes with the same kind, arguments and plots are grouped into one call over all their tallies.
+        """
+        # 1. Nodes: one per (kind, tally, arguments), with the union of the plots requested on them
+        nodes = OrderedDict()
+        for step in self.steps:
+            if step.get("mctal") != None and path.abspath(mctal) not in [path.abspath(p) for p in self.inputPaths(step["mctal"])]:
+                continue
+            kind = step["kind"]
+            _, tallyArgument, tallyLists = jobKinds[kind]
+            arguments = {key: value for key, value in step.items() if key not in ("kind", "tallies", "mctal")}
+            plots = {}
+            if kind in ("f1", "f3"):
+                arguments.setdefault("workers", self.spec.get("renderWorkers", 1))
+                plots = {plot: arguments.pop(plot) for plot in jobPlots if plot in arguments}
+            if tallyArgument == None:
+                tallies = [None]
+            else:
+                available = [tally for tallyList in tallyLists for tally in getattr(reader, tallyList)]
+                tallies = [tally for tally in (step.get("tallies") or available) if tally in available]
+            key = json.dumps(arguments, sort_keys=True, default=str)
+            for tally in tallies:
+                node = nodes.setdefault((kind, tally, key), {"arguments": arguments, "plots": {}})
+                for plot, value in plots.items():
+                    node["plots"][plot] = mergePlots(node["plots"].get(plot, False), value)
+
+        # 2. Calls: nodes grouped by kind, arguments and plots
+        calls = OrderedDict()
+        for (kind, tally, key), node in nodes.items():
+            plots = node["plots"]
+            call = calls.setdefault((kind, key, json.dumps(plots, sort_keys=True)), (kind, [], dict(node["arguments"], **plots)))
+            if tally != None:
+                call[1].append(tally)
+        return list(calls.values())
+
+    def run(self, verbose=True):
+        """ Runs the job and returns its plan as {mctal: [(kind, tallies, arguments), ...]} (see plan)."""
+        plans = OrderedDict()
+        for mctal in self.inputs:
+            # 1. Parse each mctal file once
+            reader = talliesPlotter()
+            reader.mctalFile = mctal
+            reader.workers = self.spec.get("workers", 1)
+            reader.imageWriters  = self.spec.get("writers", 0)
+            reader.compressLevel = self.spec.get("compress", 6)
+            reader.imageFormat   = self.spec.get("format")
+            reader.archiveKind   = self.spec.get("archive")
+            reader.progressMode  = self.spec.get("progress")
+            reader.precision     = self.spec.get("precision", "float32")
+            reader.compressTallies = self.spec.get("gzip", False)
+            reader.parseMCTAL()
+
+            # 2. Plan and run its plot calls, loading every tally once
+            plans[mctal] = self.plan(reader, mctal)
+            if verbose:
+                print("\n%s: %i plot calls" % (mctal, len(plans[mctal])))
+            reader.meshCache = {}
+            try:
+                runPlotCalls(reader, plans[mctal], verbose=verbose)
+            finally:
+                reader.meshCache = None
+        return plans
+
+
+def modePlotCalls(arguments, reader):
+    """ Returns the plot calls (see jobRunner.plan) that the run mode of the command line arguments (see main) makes on reader."""
+    full    = dict(xCS=True, yCS=True, zCS=True, xLine=True, yLine=True, zLine=True, lineFamily=arguments.families, exact=arguments.exact)
+    summary = full if arguments.full else dict(projection=True, exact=arguments.exact)
+    lines   = dict(xLine=True, yLine=True, zLine=True, lineFamily=arguments.families, exact=arguments.exact)
+    cs      = dict(xCS=True, yCS=True, zCS=True, exact=arguments.exact)
+    hot     = dict(full, hotspots=arguments.hotspots)
+    # Modes in the order main() selects them; modes without plots (read, exports, serve, ...) plan nothing
+    modes = [(arguments.read, []),
+             (arguments.tally1, [("f1", summary)]), (arguments.tally1LS, [("f1", lines)]), (arguments.tally1CS, [("f1", cs)]),
+             (arguments.tally3, [("f3", summary)]), (arguments.tally3LS, [("f3", lines)]), (arguments.tally3CS, [("f3", cs)]),
+             (arguments.tally4, [("f4", {})]), (arguments.tally6, [("f6", {})]),
+             (arguments.tiles or arguments.lines or arguments.vtk or arguments.roi or arguments.box, []),
+             (arguments.histogram, [("histogram", dict(limits=arguments.limit))]),
+             (arguments.hotspots, [("f3", hot), ("f1", hot)]),
+             (arguments.convergence or arguments.serve, []),
+             (True, [("f6", {}), ("f4", {}), ("f3", summary), ("f1", summary)])]
+    steps = [steps for selected, steps in modes if selected][0]
+    tallyLists = {"f1": reader.f1Tallies, "f3": reader.f3Tallies, "f4": reader.f4Tallies, "f6": reader.f6Tallies,
+                  "histogram": reader.f1Tallies + reader.f3Tallies}
+    return [(kind, tallyLists[kind], arguments) for kind, arguments in steps if tallyLists[kind]]
+
+
 def main():
     """Script main function that takes arguments specifying run mode:
     -r  read mode (only parses files, no plots produced)
-    -f1 tally1 mode
-    -f3 tally3 mode
+    -f1 tally1 mode (max, mean and summed projections; use --full for every cross section and line scan)
+    -f3 tally3 mode (max, mean and summed projections; use --full for every cross section and line scan)
     -f4 tally4 mode
     -f6 tally6 mode
+    -t  tiles mode (exports F1 and F3 meshes to chunked multi-resolution tile stores)
+    -l  lines mode (exports all F1 and F3 line scans, one file per tally and axis)
+    --vtk  VTK mode (exports F1 and F3 meshes to binary VTK rectilinear grid files for ParaView)
+    --roi FILE  ROI mode (integrates F1 and F3 meshes over the regions of interest of a JSON or YAML file; or over boxes given with --box)
+    --histogram  histogram mode (cumulative volume histograms of F1 and F3 meshes; add --limit VALUE to mark design limits)
+    --hotspots K  hotspots mode (reports the K largest values of every tally, and plots the F1 and F3 cross sections and line scans through them)
+    -c  convergence mode (checks the tally fluctuation charts, saves a dashboard, and exits with status 0 only if all tallies have converged;
+        add --watch SECONDS to follow the dumps of a running problem until then)
+    --dry-run  plans the run mode instead of running it: lists the images it would produce, and estimates their disk usage and rendering time
+    --job FILE  job mode (runs a JSON or YAML job spec of mctal files and plot steps as one planned run, see jobRunner)
+    -s  serve mode (serves plots on demand from a local HTTP server, also: python3 mctalPlots.py serve /path/to/mctal)
 
     To specify the mctal file path, use argument mctalFile = /path/to/mctal
+    To plot F1 and F3 line scans as families (one figure per fixed bin instead of one per line scan), add --families
+    To extract the tallies with several processes in any mode, use argument -w N (e.g. python3 mctalPlots.py -r -w 8)
+    To compress and write the plot images in N background threads while the next plots are rendered, add --writers N (see also --compress and --format)
+    To save the plots of each plot directory into a single file instead of one file per plot, add --archive pdf (multi-page PDF) or --archive zip
+    (archived plots are always rendered again, since archives are written from scratch)
+    To log every skipped plot instead of per-tally summaries, add --log-level DEBUG; to log JSON lines for batch logs, add --log-json
+    To report the progress of long runs, add --progress auto (a progress bar on a terminal, JSON lines in batch logs), --progress bar or --progress json
+    To refuse runs whose plan (see --dry-run) exceeds a limit, add --max-images N, --max-gb GB or --max-hours H
     
     Note: only one mode can be run at a time. The following example only runs f4:
     python3 mctalPlots.py -f4 -f6
 
-    Exception is if no run mode is specified. By default, plotAll mode is run.
+    Exception is if no run mode is specified. By default, plotAll mode is run (f1 and f3 tallies as projections, unless --full is given).
     """
 
     parser = argparse.ArgumentParser()
     parser.add_argument("-r", "--read"       , action="store_true", help="Runs mctalPLOTS in read only mode.\nParses mctal file and exports all tallies to separate folders")
-    parser.add_argument("-f1", "--tally1"    , action="store_true", help="Runs mctalPLOTS to plot all tallies of Type F1")
+    parser.add_argument("-f1", "--tally1"    , action="store_true", help="Runs mctalPLOTS to plot projections of all tallies of Type F1 (every cross section and line scan with --full)")
     parser.add_argument("-f1ls", "--tally1LS", action="store_true", help="Runs mctalPLOTS to only plot tallies of Type F1 in 1D line scans")
     parser.add_argument("-f1cs", "--tally1CS", action="store_true", help="Runs mctalPLOTS to only plot tallies of Type F1 in 2D cross sections")
-    parser.add_argument("-f3", "--tally3"    , action="store_true", help="Runs mctalPLOTS to plot all tallies of Type F3")
+    parser.add_argument("-f3", "--tally3"    , action="store_true", help="Runs mctalPLOTS to plot projections of all tallies of Type F3 (every cross section and line scan with --full)")
     parser.add_argument("-f3ls", "--tally3LS", action="store_true", help="Runs mctalPLOTS to only plot tallies of Type F3 in 1D line scans")
     parser.add_argument("-f3cs", "--tally3CS", action="store_true", help="Runs mctalPLOTS to only plot tallies of Type F3 in 2D cross sections")
     parser.add_argument("-f4", "--tally4"    , action="store_true", help="Runs mctalPLOTS to plot all tallies of Type F4")
     parser.add_argument("-f6", "--tally6"    , action="store_true", help="Runs mctalPLOTS to plot all tallies of Type F6")
+    parser.add_argument("-t", "--tiles"      , action="store_true", help="Exports all tallies of Type F1 and F3 to chunked multi-resolution tile stores")
+    parser.add_argument("-l", "--lines"      , action="store_true", help="Exports all line scans of tallies of Type F1 and F3 in bulk (one .npz file per tally and axis)")
+    parser.add_argument("--vtk"              , action="store_true", help="Exports all tallies of Type F1 and F3 to compressed binary VTK files (.vtr) for ParaView")
+    parser.add_argument("--roi"              , type=str, default=None, metavar="FILE", help="Integrates all tallies of Type F1 and F3 over the regions of interest (unions of boxes) of a JSON or YAML file: volume, integral, mean, max and error")
+    parser.add_argument("--box"              , type=float, nargs=6, action="append", metavar=("XMIN", "XMAX", "YMIN", "YMAX", "ZMIN", "ZMAX"), help="Integrates all tallies of Type F1 and F3 over a box [cm] (can be repeated, one region per box)")
+    parser.add_argument("--histogram"        , action="store_true", help="Plots the cumulative volume histogram of all tallies of Type F1 and F3 (volume above every threshold)")
+    parser.add_argument("--limit"            , type=float, action="append", metavar="VALUE", help="With --histogram, marks a design limit and reports the volume above it (can be repeated)")
+    parser.add_argument("--hotspots"         , type=int, default=0, metavar="K", help="Reports the K largest values of every tally and only plots the F1 and F3 cross sections and line scans through them")
+    parser.add_argument("--maxError"         , type=float, default=None, help="Skips hotspots whose relative error is above maxError (e.g. 0.1)")
+    parser.add_argument("-c", "--convergence", action="store_true", help="Checks the convergence of all tallies from their tally fluctuation charts and plots a dashboard (exit status 1 if not converged)")
+    parser.add_argument("--watch"            , type=float, default=None, metavar="SECONDS", help="With -c, checks every new dump of the mctal file until all tallies have converged, looking every SECONDS")
+    parser.add_argument("--progress"         , type=str, default=None, choices=("auto", "bar", "json"), help="Reports the progress of extracting and plotting (units done, images per second, MB written, ETA) as a progress bar or JSON lines on stderr")
+    parser.add_argument("--log-level"        , type=str, default="INFO", choices=("DEBUG", "INFO", "WARNING", "ERROR"), help="Level of the logged diagnostics (DEBUG logs every skipped plot, WARNING and above only their per-tally summaries)")
+    parser.add_argument("--log-json"         , action="store_true", help="Logs diagnostics as JSON lines (time, level, message, tally, code, count) instead of text")
+    parser.add_argument("--dry-run"          , action="store_true", help="Only reads the tally headers, and lists the images of the run mode with their estimated disk usage and rendering time")
+    parser.add_argument("--max-images"       , type=int, default=None, help="Refuses to run when the run mode would produce more images")
+    parser.add_argument("--max-gb"           , type=float, default=None, help="Refuses to run when the images of the run mode would use more disk space [GB]")
+    parser.add_argument("--max-hours"        , type=float, default=None, help="Refuses to run when the images of the run mode would take longer to render [h]")
+    parser.add_argument("--job"              , type=str, default=None, metavar="FILE", help="Runs a JSON or YAML job spec (mctal files, tallies, plot kinds, ranges and output settings) as one planned run")
+    parser.add_argument("-s", "--serve"      , action="store_true", help="Serves plots of all tallies on demand from a local HTTP server (same as: mctalPlots.py serve mctalFile)")
+    parser.add_argument("--port"             , type=int, default=8050, help="Port of the local HTTP server (default: 8050)")
+    parser.add_argument("--full"             , action="store_true", help="Plots every F1 and F3 cross section and line scan instead of projections (-f1, -f3 and the default mode)")
+    parser.add_argument("--families"         , action="store_true", help="Plots F1 and F3 line scans as families (all parallel line scans at one bin in a single figure)")
+    parser.add_argument("--exact"            , action="store_true", help="Draws every mesh bin in F1 and F3 cross sections (disables level-of-detail rendering)")
+    parser.add_argument("-w", "--workers"    , type=int, default=1, help="Number of processes that extract the tallies of the mctal file in parallel (default: 1)")
+    parser.add_argument("--writers"          , type=int, default=0, help="Number of background threads that encode and write plot images while rendering continues (default: 0, images are written by the renderer)")
+    parser.add_argument("--compress"         , type=int, default=6, choices=range(10), metavar="LEVEL", help="PNG compression level of the background writers, from 0 (fastest) to 9 (smallest) (default: 6)")
+    parser.add_argument("--format"           , type=str, default=None, help="Image format of the background writers instead of PNG (e.g. webp, jpeg, tiff)")
+    parser.add_argument("--precision"        , type=str, default="float32", choices=meshPrecisions, help="Floating-point type of the cached F1 and F3 mesh tallies (default: float32, half the memory and disk usage of float64)")
+    parser.add_argument("--gzip"             , action="store_true", help="Writes gzip-compressed tally files (e.g. tallies/F1/f1.gz) instead of plain text")
+    parser.add_argument("--archive"          , type=str, default=None, choices=imageArchive.kinds, help="Saves the plots of each plot directory (e.g. f1_plots/xCS) into one multi-page PDF (with a page index, e.g. f1_plots/xCS.txt) or uncompressed zip file. Archives are written from scratch, so current plots are not skipped: every run renders all plots again")
     parser.add_argument("mctalFile", type=str, nargs ="?", default="", help="mctal file directory")
-    arguments = parser.parse_args()
+    argv = sys.argv[1:]
+    if argv[:1] == ["serve"]:
+        argv[0] = "--serve"
+    arguments = parser.parse_args(argv)
+
+    # Diagnostics (e.g. the summaries of skipped empty plots) are logged to stderr
+    handler = logging.StreamHandler()
+    handler.setFormatter(jsonLogFormatter() if arguments.log_json else logging.Formatter("%(levelname)s: %(message)s"))
+    log.addHandler(handler)
+    log.setLevel(arguments.log_level)
+    log.propagate = False
+
+    if arguments.job:
+        spec = loadJobSpec(arguments.job)
+        if arguments.mctalFile:
+            spec.setdefault("mctal", arguments.mctalFile)
+        for key, value in (("workers", arguments.workers), ("writers", arguments.writers), ("compress", arguments.compress),
+                           ("format", arguments.format), ("archive", arguments.archive),
+                           ("progress", arguments.progress), ("precision", arguments.precision),
+                           ("gzip", arguments.gzip)):
+            spec.setdefault(key, value)
+
+    # Plans the run from the tally headers when asked to (--dry-run), or to refuse runs above the limits
+    limits = {"images": arguments.max_images,
+              "bytes": None if arguments.max_gb == None else arguments.max_gb*2**30,
+              "seconds": None if arguments.max_hours == None else arguments.max_hours*3600}
+    if arguments.dry_run or any(limit != None for limit in limits.values()):
+        totals = dict.fromkeys(limits, 0)
+        for mctal in (jobRunner(spec).inputs if arguments.job else [arguments.mctalFile]):
+            planner = runPlanner()
+            planner.mctalFile = mctal
+            planner.readHeaders()
+            calls = jobRunner(spec).plan(planner, mctal) if arguments.job else modePlotCalls(arguments, planner)
+            print("\nPlan of %s:" % planner.mctalFile)
+            plan = planner.plan_plots(calls)
+            for name in totals:
+                totals[name] += plan[name]
+        exceeded = [name for name, limit in limits.items() if limit != None and totals[name] > limit]
+        if exceeded:
+            print("\nRefusing to run: the plan exceeds the limit of " + " and ".join(exceeded))
+            sys.exit(1)
+        if arguments.dry_run:
+            return
     
     if arguments.read:
         readOnly = talliesReader()
         readOnly.mctalFile = arguments.mctalFile
+        readOnly.workers = arguments.workers
+        readOnly.precision = arguments.precision
+        readOnly.compressTallies = arguments.gzip
+        readOnly.progressMode = arguments.progress
         readOnly.parseMCTAL()
     
     elif arguments.tally1:
         F1 = f1Plotter()
         F1.mctalFile = arguments.mctalFile
+        F1.workers = arguments.workers
+        F1.precision = arguments.precision
+        F1.compressTallies = arguments.gzip
+        F1.imageWriters, F1.compressLevel, F1.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F1.archiveKind = arguments.archive
+        F1.progressMode = arguments.progress
         F1.parseMCTAL()
-        F1.plot_f1(xCS=True, yCS=True, zCS=True,
-                   xLine=True, yLine=True, zLine=True, 
-                   verbose=True)
+        if arguments.full:
+            F1.plot_f1(xCS=True, yCS=True, zCS=True,
+                       xLine=True, yLine=True, zLine=True, lineFamily=arguments.families, 
+                       verbose=True, exact=arguments.exact)
+        else:
+            F1.plot_f1(projection=True, verbose=True, exact=arguments.exact)
 
     elif arguments.tally1LS:
         F1 = f1Plotter()
         F1.mctalFile = arguments.mctalFile
+        F1.workers = arguments.workers
+        F1.precision = arguments.precision
+        F1.compressTallies = arguments.gzip
+        F1.imageWriters, F1.compressLevel, F1.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F1.archiveKind = arguments.archive
+        F1.progressMode = arguments.progress
         F1.parseMCTAL()
-        F1.plot_f1(xLine=True, yLine=True, zLine=True, verbose=True)
+        F1.plot_f1(xLine=True, yLine=True, zLine=True, lineFamily=arguments.families, verbose=True, exact=arguments.exact)
 
     elif arguments.tally1CS:
         F1 = f1Plotter()
         F1.mctalFile = arguments.mctalFile
+        F1.workers = arguments.workers
+        F1.precision = arguments.precision
+        F1.compressTallies = arguments.gzip
+        F1.imageWriters, F1.compressLevel, F1.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F1.archiveKind = arguments.archive
+        F1.progressMode = arguments.progress
         F1.parseMCTAL()
-        F1.plot_f1(xCS=True, yCS=True, zCS=True, verbose=True)
+        F1.plot_f1(xCS=True, yCS=True, zCS=True, verbose=True, exact=arguments.exact)
 
     elif arguments.tally3:
         F3 = f3Plotter()
         F3.mctalFile = arguments.mctalFile
+        F3.workers = arguments.workers
+        F3.precision = arguments.precision
+        F3.compressTallies = arguments.gzip
+        F3.imageWriters, F3.compressLevel, F3.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F3.archiveKind = arguments.archive
+        F3.progressMode = arguments.progress
         F3.parseMCTAL()
-        F3.plot_f3(xCS=True, yCS=True, zCS=True,
-                   xLine=True, yLine=True, zLine=True, 
-                   verbose=True)
+        if arguments.full:
+            F3.plot_f3(xCS=True, yCS=True, zCS=True,
+                       xLine=True, yLine=True, zLine=True, lineFamily=arguments.families, 
+                       verbose=True, exact=arguments.exact)
+        else:
+            F3.plot_f3(projection=True, verbose=True, exact=arguments.exact)
 
     elif arguments.tally3LS:
         F3 = f3Plotter()
         F3.mctalFile = arguments.mctalFile
+        F3.workers = arguments.workers
+        F3.precision = arguments.precision
+        F3.compressTallies = arguments.gzip
+        F3.imageWriters, F3.compressLevel, F3.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F3.archiveKind = arguments.archive
+        F3.progressMode = arguments.progress
         F3.parseMCTAL()
-        F3.plot_f3(xLine=True, yLine=True, zLine=True, verbose=True)
+        F3.plot_f3(xLine=True, yLine=True, zLine=True, lineFamily=arguments.families, verbose=True, exact=arguments.exact)
 
     elif arguments.tally3CS:
         F3 = f3Plotter()
         F3.mctalFile = arguments.mctalFile
+        F3.workers = arguments.workers
+        F3.precision = arguments.precision
+        F3.compressTallies = arguments.gzip
+        F3.imageWriters, F3.compressLevel, F3.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F3.archiveKind = arguments.archive
+        F3.progressMode = arguments.progress
         F3.parseMCTAL()
-        F3.plot_f3(xCS=True, yCS=True, zCS=True, verbose=True)
+        F3.plot_f3(xCS=True, yCS=True, zCS=True, verbose=True, exact=arguments.exact)
     
     elif arguments.tally4:
         F4 = f4Plotter()
         F4.mctalFile = arguments.mctalFile
+        F4.workers = arguments.workers
+        F4.precision = arguments.precision
+        F4.compressTallies = arguments.gzip
+        F4.imageWriters, F4.compressLevel, F4.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F4.archiveKind = arguments.archive
+        F4.progressMode = arguments.progress
         F4.parseMCTAL()
         F4.plot_f4()
     
     elif arguments.tally6:
         F6 = f6Plotter()
         F6.mctalFile = arguments.mctalFile
+        F6.workers = arguments.workers
+        F6.precision = arguments.precision
+        F6.compressTallies = arguments.gzip
+        F6.imageWriters, F6.compressLevel, F6.imageFormat = arguments.writers, arguments.compress, arguments.format
+        F6.archiveKind = arguments.archive
+        F6.progressMode = arguments.progress
         F6.parseMCTAL()
         F6.plot_f6()
     
+    elif arguments.tiles:
+        tiles = meshExporter()
+        tiles.mctalFile = arguments.mctalFile
+        tiles.workers = arguments.workers
+        tiles.precision = arguments.precision
+        tiles.compressTallies = arguments.gzip
+        tiles.parseMCTAL()
+        tiles.export_tiles(verbose=True)
+
+    elif arguments.lines:
+        lines = meshExporter()
+        lines.mctalFile = arguments.mctalFile
+        lines.workers = arguments.workers
+        lines.precision = arguments.precision
+        lines.compressTallies = arguments.gzip
+        lines.parseMCTAL()
+        lines.export_lines(verbose=True)
+
+    elif arguments.vtk:
+        vtk = meshExporter()
+        vtk.mctalFile = arguments.mctalFile
+        vtk.workers = arguments.workers
+        vtk.precision = arguments.precision
+        vtk.compressTallies = arguments.gzip
+        vtk.parseMCTAL()
+        vtk.export_vtk(verbose=True)
+
+    elif arguments.roi or arguments.box:
+        roi = roiIntegrator()
+        roi.mctalFile = arguments.mctalFile
+        roi.workers = arguments.workers
+        roi.precision = arguments.precision
+        roi.compressTallies = arguments.gzip
+        roi.parseMCTAL()
+        rois = loadJobSpec(arguments.roi) if arguments.roi else []
+        if type(rois) == dict:
+            rois = rois.get("rois", [])
+        rois = rois + [{"name": "box%i" % (n+1), "box": box} for n, box in enumerate(arguments.box or [])]
+        roi.integrate_roi(rois)
+
+    elif arguments.histogram:
+        histogram = histogramPlotter()
+        histogram.mctalFile = arguments.mctalFile
+        histogram.workers = arguments.workers
+        histogram.precision = arguments.precision
+        histogram.compressTallies = arguments.gzip
+        histogram.imageWriters, histogram.compressLevel, histogram.imageFormat = arguments.writers, arguments.compress, arguments.format
+        histogram.archiveKind = arguments.archive
+        histogram.progressMode = arguments.progress
+        histogram.parseMCTAL()
+        histogram.plot_histogram(limits=arguments.limit, verbose=True)
+
+    elif arguments.hotspots:
+        hotspots = talliesPlotter()
+        hotspots.mctalFile = arguments.mctalFile
+        hotspots.workers = arguments.workers
+        hotspots.precision = arguments.precision
+        hotspots.compressTallies = arguments.gzip
+        hotspots.imageWriters, hotspots.compressLevel, hotspots.imageFormat = arguments.writers, arguments.compress, arguments.format
+        hotspots.archiveKind = arguments.archive
+        hotspots.progressMode = arguments.progress
+        hotspots.parseMCTAL()
+        hotspots.find_hotspots(k=arguments.hotspots, maxError=arguments.maxError)
+        if hotspots.f3Tallies:
+            hotspots.plot_f3(xCS=True, yCS=True, zCS=True,
+                             xLine=True, yLine=True, zLine=True, lineFamily=arguments.families,
+                             hotspots=arguments.hotspots, maxError=arguments.maxError, exact=arguments.exact)
+        if hotspots.f1Tallies:
+            hotspots.plot_f1(xCS=True, yCS=True, zCS=True,
+                             xLine=True, yLine=True, zLine=True, lineFamily=arguments.families,
+                             hotspots=arguments.hotspots, maxError=arguments.maxError, exact=arguments.exact)
+
+    elif arguments.job:
+        jobRunner(spec).run()
+
+    elif arguments.convergence:
+        monitor = convergenceMonitor()
+        monitor.mctalFile = arguments.mctalFile
+        if arguments.watch:
+            converged = monitor.watch_convergence(interval=arguments.watch)
+        else:
+            report = monitor.check_convergence()
+            monitor.plot_convergence()
+            converged = all(r["converged"] for r in report.values())
+        sys.exit(0 if converged else 1)
+
+    elif arguments.serve:
+        server = sliceServer()
+        server.mctalFile = arguments.mctalFile
+        server.workers = arguments.workers
+        server.precision = arguments.precision
+        server.compressTallies = arguments.gzip
+        server.parseMCTAL()
+        server.serve(port=arguments.port)
+
     else:
         plotAll = talliesPlotter()
         plotAll.mctalFile = arguments.mctalFile
+        plotAll.workers = arguments.workers
+        plotAll.precision = arguments.precision
+        plotAll.compressTallies = arguments.gzip
+        plotAll.imageWriters, plotAll.compressLevel, plotAll.imageFormat = arguments.writers, arguments.compress, arguments.format
+        plotAll.archiveKind = arguments.archive
+        plotAll.progressMode = arguments.progress
         plotAll.parseMCTAL()
         print("\nPlotting tallies f6, f4, and f1")
         plotAll.plot_f6()
         plotAll.plot_f4()
-        plotAll.plot_f3(xCS=True, yCS=True, zCS=True, 
-                        xLine=True, yLine=True, zLine=True,
-                        verbose=True)
-        plotAll.plot_f1(xCS=True, yCS=True, zCS=True, 
-                        xLine=True, yLine=True, zLine=True,
-                        verbose=True)
+        if arguments.full:
+            plotAll.plot_f3(xCS=True, yCS=True, zCS=True, 
+                            xLine=True, yLine=True, zLine=True, lineFamily=arguments.families,
+                            verbose=True, exact=arguments.exact)
+            plotAll.plot_f1(xCS=True, yCS=True, zCS=True, 
+                            xLine=True, yLine=True, zLine=True, lineFamily=arguments.families,
+                            verbose=True, exact=arguments.exact)
+        else:
+            plotAll.plot_f3(projection=True, verbose=True, exact=arguments.exact)
+            plotAll.plot_f1(projection=True, verbose=True, exact=arguments.exact)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import sys
+from os import path
+
+# mctalPlots is a single module at the top of the repository
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
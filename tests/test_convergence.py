@@ -0,0 +1,50 @@
+""" Tests of the convergence checks of the tally fluctuation charts (readTFC, checkConvergence)."""
+import numpy as np
+
+import mctalPlots
+
+
+def chart(nps, mean, error):
+    # FOM = 1/(R² T), with the computer time T proportional to NPS
+    return np.column_stack([nps, mean, error, 1/(error**2 * nps/1e4)])
+
+
+def test_readTFC(tmp_path):
+    mctal = tmp_path / "mctal"
+    mctal.write_text("ntal 2\n"
+                     "tally       14   -1   0\n"
+                     "vals\n 1.0 0.1\n"
+                     "tfc   3    1 1 1 1 1 1 1 1\n"
+                     "   1000  1.10E+00  2.0E-01  5.0E+02\n"
+                     "   2000  1.00E+00  1.4E-01  5.1E+02\n"
+                     "   3000  1.05E+00  1.2E-01  4.9E+02\n"
+                     "tally       26   -1   0\n"
+                     "tfc   1    1 1 1 1 1 1 1 1\n"
+                     "   3000  4.0E-03  5.0E-02  9.0E+03\n")
+    tfc = mctalPlots.readTFC(str(mctal))
+    assert list(tfc) == [14, 26]
+    np.testing.assert_array_equal(tfc[14][:, 0], [1000, 2000, 3000])
+    np.testing.assert_array_equal(tfc[14][-1], [3000, 1.05, 0.12, 490])
+    assert tfc[26].shape == (1, 4)
+
+
+def test_checkConvergence():
+    nps = np.arange(1, 21) * 1e5
+    rng = np.random.default_rng(0)
+    tfc = {4:  chart(nps, 2 + 1e-3*rng.standard_normal(20), 0.5/np.sqrt(nps/1e5) * 0.1),
+           14: chart(nps, 2 + 1e-3*rng.standard_normal(20), np.linspace(0.25, 0.3, 20)),
+           24: chart(nps, np.linspace(1, 3, 20), 0.5/np.sqrt(nps/1e5) * 0.1),
+           34: np.zeros((20, 4))}
+    final, checks = mctalPlots.checkConvergence(tfc)
+    np.testing.assert_array_equal(final[0], tfc[4][-1])
+    assert checks.shape == (4, len(mctalPlots.convergenceChecks))
+    assert checks[0].all()
+    # A growing relative error above 0.1 fails the checks of the relative error
+    assert checks[1, :4].tolist() == [True, False, False, False]
+    # A mean with a trend fails the first check only
+    assert checks[2].tolist() == [False] + [True]*(len(mctalPlots.convergenceChecks)-1)
+    # Tallies without score fail all checks
+    assert not checks[3].any()
+
+    final, checks = mctalPlots.checkConvergence(tfc, tallies=[24])
+    assert checks.shape == (1, len(mctalPlots.convergenceChecks))
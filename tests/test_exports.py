@@ -0,0 +1,89 @@
+""" Tests of the mesh exports that stream the mesh in slabs: VTK files (writeVTK) and region of interest statistics (meshROIs)."""
+import re
+import zlib
+import xml.etree.ElementTree as ET
+import numpy as np
+import pytest
+
+import mctalPlots
+
+
+def randomMesh(shape=(7, 5, 9), seed=0):
+    rng = np.random.default_rng(seed)
+    axes = [np.cumsum(rng.uniform(0.5, 2, n+1)) - 3 for n in shape]
+    return axes + [rng.lognormal(0, 2, shape), rng.uniform(0.01, 0.5, shape)]
+
+
+def readVTK(file):
+    """ Returns the arrays of a .vtr file written by writeVTK as {name: array}."""
+    with open(file, "rb") as f:
+        data = f.read()
+    start = data.index(b"<AppendedData")
+    root = ET.fromstring(data[:start].decode() + "</VTKFile>")
+    appended = data[data.index(b"_", start) + 1:]
+    compressed = root.get("compressor") != None
+    arrays = {}
+    for array in root.iter("DataArray"):
+        offset = int(array.get("offset"))
+        if compressed:
+            nBlocks = int(np.frombuffer(appended, "<u8", 1, offset)[0])
+            sizes = np.frombuffer(appended, "<u8", nBlocks, offset + 24)
+            position = offset + 8*(3+nBlocks)
+            raw = b""
+            for size in sizes.tolist():
+                raw += zlib.decompress(appended[position:position+size])
+                position += size
+        else:
+            nBytes = int(np.frombuffer(appended, "<u8", 1, offset)[0])
+            raw = appended[offset+8:offset+8+nBytes]
+        arrays[array.get("Name")] = np.frombuffer(raw, "<f8")
+    return root, arrays
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_writeVTK_round_trip(tmp_path, compress):
+    xAxis, yAxis, zAxis, talval, talerr = randomMesh()
+    file = str(tmp_path / "f1.vtr")
+    mctalPlots.writeVTK(file, xAxis, yAxis, zAxis, talval, talerr, compress=compress, slabBytes=7*5*2*8)
+    root, arrays = readVTK(file)
+    assert root.find("RectilinearGrid").get("WholeExtent") == "0 7 0 5 0 9"
+    # Cell data is ordered with x fastest
+    np.testing.assert_array_equal(arrays["values"], talval.transpose(2, 1, 0).ravel())
+    np.testing.assert_array_equal(arrays["errors"], talerr.transpose(2, 1, 0).ravel())
+    for name, axis in zip("xyz", (xAxis, yAxis, zAxis)):
+        np.testing.assert_array_equal(arrays[name], axis)
+
+
+def test_meshROIs_matches_bin_by_bin_sums():
+    xAxis, yAxis, zAxis, talval, talerr = randomMesh()
+    boxes = [[xAxis[1], xAxis[4], yAxis[0], yAxis[2], zAxis[3], zAxis[8]],
+             [xAxis[5] + 0.1, xAxis[7], yAxis[1], yAxis[5], zAxis[0], zAxis[9]]]
+    regions = mctalPlots.readROIs([{"name": "inside", "box": boxes[0]}, {"name": "union", "boxes": boxes}])
+    inside, union = mctalPlots.meshROIs(xAxis, yAxis, zAxis, talval, talerr, regions, slabBytes=5*9*8*2)
+
+    # The first box follows bin edges, so it covers whole bins
+    volume = np.diff(xAxis)[:, None, None] * np.diff(yAxis)[None, :, None] * np.diff(zAxis)[None, None, :]
+    cover = (slice(1, 4), slice(0, 2), slice(3, 8))
+    integral = (volume[cover] * talval[cover]).sum()
+    assert inside["name"] == "inside"
+    assert inside["volume"] == pytest.approx(volume[cover].sum())
+    assert inside["integral"] == pytest.approx(integral)
+    assert inside["mean"] == pytest.approx(integral / volume[cover].sum())
+    assert inside["max"] == talval[cover].max()
+    assert inside["error"] == pytest.approx(np.sqrt(((volume[cover] * talval[cover] * talerr[cover])**2).sum()) / integral)
+
+    # The second box cuts the x bin 5 at 0.1 cm of its lower edge and does not overlap the first one
+    weights = np.zeros(talval.shape)
+    weights[cover] = 1
+    weights[5:7, 1:5, :] = 1
+    weights[5, 1:5, :] = 1 - 0.1 / np.diff(xAxis)[5]
+    assert union["boxes"] == 2
+    assert union["volume"] == pytest.approx((weights * volume).sum())
+    assert union["integral"] == pytest.approx((weights * volume * talval).sum())
+
+
+def test_readROIs_rejects_empty_boxes():
+    with pytest.raises(Warning):
+        mctalPlots.readROIs([{"name": "flat", "box": [0, 1, 2, 2, 0, 1]}])
+    with pytest.raises(TypeError):
+        mctalPlots.readROIs({"name": "target"})
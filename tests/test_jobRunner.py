@@ -0,0 +1,50 @@
+""" Tests of the job spec compiler (jobRunner.plan), which merges plot steps into as few plot calls as possible."""
+from types import SimpleNamespace
+import pytest
+
+import mctalPlots
+
+
+def reader(tallies=(1, 11, 3, 4, 6)):
+    # plan only needs the tally lists of a parsed reader
+    reader = mctalPlots.talliesReader()
+    reader.allTals = [SimpleNamespace(tallyNumber=tally) for tally in tallies]
+    reader.listTallies()
+    return reader
+
+
+def test_plan_merges_plots_of_the_same_tally():
+    job = mctalPlots.jobRunner({"mctal": "run/mctal", "renderWorkers": 2, "plots": [
+        {"kind": "f1", "tallies": [1], "xCS": True, "fontsize": 10},
+        {"kind": "f1", "tallies": [1, 11], "zLine": True, "fontsize": 10},
+        {"kind": "f1", "tallies": [11], "projection": ["max"], "fontsize": 10},
+        {"kind": "f1", "tallies": [11], "projection": ["sum"], "fontsize": 10}]})
+    calls = job.plan(reader(), "run/mctal")
+    assert calls == [("f1", [1], {"fontsize": 10, "workers": 2, "xCS": True, "zLine": True}),
+                     ("f1", [11], {"fontsize": 10, "workers": 2, "zLine": True, "projection": ["max", "sum"]})]
+
+
+def test_plan_groups_tallies_with_the_same_plots():
+    job = mctalPlots.jobRunner({"plots": [{"kind": "f1", "zCS": True}, {"kind": "f3", "zCS": True, "vmin": 1e-3},
+                                          {"kind": "hotspots", "k": 5}, {"kind": "f4"}, {"kind": "vtk", "tallies": [3, 99]}]})
+    calls = job.plan(reader(), "./mctal")
+    assert calls == [("f1", [1, 11], {"workers": 1, "zCS": True}),
+                     ("f3", [3], {"vmin": 1e-3, "workers": 1, "zCS": True}),
+                     ("hotspots", [1, 11, 3, 4, 6], {"k": 5}),
+                     ("f4", [], {}),
+                     ("vtk", [3], {})]
+
+
+def test_plan_only_runs_steps_of_their_mctal_file():
+    job = mctalPlots.jobRunner({"mctal": ["a/mctal", "b/mctal", "a/./mctal"], "plots": [
+        {"kind": "f6", "mctal": "b/mctal"}, {"kind": "f4"}]})
+    assert job.inputs == ["a/mctal", "b/mctal"]
+    assert job.plan(reader(), "a/mctal") == [("f4", [], {})]
+    assert job.plan(reader(), "b/mctal") == [("f6", [6], {}), ("f4", [], {})]
+
+
+def test_jobRunner_rejects_unknown_kinds():
+    with pytest.raises(Warning):
+        mctalPlots.jobRunner({"plots": [{"kind": "f2"}]})
+    with pytest.raises(TypeError):
+        mctalPlots.jobRunner([{"kind": "f1"}])
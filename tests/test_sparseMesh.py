@@ -0,0 +1,93 @@
+""" Tests of the block-sparse mesh cache (sparseMesh, sparseMeshes), which must index and reduce like the dense mesh."""
+import numpy as np
+import pytest
+
+import mctalPlots
+
+
+def shieldedMesh(shape=(2, 19, 13, 11), seed=0):
+    # Mostly-zero mesh: a small nonzero source region in a shielded volume, with one extra (energy) axis
+    rng = np.random.default_rng(seed)
+    values = np.zeros(shape)
+    errors = np.zeros(shape)
+    values[:, 2:7, 3:6, 1:4] = rng.lognormal(0, 2, (shape[0], 5, 3, 3))
+    errors[:, 2:7, 3:6, 1:4] = rng.uniform(0.01, 0.5, (shape[0], 5, 3, 3))
+    values[1, 17, 12, 10] = 7.5
+    return values, errors
+
+
+def test_sparseMeshes_dense_meshes_stay_dense():
+    values = np.ones((9, 9, 9))
+    assert mctalPlots.sparseMeshes(values, values) == None
+
+
+def test_sparseMesh_array_matches_dense():
+    values, errors = shieldedMesh()
+    sparseValues, sparseErrors = mctalPlots.sparseMeshes(values, errors, blockEdge=4)
+    assert sparseValues.shape == values.shape
+    np.testing.assert_array_equal(np.asarray(sparseValues), values)
+    np.testing.assert_array_equal(np.asarray(sparseErrors), errors)
+
+
+@pytest.mark.parametrize("index", [(1, 3), (0, slice(None), 4), (1, 2, slice(1, 5), slice(None)), (-1, 17, 12, 10),
+                                   (0, slice(None), slice(None), 2), (1, slice(2, 9, 3)), (Ellipsis, 2), (0, Ellipsis, 4, 2)])
+def test_sparseMesh_indexing_matches_dense(index):
+    values, errors = shieldedMesh()
+    sparseValues = mctalPlots.sparseMeshes(values, errors, blockEdge=4)[0]
+    np.testing.assert_array_equal(np.asarray(sparseValues[index]), values[index])
+
+
+def test_sparseMesh_views_share_blocks():
+    values, errors = shieldedMesh()
+    sparseValues = mctalPlots.sparseMeshes(values, errors, blockEdge=4)[0]
+    view = sparseValues[1]
+    assert isinstance(view, mctalPlots.sparseMesh)
+    assert view.blocks is sparseValues.blocks
+    np.testing.assert_array_equal(np.asarray(view), values[1])
+    with pytest.raises(IndexError):
+        sparseValues[2]
+
+
+def test_sparseMesh_stored_values_cover_nonzero_bins():
+    values, errors = shieldedMesh()
+    sparseValues = mctalPlots.sparseMeshes(values, errors, blockEdge=4)[0]
+    indices, stored = sparseValues.stored()
+    dense = np.zeros_like(values)
+    dense[indices] = stored
+    np.testing.assert_array_equal(dense, values)
+
+
+def test_sparseMesh_reductions_match_dense():
+    values, errors = shieldedMesh()
+    sparseValues, sparseErrors = mctalPlots.sparseMeshes(values, errors, blockEdge=4)
+    for bins in range(values.shape[0]):
+        projections = mctalPlots.meshProjections(sparseValues[bins])
+        for axis in "xyz":
+            a = "xyz".index(axis)
+            np.testing.assert_allclose(projections[("max", axis)], values[bins].max(axis=a))
+            np.testing.assert_allclose(projections[("sum", axis)], values[bins].sum(axis=a))
+            np.testing.assert_allclose(projections[("mean", axis)], values[bins].mean(axis=a))
+
+        sparseHotspots = mctalPlots.findHotspots(sparseValues[bins], sparseErrors[bins], k=5)
+        denseHotspots = mctalPlots.findHotspots(values[bins], errors[bins], k=5)
+        assert [(tuple(map(int, i)), v, e) for i, v, e in sparseHotspots] == [(tuple(map(int, i)), v, e) for i, v, e in denseHotspots]
+
+
+def test_meshCache_round_trip(tmp_path):
+    values, errors = shieldedMesh()
+    cacheDir = str(tmp_path / "f1_cache")
+    mctalPlots.saveMeshCache(cacheDir, values, errors, "float64")
+    assert mctalPlots.meshCacheFile(cacheDir) == cacheDir + "/errorBlocks.npy"
+    for mmap in (False, True):
+        cachedValues, cachedErrors = mctalPlots.loadMeshCache(cacheDir, values.shape, mmap=mmap)
+        assert isinstance(cachedValues, mctalPlots.sparseMesh)
+        np.testing.assert_array_equal(np.asarray(cachedValues), values)
+        np.testing.assert_array_equal(np.asarray(cachedErrors), errors)
+
+    # A dense mesh replaces the sparse files of the same cache
+    mctalPlots.saveMeshCache(cacheDir, values + 1, errors, "float32")
+    assert mctalPlots.meshCacheFile(cacheDir) == cacheDir + "/errors.npy"
+    assert not (tmp_path / "f1_cache" / "ids.npy").exists()
+    cachedValues = mctalPlots.loadMeshCache(cacheDir, values.shape)[0]
+    assert cachedValues.dtype == np.float32
+    np.testing.assert_array_equal(cachedValues, (values + 1).astype(np.float32))
@@ -0,0 +1,55 @@
+""" Tests of the tally file writer, which must match the "%-5i%e\t%e\t%e\n" rows that parseMCTAL used to write one at a time."""
+import gzip
+import numpy as np
+import pytest
+
+import mctalPlots
+
+
+edgeValues = [0.0, -0.0, 1.0, -1.0, 9.9999995, 9.99999949, 0.5, 1e-300, 5e-324, 2.2250738585072014e-308, 1.7976931348623157e+308,
+              1e100, 1e-100, 123456789.0, 1.0000005, 2.5e-7, 3.4e38, 1.2e-38, np.inf, -np.inf, np.nan]
+
+
+def reference(cells, ergs, vals, errs):
+    return "".join("%-5i%e\t%e\t%e\n" % row for row in zip(cells, ergs, vals, errs)).encode()
+
+
+def test_formatExp_edge_values():
+    assert mctalPlots.formatExp(edgeValues).tolist() == [("%e" % x).encode() for x in edgeValues]
+
+
+def test_formatExp_random_values():
+    rng = np.random.default_rng(1)
+    values = np.concatenate([rng.lognormal(0, 20, 20000) * rng.choice([-1, 1], 20000),
+                             np.round(rng.uniform(1, 10, 20000), 6) * 10.0**rng.integers(-30, 30, 20000),
+                             rng.uniform(0, 1, 20000).astype(np.float32)])
+    assert mctalPlots.formatExp(values).tolist() == [("%e" % x).encode() for x in values.tolist()]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_writeTallyText_matches_reference(tmp_path, compress):
+    rng = np.random.default_rng(2)
+    cells = np.repeat(np.arange(0, 12000, 100), 50) % 10000
+    ergs = np.tile(np.logspace(-3, 1, 50), 120)
+    vals = rng.lognormal(0, 3, len(cells))
+    vals[::7] = 0
+    errs = rng.uniform(0, 1, len(cells))
+    file = str(tmp_path / "f4")
+    mctalPlots.writeTallyText(file, cells, ergs, vals, errs, compress=compress, chunk=1000)
+    if compress:
+        with gzip.open(file + ".gz", "rb") as f:
+            text = f.read()
+    else:
+        with open(file, "rb") as f:
+            text = f.read()
+    assert text == reference(cells.tolist(), ergs.tolist(), vals.tolist(), errs.tolist())
+    np.testing.assert_array_equal(np.loadtxt(file + ".gz" if compress else file, ndmin=2)[:, 0], cells)
+
+
+def test_writeTallyText_edge_values(tmp_path):
+    vals = np.array(edgeValues)
+    cells = np.arange(len(vals))
+    file = str(tmp_path / "f1")
+    mctalPlots.writeTallyText(file, cells, np.zeros(len(vals)), vals, vals[::-1])
+    with open(file, "rb") as f:
+        assert f.read() == reference(cells.tolist(), [0.0]*len(vals), vals.tolist(), vals[::-1].tolist())